@@ -0,0 +1,63 @@
+"""Benchmark UCMAXLConnector startup: cold, SQLite-cached and pre-compiled schema bundle.
+
+The zeep client is created on first use, so startup is measured up to the first access of the connector's
+zeep service.  Each scenario runs in a fresh interpreter so that no parsed schema state is shared.
+
+Usage::
+
+    python benchmarks/connector_startup.py --wsdl schema/current/AXLAPI.wsdl --runs 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SCENARIO = """
+import time
+from zeep.cache import SqliteCache
+from ciscocucmapi import UCMAXLConnector
+
+start = time.perf_counter()
+axl = UCMAXLConnector(username="bench", password="bench", fqdn="localhost", wsdl={wsdl!r},
+                      cache=SqliteCache(path={cache!r}), schema_bundle={bundle!r})
+constructed = time.perf_counter()
+axl.service
+print(constructed - start, time.perf_counter() - start)
+"""
+
+
+def run_scenario(wsdl, cache, bundle):
+    code = SCENARIO.format(wsdl=wsdl, cache=cache, bundle=bundle)
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return [float(value) for value in output.split()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wsdl", default=str(Path(__file__).parents[1] / "schema" / "current" / "AXLAPI.wsdl"))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    from ciscocucmapi.schema import build_schema_bundle
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = str(build_schema_bundle(args.wsdl, destination=Path(tmp) / "AXLAPI.bundle"))
+        cached = str(Path(tmp) / "cached.db")
+        run_scenario(args.wsdl, cached, False)  # warm the sqlite cache
+        scenarios = {
+            "cold": lambda run: run_scenario(args.wsdl, str(Path(tmp) / f"cold{run}.db"), False),
+            "sqlite-cached": lambda run: run_scenario(args.wsdl, cached, False),
+            "precompiled": lambda run: run_scenario(args.wsdl, cached, bundle),
+        }
+        print(f"{'scenario':<16}{'construct (ms)':>16}{'first use (ms)':>16}")
+        for name, scenario in scenarios.items():
+            results = [scenario(run) for run in range(args.runs)]
+            construct, first_use = (statistics.median(values) * 1000 for values in zip(*results))
+            print(f"{name:<16}{construct:>16.1f}{first_use:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
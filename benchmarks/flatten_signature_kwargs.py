@@ -0,0 +1,61 @@
+"""Benchmark argument marshalling in the API add() overrides.
+
+Compares the cached signature specs and compiled flatteners used by flatten_signature_kwargs with
+re-inspecting the signature on every call, across every add() method defined by the API wrappers.
+
+Usage::
+
+    python benchmarks/flatten_signature_kwargs.py --calls 2000
+"""
+
+import argparse
+import inspect
+import timeit
+
+from ciscocucmapi import api
+from ciscocucmapi._internal_utils import flatten_signature_kwargs
+
+
+def uncached_flatten_signature_kwargs(func, loc):
+    """Reference implementation inspecting the signature on every call"""
+    keys = [k for k, v in inspect.signature(func).parameters.items() if v.kind == v.VAR_KEYWORD]
+    kwargs_name = keys.pop() if keys else None
+    attributes = {k: v for k, v in loc.items() if k in inspect.signature(func).parameters}
+    if kwargs_name:
+        attributes.pop(kwargs_name)
+        attributes.update(loc[kwargs_name])
+    return attributes
+
+
+def add_methods():
+    """Bound add() overrides of all API wrappers, with representative locals for each"""
+    for name, cls in sorted(vars(api).items()):
+        if not inspect.isclass(cls) or "add" not in vars(cls):
+            continue
+        instance = cls.__new__(cls)
+        loc = {"self": instance, "kwargs": {"description": "benchmark"}}
+        loc.update({p: "value" for p in inspect.signature(instance.add).parameters if p != "kwargs"})
+        yield name, instance.add, loc
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    methods = list(add_methods())
+    for _, method, loc in methods:
+        assert flatten_signature_kwargs(method, loc) == uncached_flatten_signature_kwargs(method, loc)
+
+    def run(flattener):
+        return timeit.timeit(lambda: [flattener(method, loc) for _, method, loc in methods], number=args.calls)
+
+    uncached, cached = run(uncached_flatten_signature_kwargs), run(flatten_signature_kwargs)
+    per_call = args.calls * len(methods)
+    print(f"{len(methods)} add() methods x {args.calls} calls")
+    print(f"{'uncached':<10}{uncached / per_call * 1e6:>10.2f} us/call")
+    print(f"{'cached':<10}{cached / per_call * 1e6:>10.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Microbenchmark repeated SimpleAXLAPI.model() calls against rebuilding the template from the schema.
+
+Usage::
+
+    python benchmarks/model_templates.py --wsdl schema/current/AXLAPI.wsdl --calls 1000
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+
+from ciscocucmapi import UCMAXLConnector
+from ciscocucmapi.helpers import get_model_dict
+from ciscocucmapi.helpers import sanitize_model_dict
+
+APIS = ("phone", "line", "user", "device_pool", "sip_trunk")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wsdl", default=str(Path(__file__).parents[1] / "schema" / "current" / "AXLAPI.wsdl"))
+    parser.add_argument("--calls", type=int, default=1000)
+    args = parser.parse_args()
+
+    axl = UCMAXLConnector(username="bench", password="bench", fqdn="localhost", wsdl=args.wsdl)
+    print(f"{'api':<14}{'rebuild (us)':>14}{'first (us)':>14}{'repeat (us)':>14}")
+    for name in APIS:
+        api = getattr(axl, name)
+        add_model = axl.client.get_type(f"ns0:{api._add_model_name}")
+        rebuild = timeit.timeit(lambda: sanitize_model_dict(get_model_dict(add_model)), number=args.calls)
+        first = timeit.timeit(api.model, number=1)
+        repeat = timeit.timeit(api.model, number=args.calls)
+        print(f"{name:<14}{rebuild / args.calls * 1e6:>14.1f}{first * 1e6:>14.1f}{repeat / args.calls * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
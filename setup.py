@@ -68,12 +68,19 @@ setup(
     python_requires='>=3.6',
     install_requires=[
         'requests>=2.18.4',
-        'zeep>=2.5.0'
+        'zeep>=4.0.0'
     ],
     extras_require={
         'rst': ['docutils>=0.11'],
+        'numpy': ['numpy'],
+        'pandas': ['pandas'],
+        'arrow': ['pyarrow'],
+        'async': ['httpx'],
         # ':python_version=="2.6"': ['argparse'],
     },
     entry_points={
+        'console_scripts': [
+            'cucm-schema-bundle = ciscocucmapi.schema:main',
+        ],
     },
 )
@@ -11,7 +11,12 @@ to facilitate DevOps Cisco UC application provisioning.
 # Set default logging handler to avoid "No handler found" warnings.
 import logging
 
+from ciscocucmapi.cdr import CDRonDemandConnector
+from ciscocucmapi.cluster import UCMAXLClusterConnector
 from ciscocucmapi.connectors import UCMAXLConnector
+from ciscocucmapi.logcollection import LogCollectionConnector
+from ciscocucmapi.perfmon import PerfMonConnector
+from ciscocucmapi.risport import RisPortConnector
 
 try:  # Python 2.7+
     from logging import NullHandler
@@ -24,6 +29,14 @@ except ImportError:
 __version__ = '0.0.2'
 
 
+def __getattr__(name):
+    # asyncio support requires Python 3.7+ and the 'async' extra, so is only imported on first use
+    if name == "AsyncUCMAXLConnector":
+        from ciscocucmapi.aio import AsyncUCMAXLConnector
+        return AsyncUCMAXLConnector
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Initialize Package Logging
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
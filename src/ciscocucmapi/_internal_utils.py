@@ -1,15 +1,43 @@
 """Package helper functions and classes."""
 
-from collections import Iterable
 from collections import OrderedDict
+from collections.abc import Iterable
+from functools import lru_cache
+from inspect import Parameter
 from inspect import signature
 
+from zeep.xsd.elements.element import Element
+from zeep.xsd.elements.indicators import Choice
+from zeep.xsd.elements.indicators import Sequence
+
 
 def element_list_to_ordered_dict(elements):
     """Converts a list of lists of zeep Element objects to a list of OrderedDicts"""
     return [OrderedDict((element.tag, element.text) for element in row) for row in elements]
 
 
+def element_list_to_columns(elements):
+    """Converts a list of lists of zeep Element objects to an OrderedDict of column name to column values
+
+    Column names are taken from the first row.  Rows are assumed to share the first row's columns, falling back
+    to a per-tag lookup with missing values as None if a row's tags differ.
+    """
+    columns = OrderedDict()
+    for row in elements:
+        if not columns:
+            columns.update((element.tag, []) for element in row)
+            column_values = list(columns.values())
+            tags = list(columns)
+        if [element.tag for element in row] == tags:
+            for values, element in zip(column_values, row):
+                values.append(element.text)
+        else:
+            texts = {element.tag: element.text for element in row}
+            for tag, values in zip(tags, column_values):
+                values.append(texts.get(tag))
+    return columns
+
+
 def flatten(l):
     """Flattens nested Iterable of arbitrary depth"""
     for el in l:
@@ -30,31 +58,70 @@ def downcase_string(s):
     return s[:1].lower() + s[1:] if s else ''
 
 
+@lru_cache(maxsize=None)
+def _signature_spec(func, bound):
+    """Cached parameter names and kwargs key name for a function's signature
+
+    :param func: plain function
+    :param bound: (bool) exclude the leading 'self' parameter of a bound method
+    :return: tuple of (tuple of named parameters, kwargs key name or None)
+    """
+    parameters = list(signature(func).parameters.values())[1 if bound else 0:]
+    names = tuple(p.name for p in parameters if p.kind != Parameter.VAR_KEYWORD)
+    kwargs_keys = [p.name for p in parameters if p.kind == Parameter.VAR_KEYWORD]
+    return names, kwargs_keys.pop() if kwargs_keys else None
+
+
+def signature_spec(f):
+    """Get the cached signature spec of a function or bound method"""
+    func = getattr(f, "__func__", f)
+    return _signature_spec(func, func is not f)
+
+
+@lru_cache(maxsize=None)
+def _compile_flattener(names, kwargs_name):
+    """Build a locals flattener for a signature spec"""
+    def flattener(loc):
+        attributes = {k: loc[k] for k in names if k in loc}
+        if kwargs_name:
+            attributes.update(loc[kwargs_name])
+        return attributes
+    return flattener
+
+
 def get_signature_kwargs_key(f):
     """Get the key name for kwargs if a method signature"""
-    keys = [k for k, v in signature(f).parameters.items() if v.kind == v.VAR_KEYWORD]
-    try:
-        return keys.pop()
-    except IndexError:  # empty list
-        return None
+    return signature_spec(f)[1]
 
 
 def flatten_signature_kwargs(func, loc):
     """flatten a signature dict by one level to move kwargs keys to locals dict"""
-    kwargs_name = get_signature_kwargs_key(func)
-    # remove unwanted metadata for class methods
-    attributes = get_signature_locals(func, loc)
-    if kwargs_name:
-        attributes.pop(kwargs_name)
-        attributes.update(loc[kwargs_name])
-    return attributes
+    return _compile_flattener(*signature_spec(func))(loc)
 
 
 def get_signature_locals(f, loc):
     """Filters locals to only include keys in original method signature"""
-    return {k: v for k, v in loc.items() if k in signature(f).parameters}
+    names, kwargs_name = signature_spec(f)
+    return {k: v for k, v in loc.items() if k in names or k == kwargs_name}
 
 
 def nullstring_dict(returnedTags):
     """Convert list to nullstring dict"""
     return {_: "" for _ in returnedTags}
+
+
+def get_choices(obj):
+    """Create tuple of available choices as defined in xsd
+
+    Recursively inspects a zeep object and extracts the available choices available when performing
+    the specific AXL call, as defined in AXL xsd.
+
+    :param obj: zeep Element data structure type
+    :return: nested tuple of the xsd-defined choices for the AXL method
+    """
+    if isinstance(obj, (Choice, Sequence)):
+        return tuple([get_choices(_) for _ in obj])
+    elif isinstance(obj, Element):
+        return obj.name
+    else:
+        raise TypeError(f"Only Choice, Sequence and Element classes inspected, Type '{obj.__class__.__name__}' found.")
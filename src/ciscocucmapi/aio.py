@@ -0,0 +1,263 @@
+"""asyncio connectors using zeep's AsyncTransport
+
+Async API wrappers reuse the synchronous API wrappers for building requests and serializing responses,
+so that every API method and its defaults behave the same in both.  A wrapped method is run against a
+replaying service: each AXL call it makes is awaited on the async transport, then the method is re-run with
+the responses so far replayed in order until it completes.  Methods issue a single AXL call in almost all cases.
+
+Requires Python 3.7+ and the 'async' extra, i.e. 'pip install ciscocucmapi[async]'.
+"""
+
+import contextvars
+
+from zeep import AsyncClient
+from zeep.exceptions import Fault
+from zeep.proxy import AsyncServiceProxy
+from zeep.transports import AsyncTransport
+
+from .api.base import reduced_page_size
+from .connectors import UCMAXLConnector
+from .definitions import AXL
+from .exceptions import IllegalSQLStatement
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+_replay = contextvars.ContextVar("replay")
+
+
+class _PendingCall(BaseException):
+    """Raised by the replaying service on an AXL call without a response yet.
+
+    Derives from BaseException so that it is not caught by API methods' error handling.
+    """
+
+    def __init__(self, operation, args, kwargs):
+        super().__init__(operation)
+        self.operation = operation
+        self.args = args
+        self.kwargs = kwargs
+
+
+class _ReplayingService(object):
+    """Service proxy returning, or raising, the current task's recorded outcomes in call order"""
+
+    def __getattr__(self, operation):
+        def call(*args, **kwargs):
+            outcomes = _replay.get()
+            if outcomes["position"] == len(outcomes["outcomes"]):
+                raise _PendingCall(operation, args, kwargs)
+            outcome = outcomes["outcomes"][outcomes["position"]]
+            outcomes["position"] += 1
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return call
+
+    def __getitem__(self, operation):
+        return getattr(self, operation)
+
+
+class _ReplayingConnector(object):
+    """Connector view for synchronous API wrappers, with calls made through the replaying service"""
+    service = _ReplayingService()
+    get_cache = None
+
+    def __init__(self, connector):
+        self._connector = connector
+
+    def __getattr__(self, name):
+        return getattr(self._connector, name)
+
+
+async def run_replayed(connector, func, *args, **kwargs):
+    """Run a synchronous API method, awaiting its AXL calls on an async connector's service
+
+    :param connector: async connector
+    :param func: API method
+    :return: API method result
+    """
+    outcomes = {"outcomes": [], "position": 0}
+    while True:
+        outcomes["position"] = 0
+        token = _replay.set(outcomes)
+        try:
+            return func(*args, **kwargs)
+        except _PendingCall as call:
+            pending = call
+        finally:
+            _replay.reset(token)
+        operation = getattr(connector.service, pending.operation)
+        try:
+            outcomes["outcomes"].append(await operation(*pending.args, **pending.kwargs))
+        except Exception as error:
+            outcomes["outcomes"].append(error)
+
+
+class AsyncAXLAPI(object):
+    """Awaitable wrapper for an AXL API wrapper
+
+    All API methods, e.g. add, get, list, update, remove and query, are coroutines with the same signatures as the
+    wrapped API's methods.  Use iter_list and query_iter to page through large results, as 'stream' and 'parallel'
+    are not supported and raise TypeError.
+    """
+
+    def __init__(self, api, connector):
+        self._api = api
+        self._connector = connector
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._api.__class__.__name__})"
+
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if not callable(attr):
+            return attr
+
+        def method(*args, **kwargs):
+            if kwargs.get("stream") or kwargs.get("parallel"):
+                raise TypeError(f"'stream' and 'parallel' are not supported by {self.__class__.__name__}.  "
+                                f"Use 'iter_list' to page through results.")
+            return run_replayed(self._connector, attr, *args, **kwargs)
+
+        method.__name__ = name
+        method.__doc__ = attr.__doc__
+        self.__dict__[name] = method
+        return method
+
+    async def iter_list(self, searchCriteria=None, returnedTags=None, skip=None, page_size=AXL["list_page_size"]):
+        """Async generator paging through all API endpoint objects
+
+        :param searchCriteria: (dict) search criteria for "list' method.  Wraps a 'fetch-all' if unspecified.
+        :param returnedTags: (dict) returned attributes.  Defaults to the full list model.
+        :param skip: (int) skip number of results
+        :param page_size: (int) initial page size.  Reduced automatically on AXL response size faults.
+        :return: async generator of Data Models for API Endpoint
+        """
+        searchCriteria, returnedTags = self._api._list_defaults(searchCriteria, returnedTags)
+        skip = skip or 0
+        while True:
+            try:
+                page = await run_replayed(self._connector, self._api._list_page, searchCriteria, returnedTags,
+                                          skip=skip, first=page_size)
+            except Fault as fault:
+                page_size = reduced_page_size(fault, page_size)
+                if not page_size:
+                    raise
+                continue
+            for item in page:
+                yield item
+            if len(page) < page_size:
+                return
+            skip += len(page)
+
+    async def query_iter(self, sql_statement, chunk_size=AXL["sql_chunk_size"]):
+        """Async generator executing a SQL query in SKIP/FIRST chunks
+
+        :param sql_statement: Informix-compliant SELECT statement, without SKIP or FIRST
+        :param chunk_size: (int) initial rows per chunk
+        :return: async generator of OrderedDict rows
+        """
+        skip = 0
+        while True:
+            try:
+                rows = await run_replayed(self._connector, self._api._query_page, sql_statement, skip, chunk_size)
+            except Fault as fault:
+                chunk_size = reduced_page_size(fault, chunk_size)
+                if not chunk_size:
+                    raise IllegalSQLStatement(message=fault.message)
+                continue
+            for row in rows:
+                yield row
+            if len(rows) < chunk_size:
+                return
+            skip += len(rows)
+
+
+class _AsyncTransport(AsyncTransport):
+    """AsyncTransport loading WSDL and XSD documents through a synchronous transport's requests session,
+    which supports 'file://' locations and shares the connector's authentication and TLS settings"""
+
+    def __init__(self, wsdl_transport, **kwargs):
+        super().__init__(**kwargs)
+        self._wsdl_transport = wsdl_transport
+
+    def _load_remote_data(self, url):
+        return self._wsdl_transport._load_remote_data(url)
+
+
+class AsyncUCMAXLConnector(UCMAXLConnector):
+    """UCM AXL API Connector on an asyncio HTTP transport
+
+    API wrappers are AsyncAXLAPI instances, so that many calls can be awaited concurrently from one event loop,
+    e.g. 'await asyncio.gather(*(axl.phone.get(name=name) for name in names))'.  Concurrent requests are capped by
+    'max_concurrency' connections.  The AIMD throttle is not used.  Helpers making blocking AXL calls, i.e. bulk(),
+    iter_bulk(), change_feed(), local_mirror() and resolver, and the sql_utils functions using the resolver, raise
+    TypeError.
+
+    Example:
+
+    async with AsyncUCMAXLConnector(username="axl", password="secret", fqdn="cucm", wsdl=wsdl) as axl:
+        phone = await axl.phone.get(name="SEP001122334455")
+    """
+    _client_class = AsyncClient
+
+    def __init__(self, **kwargs):
+        if httpx is None:
+            raise ImportError("httpx is required for AsyncUCMAXLConnector.  Install with 'pip install httpx'")
+        kwargs["throttle"] = False
+        super().__init__(**kwargs)
+
+    def _create_api(self, api_class, object_factory):
+        return AsyncAXLAPI(api_class(_ReplayingConnector(self), object_factory), self)
+
+    def _create_service(self, client):
+        # AsyncClient.create_service returns a synchronous ServiceProxy, whose operations are not awaitable
+        return AsyncServiceProxy(client, client.wsdl.bindings[self._binding_name], address=self._address)
+
+    def _create_client(self):
+        auth = httpx.BasicAuth(self._session.auth.username, self._session.auth.password)
+        self._transport = _AsyncTransport(
+            self._transport,
+            client=httpx.AsyncClient(auth=auth, verify=self._session.verify, timeout=self._timeout,
+                                     limits=httpx.Limits(max_connections=self._max_concurrency)),
+            cache=self._transport.cache
+        )
+        return super()._create_client()
+
+    def _blocking(self, name):
+        return TypeError(f"'{name}' makes blocking AXL calls and is not supported by {self.__class__.__name__}.  "
+                         f"Use UCMAXLConnector, or asyncio.gather() for concurrent calls.")
+
+    @property
+    def resolver(self):
+        raise self._blocking("resolver")
+
+    def change_feed(self, apis, returnedTags=None):
+        raise self._blocking("change_feed")
+
+    def local_mirror(self, path=":memory:"):
+        raise self._blocking("local_mirror")
+
+    def iter_bulk(self, func, iterable_of_kwargs, workers=None, stop_on_error=False):
+        raise self._blocking("iter_bulk")
+
+    def bulk(self, func, iterable_of_kwargs, workers=None, stop_on_error=False):
+        raise self._blocking("bulk")
+
+    async def get_ccm_version(self, processNodeName=None):
+        return await run_replayed(self, UCMAXLConnector.get_ccm_version, _ReplayingConnector(self),
+                                  processNodeName=processNodeName)
+
+    async def aclose(self):
+        """Close the async transport's connections"""
+        if self._client is not None:
+            await self._transport.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
@@ -1,4 +1,5 @@
 from .advanced import *
+from .base import Change
 from .base import Device
 from .base import ThinAXLAPI
 from .device import *
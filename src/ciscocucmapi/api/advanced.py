@@ -5,7 +5,6 @@ from operator import methodcaller
 from zeep.helpers import serialize_object
 
 from .._internal_utils import flatten_signature_kwargs
-from ..helpers import get_model_dict
 from .base import DeviceAXLAPI
 from .base import SimpleAXLAPI
 
@@ -39,8 +38,7 @@ class IlsConfig(SimpleAXLAPI):
 
     def get(self, clusterId, returnedTags=None, **kwargs):
         if not returnedTags:
-            get_model = self._get_wsdl_obj(self._get_model_name)
-            returnedTags = get_model_dict(get_model)
+            returnedTags = self.connector.schema_index.get_returned_tags(self)
         return super().get(clusterId=clusterId, returnedTags=returnedTags, **kwargs)
 
 
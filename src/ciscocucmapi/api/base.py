@@ -1,39 +1,26 @@
 """Base AXL APIs"""
 
 import functools
+import itertools
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from operator import methodcaller
 
 from zeep.exceptions import Fault
 from zeep.helpers import serialize_object
-from zeep.xsd.elements.element import Element
-from zeep.xsd.elements.indicators import Choice
-from zeep.xsd.elements.indicators import Sequence
 
 from .._internal_utils import check_valid_attribute_req_dict
 from .._internal_utils import downcase_string
+from .._internal_utils import element_list_to_columns
 from .._internal_utils import element_list_to_ordered_dict
 from .._internal_utils import flatten_signature_kwargs
+from .._internal_utils import get_choices
 from .._internal_utils import nullstring_dict
+from ..definitions import AXL
 from ..exceptions import IllegalSQLStatement
-from ..helpers import get_model_dict
-from ..helpers import sanitize_model_dict
-
-
-def _get_choices(obj):
-    """Create tuple of available choices as defined in xsd
-
-    Recursively inspects a zeep object and extracts the available choices available when performing
-    the specific AXL call, as defined in AXL xsd.
-
-    :param obj: zeep Element data structure type
-    :return: nested tuple of the xsd-defined choices for the AXL method
-    """
-    if isinstance(obj, (Choice, Sequence)):
-        return tuple([_get_choices(_) for _ in obj])
-    elif isinstance(obj, Element):
-        return obj.name
-    else:
-        raise TypeError(f"Only Choice, Sequence and Element classes inspected, Type '{obj.__class__.__name__}' found.")
 
 
 def check_identifiers(wsdl_obj, **kwargs):
@@ -43,11 +30,100 @@ def check_identifiers(wsdl_obj, **kwargs):
     :param kwargs: supplied identifiers to test
     :return: None
     """
-    identifiers = _get_choices(wsdl_obj.elements_nested[0][1][0])
+    identifiers = get_choices(wsdl_obj.elements_nested[0][1][0])
     if not check_valid_attribute_req_dict(identifiers, kwargs):
         raise TypeError(f"Supplied identifiers not supported for API call: {identifiers}")
 
 
+_SELECT = re.compile(r"\s*select\s+", re.IGNORECASE)
+_SKIP_OR_FIRST = re.compile(r"(skip|first|limit)\s+\d+", re.IGNORECASE)
+
+
+def reduced_page_size(fault, page_size):
+    """Determine a reduced page size from an AXL response size fault
+
+    AXL rejects 'list' responses exceeding its response size limit with a fault suggesting a
+    row count to fetch instead.  The suggestion is used where available, else the page size is halved.
+
+    :param fault: zeep Fault raised by the AXL call
+    :param page_size: (int) page size of the failed request
+    :return: (int) reduced page size, or None if the fault is not a response size fault
+    """
+    if not fault.message or AXL["query_too_large_fault"] not in fault.message:
+        return None
+    suggested = re.search(AXL["suggested_row_fetch"], fault.message)
+    if suggested and 0 < int(suggested.group(1)) < page_size:
+        return int(suggested.group(1))
+    return page_size // 2 or None
+
+
+def fetch_adaptive_page(fetch, skip, first):
+    """Fetch a page, reducing the page size until the response fits within AXL limits
+
+    :param fetch: callable taking 'skip' and 'first' and returning a list of results
+    :param skip: (int) skip number of results
+    :param first: (int) requested page size
+    :return: tuple of (list of results, page size used)
+    """
+    while True:
+        try:
+            return fetch(skip, first), first
+        except Fault as fault:
+            page_size = reduced_page_size(fault, first)
+            if not page_size:
+                raise
+            first = page_size
+
+
+def iter_pages(fetch, skip, page_size):
+    """Generator driving 'skip' and 'first' to yield results page by page
+
+    The next page is requested in a background thread while the current page is consumed,
+    so at most two pages are held in memory at any one time.
+
+    :param fetch: callable taking 'skip' and 'first' and returning a list of results
+    :param skip: (int) skip number of results
+    :param page_size: (int) initial page size.  Reduced automatically on AXL response size faults.
+    :return: generator of results
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(fetch_adaptive_page, fetch, skip, page_size)
+        while pending:
+            page, page_size = pending.result()
+            skip += len(page)
+            pending = executor.submit(fetch_adaptive_page, fetch, skip, page_size) if len(page) == page_size else None
+            yield from page
+
+
+class SharedPageSize(object):
+    """Page size shared by concurrent page fetches, so that AXL response size limits are discovered once"""
+
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+
+    def reduce(self, size):
+        """Reduce the shared page size, e.g. to the page size used after a response size fault"""
+        with self._lock:
+            self.size = min(self.size, size)
+
+
+def paged_sql_statement(sql_statement, skip, first):
+    """Rewrite an Informix SELECT statement to return a single page of results using SKIP and FIRST
+
+    :param sql_statement: Informix-compliant SELECT statement
+    :param skip: (int) skip number of rows
+    :param first: (int) return first number of rows
+    :return: (str) paged SQL statement
+    """
+    match = _SELECT.match(sql_statement)
+    if not match:
+        raise IllegalSQLStatement(message="Only SELECT statements can be paged")
+    if _SKIP_OR_FIRST.match(sql_statement, match.end()):
+        raise IllegalSQLStatement(message="SELECT statement already includes SKIP or FIRST")
+    return f"{match.group(0)}SKIP {skip} FIRST {first} {sql_statement[match.end():]}"
+
+
 def classproperty(func):
     """Decorator function to denote class properties"""
     if not isinstance(func, (classmethod, staticmethod)):
@@ -80,6 +156,58 @@ class BaseAXLAPI(object):
     def factory_descriptor(cls):  # noqa
         return cls._factory_descriptor
 
+    @property
+    def get_cache(self):
+        """Connector's read-through 'get' cache, or None if caching is disabled"""
+        return self.connector.get_cache
+
+    def _cached_get(self, kwargs, loader):
+        """Read a serialized 'get' response through the connector's get cache
+
+        Cached responses include the API's identifier tags, e.g. 'name', so that entries are invalidated by
+        updates and removals using any identifier.  APIs without identifiers, e.g. LdapSystem, are not cached.
+
+        :param kwargs: 'get' method kwargs
+        :param loader: callable taking 'get' method kwargs and returning the serialized response
+        :return: serialized response
+        """
+        if self.get_cache is None:
+            return loader(kwargs)
+        identifiers = self.connector.schema_index.identifiers(self)
+        if not identifiers:
+            return loader(kwargs)
+        return self.get_cache.fetch(self.__class__.__name__, identifiers, kwargs,
+                                    lambda: loader(self._with_identifier_tags(kwargs, identifiers)))
+
+    def _with_identifier_tags(self, kwargs, identifiers):
+        """Add identifier fields to restricted 'get' returnedTags, so responses can be tagged by all identifiers
+
+        :param kwargs: 'get' method kwargs
+        :param identifiers: nested tuple of the API's identifier choices
+        :return: 'get' method kwargs
+        """
+        returnedTags = kwargs.get("returnedTags")
+        if not returnedTags:
+            return kwargs  # the full model is returned
+        supported = self.connector.schema_index.get_returned_tags(self)
+        fields = [_ for choice in identifiers for _ in ((choice,) if isinstance(choice, str) else choice)]
+        missing = [_ for _ in fields if _ in supported and _ not in returnedTags]
+        if not missing:
+            return kwargs
+        return dict(kwargs, returnedTags=dict(returnedTags, **nullstring_dict(missing)))
+
+    def _invalidate_cached(self, obj):
+        """Invalidate cached 'get' responses for an added, updated or removed object
+
+        :param obj: (dict) object or method kwargs including identifiers
+        :return: None
+        """
+        if self.get_cache is None or "get" not in self.supported_methods:
+            return
+        identifiers = self.connector.schema_index.identifiers(self)
+        if identifiers:
+            self.get_cache.invalidate(self.__class__.__name__, identifiers, obj)
+
     @classmethod
     def assert_supported(cls, func):
         """Decorator looks up func's name in self.supported_methods."""
@@ -139,10 +267,13 @@ class SimpleAXLAPI(BaseAXLAPI):
         :param kwargs: AXL method attribute kwargs dictionary
         :return: Data Model object containing the serialized response data dict
         """
-        axl_resp = self._axl_methodcaller(action, **kwargs)
+        def load(load_kwargs):
+            axl_resp = self._axl_methodcaller(action, **load_kwargs)
+            return serialize_object(axl_resp)["return"][self._return_name]
+
         return self.object_factory(
             self.__class__.__name__,
-            serialize_object(axl_resp)["return"][self._return_name])
+            self._cached_get(kwargs, load) if action == "get" else load(kwargs))
 
     def _serialize_uuid_resp(self, action, **kwargs):
         """Serialize commons responses that return a uuid string only
@@ -152,6 +283,8 @@ class SimpleAXLAPI(BaseAXLAPI):
         :return: (str) uuid
         """
         axl_resp = self._axl_methodcaller(action, **kwargs)
+        if action in ("add", "update", "remove"):
+            self._invalidate_cached(kwargs.get(self._return_name, {}) if action == "add" else kwargs)
         return serialize_object(axl_resp)["return"]
 
     @BaseAXLAPI.assert_supported
@@ -164,11 +297,11 @@ class SimpleAXLAPI(BaseAXLAPI):
         :param sanitized: collapse zeep's interpretation of the xsd nested dicts
         with '_value_1' and 'uuid' keys into a simple k,v pair with v as a (str)
         :param include_types: (bool) include zeep model type inspection
-        :return: empty data model dictionary
+        :return: empty data model dictionary.  Templates are cached per connector and returned frozen -
+        use thaw() for a mutable copy.
         """
         if target_model == "add":
-            model = get_model_dict(self._fetch_add_model(), include_types=include_types)
-            return sanitize_model_dict(model) if sanitized else model
+            return self.connector.schema_index.add_model(self, sanitized=sanitized, include_types=include_types)
         else:
             raise NotImplementedError
 
@@ -192,8 +325,6 @@ class SimpleAXLAPI(BaseAXLAPI):
         """Get method for API endpoint"""
         if isinstance(returnedTags, list):
             returnedTags = nullstring_dict(returnedTags)
-        # define zeep objects for method generically
-        get_method = self._get_wsdl_obj(self._get_method_name)
         get_kwargs = flatten_signature_kwargs(self.get, locals())
         return self._serialize_axl_object("get", **get_kwargs)
 
@@ -202,30 +333,32 @@ class SimpleAXLAPI(BaseAXLAPI):
         """Update method for API endpoint"""
         return self._serialize_uuid_resp("update", **kwargs)
 
-    @BaseAXLAPI.assert_supported
-    def list(self, searchCriteria=None, returnedTags=None, skip=None, first=None):
-        """Fetch a list of API endpoint objects.
-
-        Note:
-        'searchCriteria=None' or 'returnedTags=None' may have VERY verbose output
-        and create large responses over 8MB, potentially resulting in AXL errors for large data sets.
+    def _list_defaults(self, searchCriteria=None, returnedTags=None):
+        """Resolve default 'list' searchCriteria and returnedTags
 
         :param searchCriteria: (dict) search criteria for "list' method.  Wraps a 'fetch-all' if unspecified.
-        :param returnedTags: (dict) returned attributes.  If none, wrapper
-        :param skip: (int) skip number of results
-        :param first: (int) return first number of results
-        :return: list of Data Models for API Endpoint
+        :param returnedTags: (dict or list) returned attributes.  Defaults to the full list model if unspecified.
+        :return: tuple of (searchCriteria, returnedTags)
         """
         if not searchCriteria:
             # this is presumptive and may not work in all cases.
-            list_method = self._get_wsdl_obj(self._list_method_name)
-            supported_criteria = [element[0] for element in list_method.elements[0][1].type.elements]
+            supported_criteria = self.connector.schema_index.search_criteria(self)
             searchCriteria = {supported_criteria[0]: "%"}
         if not returnedTags:
-            list_model = self._get_wsdl_obj(self._list_model_name)
-            returnedTags = get_model_dict(list_model)
+            returnedTags = self.connector.schema_index.list_returned_tags(self)
         elif isinstance(returnedTags, list):
             returnedTags = nullstring_dict(returnedTags)
+        return searchCriteria, returnedTags
+
+    def _list_page(self, searchCriteria, returnedTags, skip=None, first=None):
+        """Execute a single 'list' AXL call
+
+        :param searchCriteria: (dict) resolved search criteria
+        :param returnedTags: (dict) resolved returned attributes
+        :param skip: (int) skip number of results
+        :param first: (int) return first number of results
+        :return: list of Data Models for API Endpoint
+        """
         axl_resp = self._axl_methodcaller("list", searchCriteria=searchCriteria, returnedTags=returnedTags,
                                           skip=skip, first=first)
         try:
@@ -234,6 +367,113 @@ class SimpleAXLAPI(BaseAXLAPI):
         except TypeError:
             return []
 
+    def _adaptive_list_page(self, searchCriteria, returnedTags, skip, first):
+        """Fetch a 'list' page, reducing the page size until the response fits within AXL limits
+
+        :param searchCriteria: (dict) resolved search criteria
+        :param returnedTags: (dict) resolved returned attributes
+        :param skip: (int) skip number of results
+        :param first: (int) requested page size
+        :return: tuple of (list of Data Models, page size used)
+        """
+        return fetch_adaptive_page(functools.partial(self._list_page, searchCriteria, returnedTags), skip, first)
+
+    def _iter_list(self, searchCriteria, returnedTags, skip=None, page_size=AXL["list_page_size"]):
+        """Generator driving 'skip' and 'first' to yield list results page by page"""
+        return iter_pages(functools.partial(self._list_page, searchCriteria, returnedTags), skip or 0, page_size)
+
+    def _list_window(self, searchCriteria, returnedTags, skip, size, page_size):
+        """Fetch a fixed 'skip'/'first' window, in several requests if AXL response size limits require it
+
+        :param searchCriteria: (dict) resolved search criteria
+        :param returnedTags: (dict) resolved returned attributes
+        :param skip: (int) start of window
+        :param size: (int) window size
+        :param page_size: SharedPageSize, reduced for all windows on AXL response size faults
+        :return: list of Data Models for API Endpoint
+        """
+        rows = []
+        while len(rows) < size:
+            requested = min(page_size.size, size - len(rows))
+            page, first = self._adaptive_list_page(searchCriteria, returnedTags, skip + len(rows), requested)
+            page_size.reduce(first)
+            rows.extend(page)
+            if len(page) < first:
+                break
+        return rows
+
+    def _iter_list_parallel(self, searchCriteria, returnedTags, skip=None, page_size=AXL["list_page_size"],
+                            workers=None):
+        """Generator fetching 'skip'/'first' windows concurrently while preserving result order
+
+        Windows are requested ahead of the results, without counting results first.  At most 'workers' windows
+        are in flight, bounded by the connector's concurrency cap, and no further windows are requested once a
+        window comes back short, so at most 'workers' - 1 requests are made past the end of the results.
+        """
+        skip = skip or 0
+        workers = min(workers or self.connector.max_concurrency, self.connector.max_concurrency)
+        windows = itertools.count(skip, page_size)
+        fetch = functools.partial(self._list_window, searchCriteria, returnedTags, size=page_size,
+                                  page_size=SharedPageSize(page_size))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque(executor.submit(fetch, window) for window in islice(windows, workers))
+            while pending:
+                page = pending.popleft().result()
+                if len(page) < page_size:
+                    for future in pending:
+                        future.cancel()
+                    yield from page
+                    return
+                pending.append(executor.submit(fetch, next(windows)))
+                yield from page
+
+    @BaseAXLAPI.assert_supported
+    def list(self, searchCriteria=None, returnedTags=None, skip=None, first=None,
+             stream=False, parallel=False, page_size=AXL["list_page_size"], workers=None):
+        """Fetch a list of API endpoint objects.
+
+        Note:
+        'searchCriteria=None' or 'returnedTags=None' may have VERY verbose output
+        and create large responses over 8MB, potentially resulting in AXL errors for large data sets.
+        Use 'stream=True' or 'parallel=True' for large data sets.
+
+        :param searchCriteria: (dict) search criteria for "list' method.  Wraps a 'fetch-all' if unspecified.
+        :param returnedTags: (dict) returned attributes.  If none, wrapper
+        :param skip: (int) skip number of results
+        :param first: (int) return first number of results.  Ignored when streaming or fetching in parallel.
+        :param stream: (bool) return a generator paging through results using 'skip' and 'first'
+        :param parallel: (bool) fetch pages concurrently.  Result order is preserved.
+        :param page_size: (int) initial page size when paging.  Reduced automatically on AXL response size faults.
+        :param workers: (int) concurrent page requests when fetching in parallel.
+        Capped at the connector's 'max_concurrency'.
+        :return: list (or generator, if streaming) of Data Models for API Endpoint
+        """
+        searchCriteria, returnedTags = self._list_defaults(searchCriteria, returnedTags)
+        if parallel:
+            results = self._iter_list_parallel(searchCriteria, returnedTags, skip=skip, page_size=page_size,
+                                               workers=workers)
+            return results if stream else [item for item in results]
+        if stream:
+            return self._iter_list(searchCriteria, returnedTags, skip=skip, page_size=page_size)
+        return self._list_page(searchCriteria, returnedTags, skip=skip, first=first)
+
+    def iter_list(self, searchCriteria=None, returnedTags=None, skip=None, page_size=AXL["list_page_size"],
+                  parallel=False, workers=None):
+        """Lazily iterate over all API endpoint objects, paging through results automatically.
+
+        Equivalent to 'list(stream=True)'.
+
+        :param searchCriteria: (dict) search criteria for "list' method.  Wraps a 'fetch-all' if unspecified.
+        :param returnedTags: (dict) returned attributes.  If none, wrapper
+        :param skip: (int) skip number of results
+        :param page_size: (int) initial page size.  Reduced automatically on AXL response size faults.
+        :param parallel: (bool) fetch pages concurrently.  Result order is preserved.
+        :param workers: (int) concurrent page requests when fetching in parallel
+        :return: generator of Data Models for API Endpoint
+        """
+        return self.list(searchCriteria=searchCriteria, returnedTags=returnedTags, skip=skip,
+                         stream=True, parallel=parallel, page_size=page_size, workers=workers)
+
     @BaseAXLAPI.assert_supported
     def remove(self, **kwargs):
         """Remove method for API endpoint"""
@@ -292,28 +532,74 @@ class DeviceAXLAPI(SimpleAXLAPI):
 class ThinAXLAPI(BaseAXLAPI):
     """API extension for Thin AXL"""
     _factory_descriptor = "sql"
-    supported_methods = ["query", "update"]
+    supported_methods = ["query", "query_iter", "update"]
+
+    @staticmethod
+    def _serialize_rows(axl_resp):
+        """Serialize an executeSQLQuery response to a list of OrderedDict rows"""
+        try:
+            return element_list_to_ordered_dict(serialize_object(axl_resp)["return"]["rows"])
+        except KeyError:
+            # single tuple response
+            return element_list_to_ordered_dict(serialize_object(axl_resp)["return"]["row"])
+        except TypeError:
+            # no SQL tuples
+            return serialize_object(axl_resp)["return"]
+
+    @staticmethod
+    def _serialize_columns(axl_resp):
+        """Serialize an executeSQLQuery response to an OrderedDict of column name to column values"""
+        try:
+            return element_list_to_columns(serialize_object(axl_resp)["return"]["rows"])
+        except KeyError:
+            return element_list_to_columns(serialize_object(axl_resp)["return"]["row"])
+        except TypeError:
+            # no SQL tuples
+            return None
+
+    def _query_page(self, sql_statement, skip, first):
+        """Execute a single SKIP/FIRST page of a SELECT statement
+
+        :return: list of OrderedDict rows
+        """
+        axl_resp = self.connector.service.executeSQLQuery(sql=paged_sql_statement(sql_statement, skip, first))
+        return self._serialize_rows(axl_resp) or []
 
     @BaseAXLAPI.assert_supported
-    def query(self, sql_statement):
+    def query(self, sql_statement, columnar=False):
         """Execute SQL query via Thin AXL
 
         :param sql_statement: Informix-compliant SQL statement
+        :param columnar: (bool) return a column-oriented data model, holding one list of values per column
+        rather than one OrderedDict per row.  Recommended for large results.
         :return: SQL Thin AXL data model object
         """
         try:
             axl_resp = self.connector.service.executeSQLQuery(sql=sql_statement)
-            try:
-                serialized_resp = element_list_to_ordered_dict(
-                    serialize_object(axl_resp)["return"]["rows"])
-            except KeyError:
-                # single tuple response
-                serialized_resp = element_list_to_ordered_dict(
-                    serialize_object(axl_resp)["return"]["row"])
-            except TypeError:
-                # no SQL tuples
-                serialized_resp = serialize_object(axl_resp)["return"]
-            return self.object_factory(self.__class__.__name__, serialized_resp)
+            if columnar:
+                return self.object_factory("ThinAXLColumns", self._serialize_columns(axl_resp))
+            return self.object_factory(self.__class__.__name__, self._serialize_rows(axl_resp))
+        except Fault as fault:
+            raise IllegalSQLStatement(message=fault.message)
+
+    @BaseAXLAPI.assert_supported
+    def query_iter(self, sql_statement, chunk_size=AXL["sql_chunk_size"]):
+        """Lazily execute a SQL query via Thin AXL in SKIP/FIRST chunks
+
+        Rows are yielded as each chunk arrives, with the next chunk prefetched in the background, so full tables
+        can be exported in bounded memory.  The chunk size is reduced automatically if Thin AXL rejects a
+        response as too large.
+
+        Note:
+        Include an ORDER BY clause (e.g. 'ORDER BY pkid') for stable paging across chunks.
+
+        :param sql_statement: Informix-compliant SELECT statement, without SKIP or FIRST
+        :param chunk_size: (int) initial rows per chunk
+        :return: generator of OrderedDict rows
+        """
+        rows = iter_pages(functools.partial(self._query_page, sql_statement), 0, chunk_size)
+        try:
+            yield from rows
         except Fault as fault:
             raise IllegalSQLStatement(message=fault.message)
 
@@ -352,3 +638,28 @@ class Device(BaseAXLAPI):
         reset_kwargs = flatten_signature_kwargs(self.reset, locals())
         axl_resp = self.connector.service.doDeviceLogin(**reset_kwargs)
         return serialize_object(axl_resp)["return"]
+
+
+class Change(BaseAXLAPI):
+    """API Extension for the AXL change notification queue"""
+    _factory_descriptor = "change"
+    supported_methods = ["list"]
+
+    @BaseAXLAPI.assert_supported
+    def list(self, startChangeId=None, queueId=None, objectList=None):
+        """List changes queued since a change id
+
+        Exclude 'startChangeId' on the first request to get the current queue position.  On subsequent requests
+        send the 'nextStartChangeId' and 'queueId' from the prior response's 'queueInfo'.
+
+        :param startChangeId: (int) first change id to return
+        :param queueId: (str) change queue id, required with 'startChangeId'
+        :param objectList: (list) AXL object types to return changes for, e.g. ["Phone", "Line"].  Defaults to all.
+        :return: (dict) 'queueInfo' and 'changes'
+        """
+        if startChangeId is not None:
+            startChangeId = {"_value_1": startChangeId, "queueId": queueId}
+        if objectList:
+            objectList = {"object": objectList}
+        axl_resp = self.connector.service.listChange(startChangeId=startChangeId, objectList=objectList)
+        return serialize_object(axl_resp)
@@ -8,7 +8,6 @@ from zeep.helpers import serialize_object
 from .._internal_utils import flatten_signature_kwargs
 from .._internal_utils import get_signature_locals
 from .._internal_utils import nullstring_dict
-from ..helpers import get_model_dict
 from .base import DeviceAXLAPI
 from .base import SimpleAXLAPI
 
@@ -319,18 +318,15 @@ class EnterpriseParameter(ServiceParameter):
         axl_resp = self.connector.service.getServiceParameter(**get_kwargs)
         return serialize_object(axl_resp)["return"][self._return_name]
 
-    def list(self, searchCriteria=None, returnedTags=None, skip=None, first=None):
-        # todo - warrants rework in base class
+    def _list_defaults(self, searchCriteria=None, returnedTags=None):
         if not searchCriteria:
             searchCriteria = {
                 "processNodeName": "EnterpriseWideData",
                 "service": "Enterprise Wide"
             }
-        if not returnedTags:
-            list_model = self._get_wsdl_obj(self._list_model_name)
-            returnedTags = get_model_dict(list_model)
-        elif isinstance(returnedTags, list):
-            returnedTags = nullstring_dict(returnedTags)
+        return super()._list_defaults(searchCriteria, returnedTags)
+
+    def _list_page(self, searchCriteria, returnedTags, skip=None, first=None):
         axl_resp = self.connector.service.listServiceParameter(searchCriteria=searchCriteria,
                                                                returnedTags=returnedTags,
                                                                skip=skip,
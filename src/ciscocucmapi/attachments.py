@@ -0,0 +1,255 @@
+"""Incremental parsers for SOAP responses with attachments, streaming attachment content to a sink
+
+Parsers are fed response chunks as they are read, and pass attachment content to the sink as memoryview slices of
+those chunks, so that attachments are never held in memory.  Sinks must consume each slice before returning, e.g.
+a file's write method.  The root part, i.e. the SOAP envelope, is kept as 'envelope'.
+"""
+
+import re
+import struct
+from email.message import Message
+
+from .definitions import ATTACHMENTS
+from .exceptions import AttachmentError
+
+_DIME_HEADER = struct.Struct(">BBHHHI")
+
+
+def _padded(length):
+    """DIME fields are padded to 4 byte multiples"""
+    return (length + 3) & ~3
+
+
+class MultipartStreamParser(object):
+    """multipart/related (SOAP with Attachments) parser
+
+    Body content is searched for the delimiter in place, and passed on as memoryview slices of each chunk.  Only
+    part headers and a held back partial delimiter, i.e. a few bytes per chunk, are copied to reusable buffers.
+    """
+
+    def __init__(self, boundary, sink):
+        """Create a parser
+
+        :param boundary: (str) multipart boundary, from the response Content-Type
+        :param sink: callable receiving attachment content as memoryview slices
+        """
+        self._delimiter = b"\r\n--" + boundary.encode()
+        self._pattern = re.compile(re.escape(self._delimiter))
+        self._sink = sink
+        self._state = "preamble"
+        # the first delimiter is not preceded by a line break
+        self._buffer = bytearray(b"\r\n")
+        self._tail = bytearray()
+        self.parts = 0
+        self.envelope = bytearray()
+        self.complete = False
+
+    def _emit(self, view):
+        if not view:
+            return
+        if self.parts == 1:
+            self.envelope += view
+        else:
+            self._sink(view)
+
+    def _emit_tail(self, size):
+        """Pass on the first 'size' held back bytes, releasing the view so that the tail buffer can be resized"""
+        with memoryview(self._tail) as tail, tail[:size] as view:
+            self._emit(view)
+        del self._tail[:size]
+
+    def _feed_body(self, view, position):
+        """Pass body content on up to the next delimiter, holding back a possible partial delimiter
+
+        :return: position in the chunk following the delimiter, or the end of the chunk
+        """
+        size = len(self._delimiter)
+        if self._tail:
+            # a delimiter may start in the held back tail and end in this chunk
+            held = len(self._tail)
+            self._tail += view[position:position + size - 1]
+            i = self._tail.find(self._delimiter)
+            if i != -1:
+                self._emit_tail(i)
+                self._tail.clear()
+                self._state = "delimiter"
+                return position + i + size - held
+            if len(view) - position < size - 1:
+                # the whole chunk is held back, bar bytes which can no longer start a delimiter
+                self._emit_tail(max(len(self._tail) - (size - 1), 0))
+                return len(view)
+            self._emit_tail(held)
+            self._tail.clear()
+        match = self._pattern.search(view, position)
+        if match:
+            self._emit(view[position:match.start()])
+            self._state = "delimiter"
+            return match.end()
+        held = min(size - 1, len(view) - position)
+        self._emit(view[position:len(view) - held])
+        self._tail += view[len(view) - held:]
+        return len(view)
+
+    def _parse_buffered(self):
+        """Parse the preamble, delimiter line and part headers from the buffer
+
+        :return: buffer index of the part body, once the part headers are complete, else None
+        """
+        while True:
+            if self._state == "preamble":
+                i = self._buffer.find(self._delimiter)
+                if i == -1:
+                    del self._buffer[:max(len(self._buffer) - len(self._delimiter) + 1, 0)]
+                    return None
+                del self._buffer[:i + len(self._delimiter)]
+                self._state = "delimiter"
+            elif self._state == "delimiter":
+                if self._buffer[:2] == b"--":
+                    self.complete = True
+                    return None
+                i = self._buffer.find(b"\r\n")
+                if i == -1:
+                    return None
+                del self._buffer[:i + 2]
+                self._state = "headers"
+            else:
+                i = 0 if self._buffer[:2] == b"\r\n" else self._buffer.find(b"\r\n\r\n")
+                if i == -1:
+                    return None
+                self._state = "body"
+                self.parts += 1
+                return i + (2 if i == 0 else 4)
+
+    def _feed_buffered(self, view, position):
+        """Buffer the preamble, delimiter line and part headers, which are small, a read size at a time
+
+        :return: position in the chunk following the consumed data
+        """
+        read = view[position:position + ATTACHMENTS["header_read_size"]]
+        self._buffer += read
+        body = self._parse_buffered()
+        if body is None:
+            return position + len(read)
+        # the body starts within the bytes just read, as headers are parsed on every read
+        unread = len(self._buffer) - body
+        self._buffer.clear()
+        return position + len(read) - unread
+
+    def feed(self, chunk):
+        """Parse a response chunk
+
+        :param chunk: (bytes) response content
+        :return: None
+        """
+        view = memoryview(chunk)
+        position = 0
+        while position < len(view) and not self.complete:
+            if self._state == "body":
+                position = self._feed_body(view, position)
+            else:
+                position = self._feed_buffered(view, position)
+
+    def close(self):
+        """Check the response was complete and had an attachment"""
+        if not self.complete or self.parts < 2:
+            raise AttachmentError("Incomplete multipart response, or no attachment")
+
+
+class DimeStreamParser(object):
+    """DIME message parser, joining chunked records"""
+
+    def __init__(self, sink):
+        """Create a parser
+
+        :param sink: callable receiving attachment content as memoryview slices
+        """
+        self._sink = sink
+        self._state = "header"
+        self._need = _DIME_HEADER.size
+        self._buffer = bytearray()
+        self._remaining = 0
+        self._padding = 0
+        self._chunked = False
+        self._last = False
+        self.records = 0
+        self.envelope = bytearray()
+        self.complete = False
+
+    def _emit(self, view):
+        if self.records == 1:
+            self.envelope += view
+        else:
+            self._sink(view)
+
+    def _parse_header(self):
+        flags, _, options_length, id_length, type_length, data_length = _DIME_HEADER.unpack(self._buffer)
+        if flags >> 3 != 1:
+            raise AttachmentError(f"Unsupported DIME version: {flags >> 3}")
+        # a record continues the previous record's payload if that record was chunked
+        if not self._chunked:
+            self.records += 1
+        self._last = bool(flags & 0x02)
+        self._chunked = bool(flags & 0x01)
+        self._remaining = data_length
+        self._padding = _padded(data_length) - data_length
+        self._need = _padded(options_length) + _padded(id_length) + _padded(type_length)
+        self._state = "fields"
+
+    def _next_state(self):
+        """Advance past empty fields, data and padding"""
+        if self._state == "fields" and not self._need:
+            self._state = "data"
+        if self._state == "data" and not self._remaining:
+            self._state, self._need = "padding", self._padding
+        if self._state == "padding" and not self._need:
+            if self._last and not self._chunked:
+                self.complete = True
+            self._state, self._need = "header", _DIME_HEADER.size
+
+    def feed(self, chunk):
+        """Parse a response chunk
+
+        :param chunk: (bytes) response content
+        :return: None
+        """
+        view = memoryview(chunk)
+        while view and not self.complete:
+            if self._state == "data":
+                size = min(len(view), self._remaining)
+                self._emit(view[:size])
+                view = view[size:]
+                self._remaining -= size
+                self._next_state()
+                continue
+            size = min(self._need - len(self._buffer), len(view))
+            self._buffer += view[:size]
+            view = view[size:]
+            if len(self._buffer) < self._need:
+                return
+            if self._state == "header":
+                self._parse_header()
+            else:
+                self._need = 0
+            self._buffer.clear()
+            self._next_state()
+
+    def close(self):
+        """Check the response was complete and had an attachment"""
+        if not self.complete or self.records < 2:
+            raise AttachmentError("Incomplete DIME response, or no attachment")
+
+
+def attachment_parser(content_type, sink):
+    """Parser for a response's attachment encoding
+
+    :param content_type: (str) response Content-Type header
+    :param sink: callable receiving attachment content as memoryview slices
+    :return: MultipartStreamParser or DimeStreamParser
+    """
+    message = Message()
+    message["Content-Type"] = content_type or ""
+    if message.get_content_type() == "application/dime":
+        return DimeStreamParser(sink)
+    if message.get_content_maintype() == "multipart" and message.get_param("boundary"):
+        return MultipartStreamParser(message.get_param("boundary"), sink)
+    raise AttachmentError(f"Unexpected response content type: {content_type}")
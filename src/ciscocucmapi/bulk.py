@@ -0,0 +1,44 @@
+"""Parallel bulk execution of API calls"""
+
+from collections import deque
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+BulkResult = namedtuple("BulkResult", ["kwargs", "result", "error"])
+
+
+def _call(func, kwargs, slots):
+    """Call func with kwargs within a concurrency slot, capturing the result or error"""
+    with slots:
+        try:
+            return BulkResult(kwargs, func(**kwargs), None)
+        except Exception as error:
+            return BulkResult(kwargs, None, error)
+
+
+def iter_bulk(func, iterable_of_kwargs, slots, workers, stop_on_error=False):
+    """Generator calling func for each kwargs dict across a thread pool, yielding results in input order
+
+    Calls are submitted in a bounded window, so arbitrarily large iterables are consumed lazily.
+
+    :param func: API method, e.g. axl.phone.add
+    :param iterable_of_kwargs: iterable of kwargs dicts, one per call
+    :param slots: semaphore bounding concurrent calls across all bulk jobs sharing it
+    :param workers: (int) worker threads
+    :param stop_on_error: (bool) stop submitting calls after the first error.  Calls already in flight complete,
+    but only results up to and including the first error are yielded.
+    :return: generator of BulkResult
+    """
+    calls = iter(iterable_of_kwargs)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque(executor.submit(_call, func, kwargs, slots) for kwargs in islice(calls, workers * 2))
+        while pending:
+            result = pending.popleft().result()
+            yield result
+            if stop_on_error and result.error is not None:
+                for future in pending:
+                    future.cancel()
+                return
+            for kwargs in islice(calls, 1):
+                pending.append(executor.submit(_call, func, kwargs, slots))
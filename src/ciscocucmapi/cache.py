@@ -0,0 +1,231 @@
+"""Read-through caching of AXL 'get' responses"""
+
+import copy
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .helpers import extract_pkid_from_uuid
+
+
+def _identifier_value(field, value):
+    """Comparable identifier value - uuids are brace and case-insensitive, references may be '_value_1' dicts"""
+    if isinstance(value, dict):
+        value = value.get("_value_1")
+    if field == "uuid" and isinstance(value, str):
+        value = extract_pkid_from_uuid(value).lower()
+    return value
+
+
+def identifier_tags(type_name, identifiers, obj):
+    """Invalidation tags for an object, one per identifier choice fully present in the object
+
+    :param type_name: API class name
+    :param identifiers: nested tuple of identifier choices, e.g. ('uuid', ('pattern', 'routePartitionName'))
+    :param obj: (dict) AXL object or method kwargs
+    :return: list of (str) tags
+    """
+    tags = []
+    for choice in identifiers:
+        fields = (choice,) if isinstance(choice, str) else choice
+        values = [_identifier_value(field, obj.get(field)) for field in fields]
+        if all(value is not None for value in values):
+            tags.append(json.dumps([type_name, list(zip(fields, values))], default=str))
+    return tags
+
+
+class MemoryCacheBackend(object):
+    """In-memory LRU cache backend"""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._tags = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Get an entry, marking it as recently used
+
+        :return: tuple of (expiry, value), or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0], copy.deepcopy(entry[1])
+
+    def set(self, key, expires, value, tags):
+        self.delete(key)
+        self._entries[key] = (expires, copy.deepcopy(value), tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self.delete(next(iter(self._entries)))
+
+    def delete(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for tag in entry[2]:
+                keys = self._tags.get(tag)
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def delete_tagged(self, tag):
+        """Delete all entries with a tag
+
+        :return: (int) number of deleted entries
+        """
+        keys = list(self._tags.get(tag, ()))
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._tags.clear()
+
+
+class DiskCacheBackend(object):
+    """SQLite cache backend, persisting cached responses across connectors and processes
+
+    Note:
+    Values are pickled and must only be loaded from trusted locations.
+    """
+
+    def __init__(self, path):
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        with self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, expires REAL, value BLOB)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS tags (tag TEXT NOT NULL, key TEXT NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS tags_key ON tags (key)")
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get(self, key):
+        row = self._db.execute("SELECT expires, value FROM entries WHERE key = ?", (key,)).fetchone()
+        return (row[0], pickle.loads(row[1])) if row else None
+
+    def set(self, key, expires, value, tags):
+        with self._db:
+            self._delete(key)
+            self._db.execute("INSERT INTO entries VALUES (?, ?, ?)",
+                             (key, expires, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+            self._db.executemany("INSERT INTO tags VALUES (?, ?)", ((tag, key) for tag in tags))
+
+    def _delete(self, key):
+        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._db.execute("DELETE FROM tags WHERE key = ?", (key,))
+
+    def delete(self, key):
+        with self._db:
+            self._delete(key)
+
+    def delete_tagged(self, tag):
+        with self._db:
+            keys = [row[0] for row in self._db.execute("SELECT key FROM tags WHERE tag = ?", (tag,))]
+            for key in keys:
+                self._delete(key)
+        return len(keys)
+
+    def clear(self):
+        with self._db:
+            self._db.execute("DELETE FROM entries")
+            self._db.execute("DELETE FROM tags")
+
+
+class GetCache(object):
+    """Read-through cache for API 'get' methods
+
+    Responses are keyed by API, identifiers and returnedTags, and expire after a per-API TTL.
+    Cached objects are invalidated when the connector adds, updates or removes them.
+
+    Example:
+
+    from ciscocucmapi.cache import GetCache
+    axl = UCMAXLConnector(get_cache=GetCache(ttl=60, ttls={"DevicePool": 3600, "Css": 3600}))
+    """
+
+    def __init__(self, ttl=300, ttls=None, maxsize=1024, backend=None):
+        """Configure a get cache
+
+        :param ttl: (float) default time to live in seconds.  None to cache until invalidated.
+        :param ttls: (dict) time to live per API class name, e.g. {"DevicePool": 3600}.  0 disables caching.
+        :param maxsize: (int) maximum entries for the default in-memory LRU backend
+        :param backend: cache backend, e.g. DiskCacheBackend(path).  Defaults to MemoryCacheBackend(maxsize).
+        """
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.backend = backend if backend is not None else MemoryCacheBackend(maxsize)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+    def _ttl(self, type_name):
+        return self.ttls.get(type_name, self.ttl)
+
+    @staticmethod
+    def _key(type_name, kwargs):
+        return json.dumps([type_name, kwargs], sort_keys=True, default=str)
+
+    def fetch(self, type_name, identifiers, kwargs, loader):
+        """Get a cached response, or load and cache it
+
+        :param type_name: API class name
+        :param identifiers: nested tuple of the API's identifier choices
+        :param kwargs: 'get' method kwargs, including returnedTags
+        :param loader: callable returning the serialized response on a miss
+        :return: serialized response
+        """
+        ttl = self._ttl(type_name)
+        if ttl == 0:
+            return loader()
+        key = self._key(type_name, kwargs)
+        with self._lock:
+            entry = self.backend.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.time()):
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = loader()
+        tags = set(identifier_tags(type_name, identifiers, kwargs) + identifier_tags(type_name, identifiers, value))
+        with self._lock:
+            self.backend.set(key, time.time() + ttl if ttl is not None else None, value, sorted(tags))
+        return value
+
+    def invalidate(self, type_name, identifiers, obj):
+        """Invalidate cached responses for an object
+
+        :param type_name: API class name
+        :param identifiers: nested tuple of the API's identifier choices
+        :param obj: (dict) object or method kwargs including identifiers
+        :return: (int) number of invalidated entries
+        """
+        with self._lock:
+            return sum(self.backend.delete_tagged(tag) for tag in identifier_tags(type_name, identifiers, obj))
+
+    def clear(self):
+        """Invalidate all cached responses and reset counters"""
+        with self._lock:
+            self.backend.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Cache hit and miss counters
+
+        :return: (dict) hits, misses, hit ratio and current size
+        """
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / requests if requests else None,
+            "size": len(self.backend)
+        }
@@ -0,0 +1,179 @@
+"""CDR on Demand connector, streaming CDR and CMR records from transferred files"""
+
+import csv
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+
+from zeep.helpers import serialize_object
+
+from .bulk import iter_bulk
+from .connectors import UCSOAPConnector
+from .connectors import get_connection_kwargs
+from .definitions import CDR_ONDEMAND
+from .definitions import WSDL_URLS
+
+
+def split_windows(start, end, max_window=CDR_ONDEMAND["max_window"]):
+    """Split a time range into consecutive windows no longer than the get_file_list query limit
+
+    :param start: (datetime) range start, UTC
+    :param end: (datetime) range end, UTC
+    :param max_window: (int) max window in seconds
+    :return: list of (start, end) datetime tuples
+    """
+    windows = []
+    while start < end:
+        window_end = min(start + timedelta(seconds=max_window), end)
+        windows.append((start, window_end))
+        start = window_end
+    return windows
+
+
+def file_type(file_name):
+    """CDR on Demand file type, i.e. 'cdr' or 'cmr', from a file name, e.g. 'cdr_Cluster_01_201901011200_123'"""
+    return file_name.split("_", 1)[0].lower()
+
+
+def file_time(file_name):
+    """File creation time, i.e. 'YYYYMMDDhhmm', from a file name.  Cluster names may contain underscores."""
+    return file_name.rsplit("_", 2)[-2]
+
+
+def _converter(column_type):
+    if column_type.upper().split("(")[0] in CDR_ONDEMAND["integer_types"]:
+        return lambda value: int(value) if value else None
+    return str
+
+
+def parse_cdr_file(path):
+    """Generator of typed records from a CDR or CMR file, streamed row by row
+
+    The first two rows of a file are the column names and column types, e.g. 'INTEGER' or 'VARCHAR(50)'.
+    Integer columns are converted to int, empty integers to None.  All other columns are strings.
+
+    :param path: (str or Path) CDR or CMR file path
+    :return: generator of OrderedDict records
+    """
+    with open(path, newline="", encoding="utf-8") as _:
+        reader = csv.reader(_)
+        try:
+            columns, types = next(reader), next(reader)
+        except StopIteration:
+            return
+        converters = [_converter(column_type) for column_type in types]
+        for row in reader:
+            yield OrderedDict((column, convert(value)) for column, convert, value in zip(columns, converters, row))
+
+
+class CDRonDemandConnector(UCSOAPConnector):
+    """CDR on Demand connector
+
+    CDR on Demand pushes files to an SFTP server rather than returning them, so record streaming reads transferred
+    files from the SFTP server's directory as mounted locally, e.g. when the SFTP server is the local host.
+
+    Example:
+
+    cdr = CDRonDemandConnector(username="cdr", password="secret", fqdn="cucm")
+    sftp = {"host": "billing", "username": "sftp", "password": "secret", "directory": "/srv/cdr"}
+    for record in cdr.iter_records(datetime(2019, 1, 1), datetime(2019, 1, 2), **sftp):
+        ...
+    """
+
+    _ENV = {
+        "username": "CDR_USERNAME",
+        "password": "CDR_PASSWORD",
+        "fqdn": "CDR_FQDN",
+        "wsdl": "CDR_WSDL_URL"
+    }
+    _ADDRESS = "https://{fqdn}:8443/realtimeservice2/services/CDRonDemandService"
+
+    def __init__(self, **kwargs):
+        connection_kwargs = get_connection_kwargs(self._ENV, kwargs)
+        connection_kwargs["wsdl"] = connection_kwargs["wsdl"] or WSDL_URLS["CDRonDemand"].format(**connection_kwargs)
+        connection_kwargs["binding_name"] = "{http://schemas.cisco.com/ast/soap}CDRonDemandSoapBinding"
+        connection_kwargs["address"] = self._ADDRESS.format(**connection_kwargs)
+        del connection_kwargs["fqdn"]  # remove fqdn as not used in super() call
+        super().__init__(**connection_kwargs)
+
+    def _get_file_list_window(self, start, end, just_files=True):
+        with self._request_slots:
+            file_list = self.service.get_file_list(start.strftime(CDR_ONDEMAND["time_format"]),
+                                                   end.strftime(CDR_ONDEMAND["time_format"]),
+                                                   just_files)
+        return serialize_object(file_list) or []
+
+    def get_file_list(self, start, end, file_types=CDR_ONDEMAND["file_types"], workers=None):
+        """CDR and CMR files created in a time range, listed in one-hour windows in parallel
+
+        :param start: (datetime) range start, UTC
+        :param end: (datetime) range end, UTC
+        :param file_types: file types to include, i.e. 'cdr' and/or 'cmr'
+        :param workers: (int) concurrent get_file_list requests.  Defaults to the connector's max_concurrency.
+        :return: list of file names, ordered by creation time
+        """
+        windows = split_windows(start, end)
+        with ThreadPoolExecutor(max_workers=workers or self.max_concurrency) as executor:
+            file_lists = list(executor.map(lambda window: self._get_file_list_window(*window), windows))
+        file_names = OrderedDict.fromkeys(
+            file_name for file_list in file_lists for file_name in file_list if file_type(file_name) in file_types
+        )
+        return sorted(file_names, key=file_time)
+
+    def get_file(self, file_name, host, username, password, directory, sftp=True):
+        """Transfer a CDR or CMR file to an (S)FTP server
+
+        :param file_name: file name, as listed by get_file_list
+        :param host: (S)FTP server
+        :param username: (S)FTP username
+        :param password: (S)FTP password
+        :param directory: (S)FTP server directory
+        :param sftp: (bool) transfer by SFTP, else FTP
+        :return: file name
+        """
+        self.service.get_file(host, username, password, directory, file_name, sftp)
+        return file_name
+
+    def iter_files(self, start, end, host, username, password, directory, local_directory=None,
+                   file_types=CDR_ONDEMAND["file_types"], sftp=True, workers=None):
+        """Generator transferring a time range's files in parallel, yielding local paths in creation order
+
+        :param start: (datetime) range start, UTC
+        :param end: (datetime) range end, UTC
+        :param host: (S)FTP server
+        :param username: (S)FTP username
+        :param password: (S)FTP password
+        :param directory: (S)FTP server directory
+        :param local_directory: (str or Path) local path of the (S)FTP server directory.  Defaults to 'directory'.
+        :param file_types: file types to include, i.e. 'cdr' and/or 'cmr'
+        :param sftp: (bool) transfer by SFTP, else FTP
+        :param workers: (int) concurrent requests.  Defaults to the connector's max_concurrency.
+        :return: generator of Path
+        """
+        workers = min(workers or self.max_concurrency, self.max_concurrency)
+        local_directory = Path(local_directory or directory)
+        transfers = (
+            {"file_name": file_name, "host": host, "username": username, "password": password,
+             "directory": directory, "sftp": sftp}
+            for file_name in self.get_file_list(start, end, file_types=file_types, workers=workers)
+        )
+        for transfer in iter_bulk(self.get_file, transfers, self._request_slots, workers, stop_on_error=True):
+            if transfer.error is not None:
+                raise transfer.error
+            yield local_directory / transfer.result
+
+    def iter_records(self, start, end, host, username, password, directory, local_directory=None,
+                     file_types=("cdr",), sftp=True, workers=None):
+        """Generator of typed records for a time range, in constant memory
+
+        Files are transferred in parallel ahead of parsing, and parsed one row at a time.  See iter_files for
+        parameters.
+
+        :return: generator of OrderedDict records, in file creation order
+        """
+        for path in self.iter_files(start, end, host, username, password, directory,
+                                    local_directory=local_directory, file_types=file_types, sftp=sftp,
+                                    workers=workers):
+            yield from parse_cdr_file(path)
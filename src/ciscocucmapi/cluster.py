@@ -0,0 +1,165 @@
+"""Multi-node AXL connections, spreading reads across cluster nodes"""
+
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError
+from requests.exceptions import Timeout
+from zeep.exceptions import TransportError
+
+from .connectors import UCMAXLConnector
+from .definitions import CLUSTER
+
+
+def is_node_failure(error):
+    """Check if an error indicates an unhealthy node, rather than a request error
+
+    :param error: exception raised by a SOAP call
+    :return: (bool) True for connection errors, timeouts and HTTP 5xx responses
+    """
+    if isinstance(error, (ConnectionError, Timeout)):
+        return True
+    return isinstance(error, TransportError) and (error.status_code or 0) >= 500
+
+
+class Node(object):
+    """Cluster node, tracking outstanding requests and passive health"""
+
+    def __init__(self, fqdn, service, publisher=False):
+        self.fqdn = fqdn
+        self.service = service
+        self.publisher = publisher
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.fqdn}, outstanding={self.outstanding}, healthy={self.healthy})"
+
+    @property
+    def healthy(self):
+        return time.monotonic() >= self.ejected_until
+
+    def record(self, failed):
+        """Record a request outcome, ejecting the node after consecutive failures
+
+        Ejection time doubles with each consecutive ejection, up to the max ejection time.
+        """
+        if not failed:
+            self.failures = self.ejections = 0
+            return
+        self.failures += 1
+        if self.failures >= CLUSTER["failure_threshold"]:
+            ejection_time = min(CLUSTER["ejection_time"] * 2 ** self.ejections, CLUSTER["max_ejection_time"])
+            self.ejected_until = time.monotonic() + ejection_time
+            self.ejections += 1
+            self.failures = 0
+
+
+class NodeRoutingService(object):
+    """Service proxy sending writes to the publisher, and spreading reads across healthy nodes
+
+    Reads go to the healthy node with the least outstanding requests, preferring subscribers on ties.
+    Reads failing on an unhealthy node are retried on the next node.
+    """
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.publisher = next(node for node in nodes if node.publisher)
+        self._lock = threading.Lock()
+
+    def _select(self, exclude):
+        with self._lock:
+            candidates = [node for node in self.nodes if node not in exclude]
+            healthy = [node for node in candidates if node.healthy] or candidates
+            node = min(healthy, key=lambda _: (_.outstanding, _.publisher))
+            node.outstanding += 1
+            return node
+
+    def _call(self, node, operation, args, kwargs):
+        failed = False
+        try:
+            return getattr(node.service, operation)(*args, **kwargs)
+        except Exception as error:
+            failed = is_node_failure(error)
+            raise
+        finally:
+            with self._lock:
+                node.outstanding -= 1
+                node.requests += 1
+                node.record(failed)
+
+    def _read(self, operation, *args, **kwargs):
+        tried = []
+        while True:
+            node = self._select(tried)
+            try:
+                return self._call(node, operation, args, kwargs)
+            except Exception as error:
+                tried.append(node)
+                if not is_node_failure(error) or len(tried) == len(self.nodes):
+                    raise
+
+    def _write(self, operation, *args, **kwargs):
+        with self._lock:
+            self.publisher.outstanding += 1
+        return self._call(self.publisher, operation, args, kwargs)
+
+    def __getattr__(self, operation):
+        route = self._read if operation.startswith(CLUSTER["read_prefixes"]) else self._write
+
+        def call(*args, **kwargs):
+            return route(operation, *args, **kwargs)
+
+        self.__dict__[operation] = call
+        return call
+
+    def __getitem__(self, operation):
+        return getattr(self, operation)
+
+
+class UCMAXLClusterConnector(UCMAXLConnector):
+    """UCM AXL API Connector for a cluster of nodes
+
+    Writes are sent to the publisher.  Reads (get, list and executeSQLQuery) are spread across the publisher and
+    subscribers by least outstanding requests.  Nodes failing consecutive requests are ejected from reads for a
+    time, doubling per consecutive ejection.
+
+    Note:
+    The Cisco AXL Web Service must be activated on all nodes.
+
+    Example:
+
+    axl = UCMAXLClusterConnector(nodes=["cucm-pub", "cucm-sub1", "cucm-sub2"], username="axl", password="secret")
+    """
+
+    def __init__(self, nodes, **kwargs):
+        """Connect to a cluster
+
+        :param nodes: list of node fqdns, starting with the publisher
+        :param kwargs: UCMAXLConnector parameters, excluding 'fqdn'
+        """
+        if not nodes:
+            raise ValueError("No cluster nodes given")
+        self._node_fqdns = list(nodes)
+        self._nodes = []
+        kwargs["fqdn"] = self._node_fqdns[0]
+        super().__init__(**kwargs)
+        adapter = HTTPAdapter(pool_connections=len(self._node_fqdns), pool_maxsize=self.max_concurrency)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _create_service(self, client):
+        self._nodes = [
+            Node(fqdn, client.create_service(self._binding_name, self._ADDRESS.format(fqdn=fqdn)), publisher=i == 0)
+            for i, fqdn in enumerate(self._node_fqdns)
+        ]
+        return NodeRoutingService(self._nodes)
+
+    @property
+    def nodes(self):
+        """Cluster nodes, with their outstanding requests and health.  Populated on first use of the client."""
+        return self._nodes
@@ -1,19 +1,31 @@
 """python-zeep client wrappers for Cisco UC SOAP APIs"""
 
 import os
+import threading
 
 import urllib3
 from lxml import etree
 from requests import Session
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from urllib3.exceptions import InsecureRequestWarning
 from zeep import Client
 from zeep.cache import SqliteCache
 from zeep.plugins import HistoryPlugin
+from zeep.settings import Settings
 from zeep.transports import Transport
 
 from .api import *
+from .bulk import iter_bulk
+from .definitions import AXL
+from .mirror import LocalMirror
 from .model import axl_factory
+from .resolver import PkidResolver
+from .schema import SchemaIndex
+from .schema import load_schema_bundle
+from .sync import ChangeFeed
+from .throttle import AIMDThrottle
+from .throttle import ThrottledService
 
 
 def get_connection_kwargs(env_dict, kwargs):
@@ -51,11 +63,35 @@ class AXLHistoryPlugin(HistoryPlugin):
             return self._parse_envelope(last_tx['sent']['envelope'])
 
 
+class LazyAPI(object):
+    """Descriptor deferring API wrapper instantiation to first attribute access
+
+    The wrapper is cached in the connector instance's __dict__, which takes precedence over this
+    non-data descriptor on all subsequent lookups.
+    """
+
+    def __init__(self, api_class, object_factory=axl_factory):
+        self.api_class = api_class
+        self.object_factory = object_factory
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, connector, owner=None):
+        if connector is None:
+            return self
+        api = connector._create_api(self.api_class, self.object_factory)
+        return connector.__dict__.setdefault(self.name, api)
+
+
 class UCSOAPConnector(object):
     """Parent class for all Cisco UC SOAP Connectors"""
+    _client_class = Client
 
     def __init__(self, username=None, password=None, wsdl=None, binding_name=None, address=None, tls_verify=False,
-                 timeout=30, history=True, history_maxlen=1):
+                 timeout=30, history=True, history_maxlen=1, max_concurrency=AXL["max_concurrency"],
+                 cache=None, schema_bundle=None, schema_index=None, get_cache=None, throttle=False):
         """Instantiate UC SOAP Client Connector
 
         :param username: SOAP client connector username
@@ -64,16 +100,31 @@ class UCSOAPConnector(object):
         :param binding_name: QName of the binding
         :param address: address of the endpoint
         :param tls_verify: /path/to/certificate.pem or False.  Certificate must be a CA_BUNDLE. Supports .pem and .crt
-        :param is_async: create async client
         :param timeout: timeout in seconds.  Overrides zeep 300 default to timeout after 30sec
+        :param max_concurrency: cap on concurrent requests issued by the connector, e.g. for parallel list calls.
+        Sizes the shared session's connection pool.
+        :param cache: zeep wsdl cache.  Defaults to SqliteCache.
+        :param schema_bundle: /path/to/bundle to load a pre-compiled schema bundle from, rather than parsing the
+        WSDL.  Bundles are pickles, so only pass bundles from trusted locations.  The zeep client is created on
+        first use.
+        :param schema_index: /path/to/saved/schema/index.json to pre-load the connector's schema index from
+        :param get_cache: cache.GetCache for read-through caching of API 'get' responses.  Disabled by default.
+        :param throttle: adapt request concurrency to cluster load, backing off on HTTP 503 and overload faults and
+        retrying idempotent reads - True, or a throttle.AIMDThrottle instance.  Disabled by default.
         """
         self._username = username
         self._wsdl = wsdl
         self._timeout = timeout
+        self._max_concurrency = max_concurrency
+        # shared by all bulk jobs, capping the connector's concurrent requests to the cluster
+        self._request_slots = threading.BoundedSemaphore(max_concurrency)
 
         self._session = Session()
         self._session.auth = HTTPBasicAuth(username, password)
         self._session.verify = tls_verify
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
         self._plugins = []
 
         if not self._session.verify:
@@ -83,22 +134,56 @@ class UCSOAPConnector(object):
             self._history = AXLHistoryPlugin(maxlen=history_maxlen)
             self._plugins.append(self._history)
 
-        transport = Transport(cache=SqliteCache(),
-                              session=self._session,
-                              timeout=self._timeout)
-
-        self._client = Client(wsdl=wsdl, transport=transport, plugins=self._plugins)
-        if binding_name and address:
-            self._service = self._client.create_service(binding_name, address)
-        elif binding_name or address:
+        if not wsdl:
+            raise ValueError("No URL given for the wsdl")
+        if bool(binding_name) != bool(address):
             raise ValueError("Incomplete parameters for ServiceProxy Object creation.  "
                              "Requires 'binding_name' and 'address'")
-        self.model_factory = self._client.type_factory('ns0')
+        self._binding_name = binding_name
+        self._address = address
+        self._schema_bundle = schema_bundle
+        self._transport = Transport(cache=cache if cache is not None else SqliteCache(),
+                                    session=self._session,
+                                    timeout=self._timeout)
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._schema_index = SchemaIndex(self, path=schema_index)
+        self._get_cache = get_cache
+        if throttle is True:
+            throttle = AIMDThrottle(max_concurrency)
+        self._throttle = throttle or None
+
+    def _create_client(self):
+        """Create the zeep client, from a pre-compiled schema bundle where available"""
+        settings = Settings()
+        document = None
+        if self._schema_bundle:
+            document = load_schema_bundle(self._wsdl, self._transport, settings, self._schema_bundle)
+        client = self._client_class(wsdl=document or self._wsdl, transport=self._transport, plugins=self._plugins,
+                                    settings=settings)
+        if self._binding_name and self._address:
+            self._service = self._create_service(client)
+            if self._throttle:
+                self._service = ThrottledService(self._service, self._throttle)
+        self._model_factory = client.type_factory('ns0')
+        return client
+
+    def _create_service(self, client):
+        """Create the service proxy for the connector's binding and address"""
+        return client.create_service(self._binding_name, self._address)
+
+    def _create_api(self, api_class, object_factory):
+        """Create an API wrapper bound to this connector"""
+        return api_class(self, object_factory)
 
     @property
     def timeout(self):
         return self._timeout
 
+    @property
+    def max_concurrency(self):
+        return self._max_concurrency
+
     @property
     def wsdl(self):
         return self._wsdl
@@ -107,13 +192,40 @@ class UCSOAPConnector(object):
     def client(self):
         """Direct access to zeep client for wsdl inspection or advanced in-line client modification,
         factory building, etc."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_client()
         return self._client
 
     @property
     def service(self):
         """Direct access to zeep service for method-calling of proxied services"""
+        if self._client is None:
+            self.client  # noqa - created on first use
         return self._service
 
+    @property
+    def model_factory(self):
+        if self._client is None:
+            self.client  # noqa - created on first use
+        return self._model_factory
+
+    @property
+    def schema_index(self):
+        """Schema-derived API metadata, resolved once per API"""
+        return self._schema_index
+
+    @property
+    def throttle(self):
+        """Adaptive request throttle, exposing the current concurrency limit and rate, or None if disabled"""
+        return self._throttle
+
+    @property
+    def get_cache(self):
+        """Read-through cache for API 'get' responses, or None if disabled"""
+        return self._get_cache
+
     @property
     def history(self):
         return self._history
@@ -128,162 +240,213 @@ class UCMAXLConnector(UCSOAPConnector):
         "fqdn": "AXL_FQDN",
         "wsdl": "AXL_WSDL_URL"
     }
+    _ADDRESS = "https://{fqdn}:8443/axl/"
+
+    # sql API wrapper
+    sql = LazyAPI(ThinAXLAPI)
+
+    # device
+    device = LazyAPI(Device)
+
+    # change notification
+    change = LazyAPI(Change)
+
+    # device API wrappers
+    common_device_config = LazyAPI(CommonDeviceConfig)
+    common_phone_profile = LazyAPI(CommonPhoneConfig)
+    cti_route_point = LazyAPI(CtiRoutePoint)
+    feature_control_policy = LazyAPI(FeatureControlPolicy)
+    ip_phone_service = LazyAPI(IpPhoneServices)
+    line = LazyAPI(Line)
+    network_access_profile = LazyAPI(NetworkAccessProfile)
+    phone = LazyAPI(Phone)
+    default_device_profile = LazyAPI(DefaultDeviceProfile)
+    udp = LazyAPI(DeviceProfile)
+    phone_button_template = LazyAPI(PhoneButtonTemplate)
+    phone_security_profile = LazyAPI(PhoneSecurityProfile)
+    recording_profile = LazyAPI(RecordingProfile)
+    sdp_transparency_profile = LazyAPI(SdpTransparencyProfile)
+    sip_trunk = LazyAPI(SipTrunk)
+    sip_trunk_security_profile = LazyAPI(SipTrunkSecurityProfile)
+    sip_profile = LazyAPI(SipProfile)
+    softkey_template = LazyAPI(SoftKeyTemplate)
+    softkey_set = LazyAPI(SoftKeySet)
+    udt = LazyAPI(UniversalDeviceTemplate)
+    ult = LazyAPI(UniversalLineTemplate)
+    remote_destination = LazyAPI(RemoteDestination)
+    rdp = LazyAPI(RemoteDestinationProfile)
+    wifi_hotspot = LazyAPI(WifiHotspot)
+    wlan_profile = LazyAPI(WLANProfile)
+    wlan_profile_group = LazyAPI(WlanProfileGroup)
+
+    # user API wrappers
+    application_user = LazyAPI(AppUser)
+    application_user_capf_profile = LazyAPI(ApplicationUserCapfProfile)
+    end_user_capf_profile = LazyAPI(EndUserCapfProfile)
+    feature_group_template = LazyAPI(FeatureGroupTemplate)
+    user = LazyAPI(User)
+    uc_service = LazyAPI(UcService)
+    sip_realm = LazyAPI(SipRealm)
+    self_provisioning = LazyAPI(SelfProvisioning)
+    service_profile = LazyAPI(ServiceProfile)
+    user_group = LazyAPI(UserGroup)
+    user_profile = LazyAPI(UserProfileProvision)
+
+    # dialplan API wrappers
+    caller_filter_list = LazyAPI(CallerFilterList)
+    advertised_patterns = LazyAPI(AdvertisedPatterns)
+    aar_group = LazyAPI(AarGroup)
+    application_dial_rules = LazyAPI(ApplicationDialRules)
+    blocked_learned_patterns = LazyAPI(BlockedLearnedPatterns)
+    call_pickup_group = LazyAPI(CallPickupGroup)
+    call_park = LazyAPI(CallPark)
+    called_party_xform_pattern = LazyAPI(CalledPartyTransformationPattern)
+    calling_party_xform_pattern = LazyAPI(CallingPartyTransformationPattern)
+    conference_now = LazyAPI(ConferenceNow)
+    cmc = LazyAPI(CmcInfo)
+    css = LazyAPI(Css)
+    directed_call_park = LazyAPI(DirectedCallPark)
+    directory_lookup_rules = LazyAPI(DirectoryLookupDialRules)
+    mobility_enterprise_feature_access_number = LazyAPI(EnterpriseFeatureAccessConfiguration)
+    fac = LazyAPI(FacInfo)
+    handoff_mobility = LazyAPI(Mobility)
+    handoff_configuration = LazyAPI(HandoffConfiguration)
+    http_profile = LazyAPI(HttpProfile)
+    meetme = LazyAPI(MeetMe)
+    mobility_profile = LazyAPI(MobilityProfile)
+    hunt_list = LazyAPI(HuntList)
+    hunt_pilot = LazyAPI(HuntPilot)
+    line_group = LazyAPI(LineGroup)
+    local_route_group = LazyAPI(LocalRouteGroup)
+    route_group = LazyAPI(RouteGroup)
+    route_list = LazyAPI(RouteList)
+    route_partition = LazyAPI(RoutePartition)
+    route_pattern = LazyAPI(RoutePattern)
+    route_plan_report = LazyAPI(RoutePlan)
+    sip_dial_rules = LazyAPI(SipDialRules)
+    sip_route_pattern = LazyAPI(SipRoutePattern)
+    time_period = LazyAPI(TimePeriod)
+    time_schedule = LazyAPI(TimeSchedule)
+    translation_pattern = LazyAPI(TransPattern)
+    route_partitions_for_learned_patterns = LazyAPI(RoutePartitionsForLearnedPatterns)
+    elin_group = LazyAPI(ElinGroup)
+
+    # system API wrappers
+    application_server = LazyAPI(ApplicationServer)
+    audio_codec_preference_list = LazyAPI(AudioCodecPreferenceList)
+    callmanager_group = LazyAPI(CallManagerGroup)
+    date_time_group = LazyAPI(DateTimeGroup)
+    device_mobility_group = LazyAPI(DeviceMobilityGroup)
+    device_mobility_info = LazyAPI(DeviceMobility)
+    device_pool = LazyAPI(DevicePool)
+    ldap_directory = LazyAPI(LdapDirectory)
+    ldap_filter = LazyAPI(LdapFilter)
+    ldap_sync_custom_field = LazyAPI(LdapSyncCustomField)
+    lbm_group = LazyAPI(LbmGroup)
+    lbm_hub_group = LazyAPI(LbmHubGroup)
+    location = LazyAPI(Location)
+    presence_redundancy_group = LazyAPI(PresenceRedundancyGroup)
+    phone_ntp_reference = LazyAPI(PhoneNtp)
+    physical_location = LazyAPI(PhysicalLocation)
+    presence_group = LazyAPI(PresenceGroup)
+    region = LazyAPI(Region)
+    srst = LazyAPI(Srst)
+    service_parameter = LazyAPI(ServiceParameter)
+    enterprise_parameter = LazyAPI(EnterpriseParameter)
+    ldap_system = LazyAPI(LdapSystem)
+    ldap_authentication = LazyAPI(LdapAuthentication)
+    ldap_search = LazyAPI(LdapSearch)
+    callmanager = LazyAPI(CallManager)
+    process_node = LazyAPI(ProcessNode)
+    dhcp_server = LazyAPI(DhcpServer)
+    dhcp_subnet = LazyAPI(DhcpSubnet)
+    enterprise_phone_config = LazyAPI(EnterprisePhoneConfig)
+
+    # media API wrappers
+    announcement = LazyAPI(Announcement)
+    annunciator = LazyAPI(Annunciator)
+    conference_bridge = LazyAPI(ConferenceBridge)
+    mrg = LazyAPI(MediaResourceGroup)
+    mrgl = LazyAPI(MediaResourceList)
+    mtp = LazyAPI(Mtp)
+    transcoder = LazyAPI(Transcoder)
+    voh_server = LazyAPI(VohServer)
+
+    # advanced API wrappers
+    called_party_tracing = LazyAPI(CalledPartyTracing)
+    directory_number_alias_sync = LazyAPI(DirNumberAliasLookupandSync)
+    ils_config = LazyAPI(IlsConfig)
+    mwi_number = LazyAPI(MessageWaiting)
+    remote_cluster = LazyAPI(RemoteCluster)
+    voicemail_pilot = LazyAPI(VoiceMailPilot)
+    voicemail_profile = LazyAPI(VoiceMailProfile)
+    vpn_gateway = LazyAPI(VpnGateway)
+    vpn_group = LazyAPI(VpnGroup)
+    vpn_profile = LazyAPI(VpnProfile)
+    secure_config = LazyAPI(SecureConfig)
+
+    # serviceability API wrappers
+    billing_server = LazyAPI(BillingServer)
+    snmp_community_string = LazyAPI(SNMPCommunityString)
+    snmp_user = LazyAPI(SNMPUser)
+    snmp_mib2_system_group = LazyAPI(SNMPMIB2List)
+    syslog_configuration = LazyAPI(SyslogConfiguration)
+    process_node_service = LazyAPI(ProcessNodeService)
 
     def __init__(self, **kwargs):
         connection_kwargs = get_connection_kwargs(self._ENV, kwargs)
         connection_kwargs["binding_name"] = "{http://www.cisco.com/AXLAPIService/}AXLAPIBinding"
-        connection_kwargs["address"] = "https://{fqdn}:8443/axl/".format(**connection_kwargs)
+        connection_kwargs["address"] = self._ADDRESS.format(**connection_kwargs)
         del connection_kwargs["fqdn"]  # remove fqdn as not used in super() call
         super().__init__(**connection_kwargs)
+        self._resolver = PkidResolver(self)
 
-        # sql API wrapper
-        self.sql = ThinAXLAPI(self, axl_factory)
-
-        # device
-        self.device = Device(self, axl_factory)
-
-        # device API wrappers
-        self.common_device_config = CommonDeviceConfig(self, axl_factory)
-        self.common_phone_profile = CommonPhoneConfig(self, axl_factory)
-        self.cti_route_point = CtiRoutePoint(self, axl_factory)
-        self.feature_control_policy = FeatureControlPolicy(self, axl_factory)
-        self.ip_phone_service = IpPhoneServices(self, axl_factory)
-        self.line = Line(self, axl_factory)
-        self.network_access_profile = NetworkAccessProfile(self, axl_factory)
-        self.phone = Phone(self, axl_factory)
-        self.default_device_profile = DefaultDeviceProfile(self, axl_factory)
-        self.udp = DeviceProfile(self, axl_factory)
-        self.phone_button_template = PhoneButtonTemplate(self, axl_factory)
-        self.phone_security_profile = PhoneSecurityProfile(self, axl_factory)
-        self.recording_profile = RecordingProfile(self, axl_factory)
-        self.sdp_transparency_profile = SdpTransparencyProfile(self, axl_factory)
-        self.sip_trunk = SipTrunk(self, axl_factory)
-        self.sip_trunk_security_profile = SipTrunkSecurityProfile(self, axl_factory)
-        self.sip_profile = SipProfile(self, axl_factory)
-        self.softkey_template = SoftKeyTemplate(self, axl_factory)
-        self.softkey_set = SoftKeySet(self, axl_factory)
-        self.udt = UniversalDeviceTemplate(self, axl_factory)
-        self.ult = UniversalLineTemplate(self, axl_factory)
-        self.remote_destination = RemoteDestination(self, axl_factory)
-        self.rdp = RemoteDestinationProfile(self, axl_factory)
-        self.wifi_hotspot = WifiHotspot(self, axl_factory)
-        self.wlan_profile = WLANProfile(self, axl_factory)
-        self.wlan_profile_group = WlanProfileGroup(self, axl_factory)
-
-        # user API wrappers
-        self.application_user = AppUser(self, axl_factory)
-        self.application_user_capf_profile = ApplicationUserCapfProfile(self, axl_factory)
-        self.end_user_capf_profile = EndUserCapfProfile(self, axl_factory)
-        self.feature_group_template = FeatureGroupTemplate(self, axl_factory)
-        self.user = User(self, axl_factory)
-        self.uc_service = UcService(self, axl_factory)
-        self.sip_realm = SipRealm(self, axl_factory)
-        self.self_provisioning = SelfProvisioning(self, axl_factory)
-        self.service_profile = ServiceProfile(self, axl_factory)
-        self.user_group = UserGroup(self, axl_factory)
-        self.user_profile = UserProfileProvision(self, axl_factory)
-
-        # dialplan API wrappers
-        self.caller_filter_list = CallerFilterList(self, axl_factory)
-        self.advertised_patterns = AdvertisedPatterns(self, axl_factory)
-        self.aar_group = AarGroup(self, axl_factory)
-        self.application_dial_rules = ApplicationDialRules(self, axl_factory)
-        self.blocked_learned_patterns = BlockedLearnedPatterns(self, axl_factory)
-        self.call_pickup_group = CallPickupGroup(self, axl_factory)
-        self.call_park = CallPark(self, axl_factory)
-        self.called_party_xform_pattern = CalledPartyTransformationPattern(self, axl_factory)
-        self.calling_party_xform_pattern = CallingPartyTransformationPattern(self, axl_factory)
-        self.conference_now = ConferenceNow(self, axl_factory)
-        self.cmc = CmcInfo(self, axl_factory)
-        self.css = Css(self, axl_factory)
-        self.directed_call_park = DirectedCallPark(self, axl_factory)
-        self.directory_lookup_rules = DirectoryLookupDialRules(self, axl_factory)
-        self.mobility_enterprise_feature_access_number = EnterpriseFeatureAccessConfiguration(self, axl_factory)
-        self.fac = FacInfo(self, axl_factory)
-        self.handoff_mobility = Mobility(self, axl_factory)
-        self.handoff_configuration = HandoffConfiguration(self, axl_factory)
-        self.http_profile = HttpProfile(self, axl_factory)
-        self.meetme = MeetMe(self, axl_factory)
-        self.mobility_profile = MobilityProfile(self, axl_factory)
-        self.hunt_list = HuntList(self, axl_factory)
-        self.hunt_pilot = HuntPilot(self, axl_factory)
-        self.line_group = LineGroup(self, axl_factory)
-        self.local_route_group = LocalRouteGroup(self, axl_factory)
-        self.route_group = RouteGroup(self, axl_factory)
-        self.route_list = RouteList(self, axl_factory)
-        self.route_partition = RoutePartition(self, axl_factory)
-        self.route_pattern = RoutePattern(self, axl_factory)
-        self.route_plan_report = RoutePlan(self, axl_factory)
-        self.sip_dial_rules = SipDialRules(self, axl_factory)
-        self.sip_route_pattern = SipRoutePattern(self, axl_factory)
-        self.time_period = TimePeriod(self, axl_factory)
-        self.time_schedule = TimeSchedule(self, axl_factory)
-        self.translation_pattern = TransPattern(self, axl_factory)
-        self.route_partitions_for_learned_patterns = RoutePartitionsForLearnedPatterns(self, axl_factory)
-        self.elin_group = ElinGroup(self, axl_factory)
-
-        # system API wrappers
-        self.application_server = ApplicationServer(self, axl_factory)
-        self.audio_codec_preference_list = AudioCodecPreferenceList(self, axl_factory)
-        self.callmanager_group = CallManagerGroup(self, axl_factory)
-        self.date_time_group = DateTimeGroup(self, axl_factory)
-        self.device_mobility_group = DeviceMobilityGroup(self, axl_factory)
-        self.device_mobility_info = DeviceMobility(self, axl_factory)
-        self.device_pool = DevicePool(self, axl_factory)
-        self.ldap_directory = LdapDirectory(self, axl_factory)
-        self.ldap_filter = LdapFilter(self, axl_factory)
-        self.ldap_sync_custom_field = LdapSyncCustomField(self, axl_factory)
-        self.lbm_group = LbmGroup(self, axl_factory)
-        self.lbm_hub_group = LbmHubGroup(self, axl_factory)
-        self.location = Location(self, axl_factory)
-        self.presence_redundancy_group = PresenceRedundancyGroup(self, axl_factory)
-        self.phone_ntp_reference = PhoneNtp(self, axl_factory)
-        self.physical_location = PhysicalLocation(self, axl_factory)
-        self.presence_group = PresenceGroup(self, axl_factory)
-        self.region = Region(self, axl_factory)
-        self.srst = Srst(self, axl_factory)
-        self.service_parameter = ServiceParameter(self, axl_factory)
-        self.enterprise_parameter = EnterpriseParameter(self, axl_factory)
-        self.ldap_system = LdapSystem(self, axl_factory)
-        self.ldap_authentication = LdapAuthentication(self, axl_factory)
-        self.ldap_search = LdapSearch(self, axl_factory)
-        self.callmanager = CallManager(self, axl_factory)
-        self.process_node = ProcessNode(self, axl_factory)
-        self.dhcp_server = DhcpServer(self, axl_factory)
-        self.dhcp_subnet = DhcpSubnet(self, axl_factory)
-        self.enterprise_phone_config = EnterprisePhoneConfig(self, axl_factory)
-
-        # media API wrappers
-        self.announcement = Announcement(self, axl_factory)
-        self.annunciator = Annunciator(self, axl_factory)
-        self.conference_bridge = ConferenceBridge(self, axl_factory)
-        self.mrg = MediaResourceGroup(self, axl_factory)
-        self.mrgl = MediaResourceList(self, axl_factory)
-        self.mtp = Mtp(self, axl_factory)
-        self.transcoder = Transcoder(self, axl_factory)
-        self.voh_server = VohServer(self, axl_factory)
-
-        # advanced API wrappers
-        self.called_party_tracing = CalledPartyTracing(self, axl_factory)
-        self.directory_number_alias_sync = DirNumberAliasLookupandSync(self, axl_factory)
-        self.ils_config = IlsConfig(self, axl_factory)
-        self.mwi_number = MessageWaiting(self, axl_factory)
-        self.remote_cluster = RemoteCluster(self, axl_factory)
-        self.voicemail_pilot = VoiceMailPilot(self, axl_factory)
-        self.voicemail_profile = VoiceMailProfile(self, axl_factory)
-        self.vpn_gateway = VpnGateway(self, axl_factory)
-        self.vpn_group = VpnGroup(self, axl_factory)
-        self.vpn_profile = VpnProfile(self, axl_factory)
-        self.secure_config = SecureConfig(self, axl_factory)
-
-        # serviceability API wrappers
-        self.billing_server = BillingServer(self, axl_factory)
-        self.snmp_community_string = SNMPCommunityString(self, axl_factory)
-        self.snmp_user = SNMPUser(self, axl_factory)
-        self.snmp_mib2_system_group = SNMPMIB2List(self, axl_factory)
-        self.syslog_configuration = SyslogConfiguration(self, axl_factory)
-        self.process_node_service = ProcessNodeService(self, axl_factory)
+    @property
+    def resolver(self):
+        """Batched, cached name to pkid resolution for foreign key fields"""
+        return self._resolver
 
     def get_ccm_version(self, processNodeName=None):
         axl_resp = self.service.getCCMVersion(processNodeName=processNodeName)
         return serialize_object(axl_resp)["return"]["componentVersion"]["version"]
+
+    def change_feed(self, apis, returnedTags=None):
+        """Incrementally synced snapshot of API endpoint objects.  See sync.ChangeFeed.
+
+        :param apis: iterable of API attribute names, e.g. ["phone", "line", "user"]
+        :param returnedTags: (dict) returnedTags per API attribute name
+        :return: ChangeFeed
+        """
+        return ChangeFeed(self, apis, returnedTags=returnedTags)
+
+    def iter_bulk(self, func, iterable_of_kwargs, workers=None, stop_on_error=False):
+        """Lazily execute API calls in parallel, yielding results in input order
+
+        :param func: API method, e.g. axl.phone.add
+        :param iterable_of_kwargs: iterable of kwargs dicts, one per call
+        :param workers: (int) concurrent calls.  Defaults to, and is capped by, the connector's max_concurrency,
+        which is shared by all bulk jobs on the connector.
+        :param stop_on_error: (bool) stop after the first error, rather than collecting all results
+        :return: generator of BulkResult(kwargs, result, error)
+        """
+        workers = min(workers or self.max_concurrency, self.max_concurrency)
+        return iter_bulk(func, iterable_of_kwargs, self._request_slots, workers, stop_on_error=stop_on_error)
+
+    def bulk(self, func, iterable_of_kwargs, workers=None, stop_on_error=False):
+        """Execute API calls in parallel, e.g. axl.bulk(axl.phone.add, phones, workers=4)
+
+        :param func: API method, e.g. axl.phone.add
+        :param iterable_of_kwargs: iterable of kwargs dicts, one per call
+        :param workers: (int) concurrent calls, capped by the connector's max_concurrency
+        :param stop_on_error: (bool) stop after the first error, rather than collecting all results
+        :return: list of BulkResult(kwargs, result, error), in input order
+        """
+        return list(self.iter_bulk(func, iterable_of_kwargs, workers=workers, stop_on_error=stop_on_error))
+
+    def local_mirror(self, path=":memory:"):
+        """Local SQLite mirror of API endpoint objects for indexed lookups.  See mirror.LocalMirror.
+
+        :param path: (str or Path) SQLite database path
+        :return: LocalMirror
+        """
+        return LocalMirror(self, path=path)
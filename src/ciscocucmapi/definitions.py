@@ -11,6 +11,43 @@ WSDL_URLS = {
     "DimeGetFileService": "https://{fqdn}:8443/logcollectionservice/services/DimeGetFileService?wsdl"
 }
 
+AXL = {
+    "list_page_size": 1000,
+    "max_concurrency": 4,
+    "sql_chunk_size": 5000,
+    "sql_max_statement_size": 16384,
+    "query_too_large_fault": "Query request too large",
+    # lowercase fault message text of 'get' requests for objects that do not exist
+    "not_found_fault": "was not found",
+    "suggested_row_fetch": r"less than (\d+) rows"
+}
+
+THROTTLE = {
+    "faults": (
+        "Maximum AXL Memory Allocation Consumed",
+    ),
+    "status_codes": (503,),
+    # operations safe to retry automatically
+    "idempotent_prefixes": (
+        "get",
+        "list",
+        "executeSQLQuery"
+    ),
+    "decrease_factor": 0.5,
+    "retries": 3,
+    "backoff": 1.0,
+    "max_backoff": 30.0,
+    "rate_window": 10.0
+}
+
+CLUSTER = {
+    # operations spread across nodes.  All other operations are sent to the publisher.
+    "read_prefixes": THROTTLE["idempotent_prefixes"],
+    "failure_threshold": 3,
+    "ejection_time": 30.0,
+    "max_ejection_time": 300.0
+}
+
 RISPORT = {
     "type": (
         "Name",
@@ -42,5 +79,90 @@ RISPORT = {
         "v9": 1000,
         "default": 1000
     },
-    "all_models": 255
+    "all_models": 255,
+    # selectCmDevice/selectCmDeviceExt requests per minute allowed per node
+    "requests_per_minute": 15,
+    "quota_fault": "Exceeded allowed rate",
+    "retries": 3,
+    # device fields compared by registration monitors
+    "monitor_fields": (
+        "Status",
+        "IPAddress",
+        "NodeName",
+        "ActiveLoadID"
+    ),
+    "monitor_interval": 60.0
+}
+
+PERFMON = {
+    # PerfMon requests per minute allowed per node, i.e. the 'Allowed Performance Queries per Minute' parameter
+    "requests_per_minute": 50,
+    "quota_fault": "Exceeded allowed rate",
+    # lowercase fault message text of expired or unknown session handles, e.g. after a node restart
+    "session_faults": (
+        "invalid session",
+        "session handle",
+        "session expired",
+        "session has expired"
+    ),
+    "retries": 3,
+    # CStatus values of valid counter samples
+    "valid_statuses": (0, 1),
+    "interval": 10.0,
+    # samples kept per session, i.e. 1 hour at the default interval
+    "capacity": 360
+}
+
+CDR_ONDEMAND = {
+    # max get_file_list query window in seconds
+    "max_window": 3600,
+    # get_file_list times are UTC
+    "time_format": "%Y%m%d%H%M",
+    "file_types": ("cdr", "cmr"),
+    # CSV column types converted to int
+    "integer_types": ("INTEGER", "SMALLINT", "BIGINT")
+}
+
+ATTACHMENTS = {
+    # bytes buffered at a time while parsing multipart delimiters and part headers
+    "header_read_size": 1024
+}
+
+LOG_COLLECTION = {
+    "date_format": "%m/%d/%y %I:%M %p",
+    "time_zone": "Client: (GMT+0:0)Greenwich Mean Time-Europe/London",
+    "get_one_file_action": "http://schemas.cisco.com/ast/soap/action/#LogCollectionPort#GetOneFile",
+    # streamed download read size in bytes
+    "chunk_size": 65536
+}
+
+MIRROR = {
+    "indexed_fields": (
+        "name",
+        "uuid",
+        "callingSearchSpaceName",
+        "devicePoolName",
+        "routePartitionName"
+    ),
+    # identifier stored in the 'name' index for objects without a name, e.g. lines
+    "name_aliases": (
+        "pattern",
+        "userid"
+    )
+}
+
+RESOLVER = {
+    # max values per 'IN (...)' lookup query
+    "in_list_size": 500,
+    # lookup name: (table, name column, additional condition)
+    "lookups": {
+        "device": ("device", "name", None),
+        "enduser": ("enduser", "userid", None),
+        "dirgroup": ("dirgroup", "name", None),
+        "dn": ("numplan", "dnorpattern", "tkpatternusage = 2"),
+        "ldap_directory": ("directorypluginconfig", "name", None),
+        "route_partition": ("routepartition", "name", None),
+        "css": ("callingsearchspace", "name", None),
+        "device_pool": ("devicepool", "name", None)
+    }
 }
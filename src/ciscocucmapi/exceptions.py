@@ -24,5 +24,13 @@ class IllegalSQLStatement(CiscoCUCMAPIException):
     """Illegal SQL Statement response from CUCM"""
 
 
+class AmbiguousNameError(CiscoCUCMAPIException):
+    """Name matches more than one object, e.g. a DN in several route partitions"""
+
+
 class ParseError(CiscoCUCMAPIException):
     """Unable to parse AXL object"""
+
+
+class AttachmentError(CiscoCUCMAPIException):
+    """Malformed or missing SOAP attachment in a MIME or DIME response"""
@@ -45,6 +45,22 @@ def to_csv(data_model_list, destination_path):
         raise FileNotFoundError
 
 
+def rows_to_csv(columns, rows, destination_path):
+    """Write column names and row tuples to disk
+
+    :param columns: iterable of column names
+    :param rows: iterable of row value tuples
+    :param destination_path: (Path) file destination Path object or (str)
+    :return: None.  csv file written to disk
+    """
+    if isinstance(destination_path, Path):
+        destination_path = destination_path.resolve()
+    with open(destination_path, "w", newline='') as _:
+        writer = csv.writer(_)
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+
 def get_model_dict(obj, include_types=False):
     """Get an empty model dict or OrderedDict for an api endpoint from a complex zeep type
 
@@ -79,6 +95,156 @@ def get_model_dict(obj, include_types=False):
     return model_dict
 
 
+class FrozenModelDict(OrderedDict):
+    """Immutable OrderedDict for model templates shared across calls
+
+    Instances are still dicts, so they serialize to JSON and can be used as target models and
+    returnedTags as-is.  Use thaw() for a mutable copy.
+    """
+
+    def __init__(self, items=()):
+        super().__init__()
+        for k, v in items:
+            OrderedDict.__setitem__(self, k, v)
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"'{self.__class__.__name__}' is immutable.  Use thaw() for a mutable copy.")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = move_to_end = _immutable
+
+    def __reduce__(self):
+        return self.__class__, (list(self.items()),)
+
+    def thaw(self):
+        """Mutable deep copy of the model template"""
+        return thaw_model(self)
+
+
+class FrozenModelList(list):
+    """Immutable list for nested model templates shared across calls"""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"'{self.__class__.__name__}' is immutable.  Use thaw() for a mutable copy.")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = clear = extend = insert = pop = remove = reverse = sort = _immutable
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
+
+    def thaw(self):
+        """Mutable deep copy of the model template"""
+        return thaw_model(self)
+
+
+def freeze_model(obj):
+    """Recursively convert a model dict into an immutable FrozenModelDict
+
+    :param obj: (dict, list or value) model template
+    :return: frozen model template
+    """
+    if isinstance(obj, dict):
+        return FrozenModelDict((k, freeze_model(v)) for k, v in obj.items())
+    elif isinstance(obj, list):
+        return FrozenModelList(freeze_model(_) for _ in obj)
+    return obj
+
+
+def thaw_model(obj):
+    """Recursively convert a frozen model template into mutable OrderedDicts and lists
+
+    :param obj: (dict, list or value) model template
+    :return: mutable model template
+    """
+    if isinstance(obj, dict):
+        return OrderedDict((k, thaw_model(v)) for k, v in obj.items())
+    elif isinstance(obj, list):
+        return [thaw_model(_) for _ in obj]
+    return obj
+
+
+_FK_KEYS = ({"uuid", "_value_1"}, {"_value_1"})
+_VALUE, _DICT, _LIST = range(3)
+
+
+class FilterPlan(object):
+    """Target model compiled into a tree of key projections
+
+    Compiling once removes the key set comparisons and type inspection of the target model from each record
+    filtered, which matters when filtering many records against the same target model.
+
+    Example:
+
+    plan = FilterPlan(axl.phone.model())
+    filtered_phones = [plan(phone) for phone in serialized_phones]
+    """
+    __slots__ = ("fk", "fields")
+
+    def __init__(self, target_model):
+        """Compile a target model
+
+        :param target_model: model dict, e.g. from an API's model() method
+        """
+        # empty models with only uuid/_value_1 attrs are passed through as-is
+        self.fk = set(target_model.keys()) in _FK_KEYS
+        self.fields = []
+        for k, v in target_model.items():
+            if isinstance(v, list) and len(v) == 1 and isinstance(v[0], dict):
+                self.fields.append((k, _LIST, FilterPlan(v[0])))
+            elif isinstance(v, dict):
+                self.fields.append((k, _DICT, FilterPlan(v)))
+            else:
+                self.fields.append((k, _VALUE, None))
+
+    def _apply(self, obj):
+        if self.fk and set(obj.keys()) in _FK_KEYS:
+            return obj
+        if not isinstance(obj, MutableMapping):
+            raise TypeError
+        filtered_obj = OrderedDict()
+        for k, kind, plan in self.fields:
+            if k in obj:
+                v = obj[k]
+                if kind == _LIST and v:
+                    filtered_obj[k] = [plan._apply(item) for item in v]
+                elif kind == _DICT and v:
+                    filtered_obj[k] = plan._apply(v)
+                else:
+                    filtered_obj[k] = v
+        return filtered_obj
+
+    def __call__(self, obj):
+        """Filter a serialized response dict against the compiled target model
+
+        :param obj: serialized zeep response
+        :return: filtered dict only containing k-v pairs matching the target model
+        """
+        try:
+            return self._apply(obj)
+        except (ValueError, AttributeError, TypeError):
+            raise ParseError("Unable to parse data object dictionary against target model")
+
+
+def compile_filter_plan(target_model):
+    """Get a FilterPlan for a target model
+
+    Plans for frozen model templates, e.g. from an API's model() method, are compiled once and cached
+    on the template.
+
+    :param target_model: model dict or FilterPlan
+    :return: FilterPlan
+    """
+    if isinstance(target_model, FilterPlan):
+        return target_model
+    if isinstance(target_model, FrozenModelDict):
+        try:
+            return target_model.__dict__["filter_plan"]
+        except KeyError:
+            return target_model.__dict__.setdefault("filter_plan", FilterPlan(target_model))
+    return FilterPlan(target_model)
+
+
 def filter_dict_to_target_model(obj, target_model):
     """Filters a serialized response to match the structure of a target model dictionary.
 
@@ -86,35 +252,22 @@ def filter_dict_to_target_model(obj, target_model):
         e.g. filtering a serialized 'RPhone' for re-purposing in a subsequent 'XPhone' request.
 
     :param obj: serialized zeep response
-    :param target_model: model dict for
+    :param target_model: model dict or compiled FilterPlan
     :return: filtered dict only containing k-v pairs matching the target model
     """
-    try:
-        # base case for empty model with uuid attr
-        if (set(obj.keys()) == {"uuid", "_value_1"} or set(obj.keys()) == {"_value_1"}) and \
-                (set(target_model.keys()) == {"uuid", "_value_1"} or set(target_model.keys()) == {"_value_1"}):
-            return obj
+    return compile_filter_plan(target_model)(obj)
 
-        # if isinstance(obj, dict):
-        if isinstance(obj, MutableMapping):
-            filtered_obj = OrderedDict()
-        else:
-            raise TypeError
 
-        for k, v in target_model.items():
-            if k in obj:
-                if isinstance(v, list):
-                    if all([isinstance(i, dict) for i in v]) and len(v) == 1 and obj[k]:
-                        filtered_obj[k] = [filter_dict_to_target_model(item, v[0]) for item in obj[k]]
-                    else:
-                        filtered_obj[k] = obj[k]
-                elif isinstance(v, dict) and obj[k]:
-                    filtered_obj[k] = filter_dict_to_target_model(obj[k], v)
-                else:
-                    filtered_obj[k] = obj[k]
-        return filtered_obj
-    except (ValueError, AttributeError, TypeError):
-        raise ParseError("Unable to parse data object dictionary against target model")
+def filter_many(objs, target_model):
+    """Filter many serialized responses or data models against a single compiled target model
+
+    :param objs: iterable of dicts or AXL data models, e.g. from an API's iter_list()
+    :param target_model: model dict or compiled FilterPlan
+    :return: generator of filtered dicts or data models
+    """
+    plan = compile_filter_plan(target_model)
+    for obj in objs:
+        yield plan(obj) if isinstance(obj, dict) else obj.filter(plan)
 
 
 def sanitize_model_dict(obj):
@@ -206,3 +359,30 @@ def filter_attributes(target, model):
                            for k, v in model.items())
     else:
         raise TypeError("Invalid target class - dict or DefaultDict supported")
+
+
+def ris_items(obj, key):
+    """Unwrap a RisPort array, i.e. obj[key]['item'], tolerating empty arrays"""
+    return ((obj or {}).get(key) or {}).get("item") or []
+
+
+def _preferred_ris_device(device, other):
+    """Choose between a device's entries on two nodes, preferring the registered, then the latest, entry"""
+    def rank(_):
+        return _["Status"] == "Registered", _["TimeStamp"] or 0
+    return other if rank(other) > rank(device) else device
+
+
+def merge_ris_nodes(nodes):
+    """Merge CmNodes' devices to a single entry per device, adding the entry's node as 'NodeName'
+
+    :param nodes: iterable of CmNode OrderedDicts
+    :return: OrderedDict of device name to device OrderedDict
+    """
+    devices = OrderedDict()
+    for node in nodes:
+        for device in ris_items(node, "CmDevices"):
+            device["NodeName"] = node["Name"]
+            name = device["Name"]
+            devices[name] = _preferred_ris_device(devices[name], device) if name in devices else device
+    return devices
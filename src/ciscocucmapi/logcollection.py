@@ -0,0 +1,181 @@
+"""Log Collection connector, streaming trace and log file downloads"""
+
+from pathlib import Path
+from pathlib import PurePosixPath
+from xml.sax.saxutils import escape
+
+from zeep.exceptions import TransportError
+from zeep.helpers import serialize_object
+
+from .attachments import attachment_parser
+from .bulk import iter_bulk
+from .connectors import UCSOAPConnector
+from .connectors import get_connection_kwargs
+from .definitions import LOG_COLLECTION
+from .definitions import WSDL_URLS
+
+_GET_ONE_FILE = (
+    '<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" '
+    'xmlns:soap="http://schemas.cisco.com/ast/soap">'
+    '<soapenv:Header/><soapenv:Body><soap:GetOneFile><FileName>{file_name}</FileName></soap:GetOneFile>'
+    '</soapenv:Body></soapenv:Envelope>'
+)
+
+
+def _find_files(obj):
+    """Flatten the files of a selectLogFiles result set, across nodes and services"""
+    if isinstance(obj, dict):
+        if "absolutepath" in obj:
+            yield obj
+            return
+        obj = list(obj.values())
+    if isinstance(obj, list):
+        for item in obj:
+            yield from _find_files(item)
+
+
+class LogCollectionConnector(UCSOAPConnector):
+    """Log Collection connector
+
+    Files are selected through the LogCollection service, and downloaded from the DimeGetFileService.  Downloads
+    bypass zeep, streaming the attachment of the GetOneFile response to disk or a callback as it is received, so
+    that memory use is bounded by the read size rather than the file size.
+
+    Example:
+
+    logs = LogCollectionConnector(username="admin", password="secret", fqdn="cucm")
+    files = logs.select_log_files(service_logs=["Cisco CallManager"], rel_text="Hours", rel_time=1)
+    logs.get_files([_["absolutepath"] for _ in files], "/tmp/traces", workers=4)
+    """
+
+    _ENV = {
+        "username": "LOG_COLLECTION_USERNAME",
+        "password": "LOG_COLLECTION_PASSWORD",
+        "fqdn": "LOG_COLLECTION_FQDN",
+        "wsdl": "LOG_COLLECTION_WSDL_URL"
+    }
+    _ADDRESS = "https://{fqdn}:8443/logcollectionservice2/services/LogCollectionPortTypeService"
+    _DIME_ADDRESS = "https://{fqdn}:8443/logcollectionservice/services/DimeGetFileService"
+
+    def __init__(self, **kwargs):
+        connection_kwargs = get_connection_kwargs(self._ENV, kwargs)
+        connection_kwargs["wsdl"] = connection_kwargs["wsdl"] or WSDL_URLS["LogCollection"].format(**connection_kwargs)
+        connection_kwargs["binding_name"] = "{http://schemas.cisco.com/ast/soap}LogCollectionPortSoapBinding"
+        connection_kwargs["address"] = self._ADDRESS.format(**connection_kwargs)
+        self._dime_address = self._DIME_ADDRESS.format(**connection_kwargs)
+        del connection_kwargs["fqdn"]  # remove fqdn as not used in super() call
+        super().__init__(**connection_kwargs)
+
+    def select_log_files(self, service_logs=(), system_logs=(), from_date=None, to_date=None, rel_text="None",
+                         rel_time=0, search_str="", time_zone=LOG_COLLECTION["time_zone"]):
+        """Log files matching selection criteria, for all nodes
+
+        :param service_logs: service log names, e.g. ['Cisco CallManager']
+        :param system_logs: system log names, e.g. ['Event Viewer-Application Log']
+        :param from_date: (datetime) absolute range start, in 'time_zone'
+        :param to_date: (datetime) absolute range end, in 'time_zone'
+        :param rel_text: (str) relative range unit, i.e. 'Minutes', 'Hours', 'Days', 'Weeks' or 'Months'
+        :param rel_time: (int) relative range in 'rel_text' units
+        :param search_str: (str) file content search string
+        :param time_zone: (str) time zone of the absolute range
+        :return: list of file dicts, with 'name', 'absolutepath', 'filesize' and 'modifiedDate'
+        """
+        criteria = {
+            "ServiceLogs": {"item": list(service_logs)},
+            "SystemLogs": {"item": list(system_logs)},
+            "SearchStr": search_str,
+            "Frequency": "OnDemand",
+            "JobType": "DownloadtoClient",
+            "ToDate": to_date.strftime(LOG_COLLECTION["date_format"]) if to_date else None,
+            "FromDate": from_date.strftime(LOG_COLLECTION["date_format"]) if from_date else None,
+            "TimeZone": time_zone,
+            "RelText": rel_text,
+            "RelTime": rel_time,
+            "Port": None,
+            "IPAddress": None,
+            "UserName": None,
+            "Password": None,
+            "ZipInfo": False,
+            "RemoteFolder": None
+        }
+        result = self.service.selectLogFiles(FileSelectionCriteria=criteria)
+        return list(_find_files(serialize_object(result)))
+
+    def _stream_one_file(self, file_name, sink, chunk_size):
+        headers = {
+            "Content-Type": "text/xml; charset=utf-8",
+            "SOAPAction": LOG_COLLECTION["get_one_file_action"]
+        }
+        envelope = _GET_ONE_FILE.format(file_name=escape(file_name)).encode()
+        size = 0
+
+        def counting_sink(view):
+            nonlocal size
+            size += len(view)
+            sink(view)
+
+        with self._session.post(self._dime_address, data=envelope, headers=headers, stream=True,
+                                timeout=self._timeout) as response:
+            if response.status_code != 200:
+                raise TransportError(status_code=response.status_code, content=response.content)
+            parser = attachment_parser(response.headers.get("Content-Type"), counting_sink)
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                parser.feed(chunk)
+            parser.close()
+        return size
+
+    def get_one_file(self, file_name, destination=None, callback=None, chunk_size=LOG_COLLECTION["chunk_size"]):
+        """Stream a file download to disk, or to a callback
+
+        :param file_name: absolute file path on the node, as selected by select_log_files
+        :param destination: (str or Path) destination file, or directory to download to by file name
+        :param callback: callable receiving file content as memoryview slices, valid only during the call
+        :param chunk_size: (int) read size in bytes
+        :return: (int) file size in bytes
+        """
+        if (destination is None) == (callback is None):
+            raise ValueError("Requires one of 'destination' or 'callback'")
+        if callback is not None:
+            return self._stream_one_file(file_name, callback, chunk_size)
+        path = Path(destination)
+        if path.is_dir():
+            path = path / PurePosixPath(file_name).name
+        try:
+            with open(path, "wb") as _:
+                return self._stream_one_file(file_name, _.write, chunk_size)
+        except BaseException:
+            try:
+                path.unlink()  # remove partial downloads
+            except FileNotFoundError:
+                pass
+            raise
+
+    def iter_get_files(self, file_names, directory, workers=None, chunk_size=LOG_COLLECTION["chunk_size"]):
+        """Download files in parallel, mirroring their node paths under a directory
+
+        :param file_names: iterable of absolute file paths on the node
+        :param directory: (str or Path) local directory
+        :param workers: (int) concurrent downloads.  Defaults to, and is capped by, the connector's max_concurrency.
+        :param chunk_size: (int) read size in bytes
+        :return: generator of BulkResult(kwargs, result, error), with the file size as result, in input order
+        :raises ValueError: for file names resolving outside of the directory, e.g. with '..' components
+        """
+        workers = min(workers or self.max_concurrency, self.max_concurrency)
+        root = Path(directory).resolve()
+
+        def downloads():
+            for file_name in file_names:
+                path = (root / PurePosixPath(file_name.lstrip("/"))).resolve()
+                if root not in path.parents:
+                    raise ValueError(f"'{file_name}' is outside of directory '{directory}'")
+                path.parent.mkdir(parents=True, exist_ok=True)
+                yield {"file_name": file_name, "destination": path, "chunk_size": chunk_size}
+
+        return iter_bulk(self.get_one_file, downloads(), self._request_slots, workers)
+
+    def get_files(self, file_names, directory, workers=None, chunk_size=LOG_COLLECTION["chunk_size"]):
+        """Download files in parallel.  See iter_get_files.
+
+        :return: list of BulkResult(kwargs, result, error), in input order
+        """
+        return list(self.iter_get_files(file_names, directory, workers=workers, chunk_size=chunk_size))
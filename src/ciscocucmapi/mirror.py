@@ -0,0 +1,170 @@
+"""Persistent local mirror of AXL objects for indexed lookups without AXL round trips"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .definitions import MIRROR
+from .sync import _snapshot_key
+
+_FIELDS = MIRROR["indexed_fields"]
+
+
+def _index_value(value):
+    """Indexable value for an AXL attribute, unwrapping '_value_1' references"""
+    if isinstance(value, dict):
+        value = value.get("_value_1")
+    return value
+
+
+class MirrorResult(list):
+    """Mirror query results, with the time the queried type was last refreshed from AXL"""
+
+    def __init__(self, objs, refreshed):
+        super().__init__(objs)
+        self.refreshed = refreshed
+
+    @property
+    def age(self):
+        """Seconds since the mirrored type was refreshed, or None if it has never been refreshed"""
+        return time.time() - self.refreshed if self.refreshed is not None else None
+
+
+class LocalMirror(object):
+    """Local SQLite store of AXL objects pulled through the API wrappers
+
+    Objects are indexed by name, uuid and common foreign key fields, so that queries such as
+    "which phones use CSS X" are answered locally.  Results report when their type was last refreshed,
+    as the mirror is only as current as its last refresh.
+
+    Example:
+
+    mirror = axl.local_mirror("cucm.db")
+    mirror.refresh("phone", returnedTags={"name": "", "callingSearchSpaceName": "", "devicePoolName": ""})
+    phones = mirror.find("phone", callingSearchSpaceName="CSS_INTERNAL")
+    phones.age  # seconds since refresh
+    """
+
+    def __init__(self, connector, path=":memory:"):
+        """Open or create a mirror database
+
+        :param connector: UCMAXLConnector
+        :param path: (str or Path) SQLite database path.  Defaults to an in-memory database.
+        """
+        self.connector = connector
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS objects (type TEXT NOT NULL, {', '.join(f'{_} TEXT' for _ in _FIELDS)}, "
+                f"data TEXT NOT NULL, PRIMARY KEY (type, uuid))"
+            )
+            for field in _FIELDS:
+                self._db.execute(f"CREATE INDEX IF NOT EXISTS objects_{field} ON objects (type, {field})")
+            self._db.execute("CREATE TABLE IF NOT EXISTS refreshed (type TEXT PRIMARY KEY, timestamp REAL NOT NULL)")
+
+    def _api(self, api_name):
+        return getattr(self.connector, api_name)
+
+    @staticmethod
+    def _row(obj_type, obj):
+        # API objects are Data Models, which are mappings but not dicts, and raise on unknown attributes
+        obj = dict(obj)
+        values = {field: _index_value(obj.get(field)) for field in _FIELDS}
+        if values["name"] is None:
+            values["name"] = next((_index_value(obj[_]) for _ in MIRROR["name_aliases"] if _ in obj), None)
+        values["uuid"] = _snapshot_key(values["uuid"])
+        return (obj_type,) + tuple(values[_] for _ in _FIELDS) + (json.dumps(obj),)
+
+    def _store(self, obj_type, objs, replace=False):
+        # fetch before locking, so that lookups are answered while a refresh is listing from AXL
+        rows = [self._row(obj_type, obj) for obj in objs]
+        with self._lock, self._db:
+            if replace:
+                self._db.execute("DELETE FROM objects WHERE type = ?", (obj_type,))
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO objects VALUES ({', '.join('?' * (len(_FIELDS) + 2))})", rows
+            )
+            if replace:
+                self._db.execute("INSERT OR REPLACE INTO refreshed VALUES (?, ?)", (obj_type, time.time()))
+
+    def refresh(self, api_name, searchCriteria=None, returnedTags=None, parallel=False):
+        """Replace all mirrored objects of a type with a fresh AXL list
+
+        :param api_name: connector API attribute name, e.g. "phone"
+        :param searchCriteria: (dict) search criteria for 'list'.  Defaults to all objects.
+        :param returnedTags: (dict) returned attributes.  Must include the uuid.  Defaults to the full list model.
+        :param parallel: (bool) fetch list pages concurrently
+        :return: (int) number of mirrored objects
+        """
+        api = self._api(api_name)
+        objs = api.iter_list(searchCriteria=searchCriteria, returnedTags=returnedTags, parallel=parallel)
+        self._store(api.__class__.__name__, objs, replace=True)
+        return self.count(api_name)
+
+    def update(self, api_name, *objs):
+        """Add or replace individual objects, e.g. from 'get' or a ChangeFeed, without a full refresh
+
+        :param api_name: connector API attribute name
+        :param objs: AXL objects, including their uuid
+        :return: None
+        """
+        self._store(self._api(api_name).__class__.__name__, objs)
+
+    def discard(self, api_name, uuid):
+        """Remove an object from the mirror
+
+        :param api_name: connector API attribute name
+        :param uuid: object uuid
+        :return: None
+        """
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM objects WHERE type = ? AND uuid = ?",
+                             (self._api(api_name).__class__.__name__, _snapshot_key(uuid)))
+
+    def refreshed(self, api_name):
+        """Time a type was last refreshed from AXL
+
+        :param api_name: connector API attribute name
+        :return: (float) epoch timestamp, or None if never refreshed
+        """
+        with self._lock:
+            row = self._db.execute("SELECT timestamp FROM refreshed WHERE type = ?",
+                                   (self._api(api_name).__class__.__name__,)).fetchone()
+        return row[0] if row else None
+
+    def count(self, api_name):
+        """Number of mirrored objects of a type"""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM objects WHERE type = ?",
+                                    (self._api(api_name).__class__.__name__,)).fetchone()[0]
+
+    def find(self, api_name, **criteria):
+        """Find mirrored objects by exact match on indexed fields
+
+        :param api_name: connector API attribute name
+        :param criteria: indexed field values, e.g. callingSearchSpaceName="CSS_INTERNAL".  Defaults to all objects.
+        :return: (MirrorResult) list of Data Models for the API endpoint, with the type's refresh time
+        """
+        unsupported = set(criteria) - set(_FIELDS)
+        if unsupported:
+            raise TypeError(f"Unsupported mirror criteria: {', '.join(sorted(unsupported))}.  "
+                            f"Supported: {', '.join(_FIELDS)}")
+        if "uuid" in criteria:
+            criteria["uuid"] = _snapshot_key(criteria["uuid"])
+        api = self._api(api_name)
+        obj_type = api.__class__.__name__
+        where = "".join(f" AND {field} = ?" for field in criteria)
+        with self._lock:
+            rows = self._db.execute(f"SELECT data FROM objects WHERE type = ?{where}",
+                                    (obj_type,) + tuple(criteria.values())).fetchall()
+        return MirrorResult(
+            (api.object_factory(obj_type, json.loads(row[0], object_pairs_hook=OrderedDict)) for row in rows),
+            self.refreshed(api_name)
+        )
+
+    def close(self):
+        """Close the mirror database"""
+        self._db.close()
@@ -3,11 +3,13 @@
 from collections import defaultdict
 
 from .axldata import AXLDataModel
+from .axldata import ThinAXLColumnarDataModel
 from .axldata import ThinAXLDataModel
 
 axl_data_models = defaultdict(
     lambda: AXLDataModel,
     ThinAXLAPI=ThinAXLDataModel,
+    ThinAXLColumns=ThinAXLColumnarDataModel,
 )
 
 
@@ -1,9 +1,11 @@
 """Cisco UC AXL Generic Data Model"""
 
+from collections import OrderedDict
 from collections.abc import MutableMapping
 
 from ..exceptions import AXLAttributeError
 from ..helpers import filter_dict_to_target_model
+from ..helpers import rows_to_csv
 from ..helpers import sanitize_model_dict
 from ..helpers import to_csv
 
@@ -107,7 +109,7 @@ class AXLDataModel(MutableMapping):
 
         Useful for assured processing of list/add or get/add transaction paradigms.
 
-        :param target_model: empty API model called from API's model() method
+        :param target_model: empty API model called from API's model() method, or a compiled FilterPlan
         :return: filtered dictionary
         """
         # return filter_dict_to_target_model(self._axl_data, target_model)
@@ -127,3 +129,77 @@ class ThinAXLDataModel(AXLDataModel):
         """Write to csv in familiar table format"""
         # todo - test for single and duplicate base cases
         to_csv(self._axl_data, destination_path)
+
+
+class ThinAXLColumnarDataModel(object):
+    """Column-oriented Cisco CUCM Thin AXL data model.
+
+    Stores a column name tuple and one list of values per column, rather than one dict per row, for
+    memory-efficient large query results.  Converts to NumPy, pandas or Arrow when installed.
+    """
+
+    def __init__(self, axl_data):
+        if axl_data is None:
+            axl_data = OrderedDict()
+        elif not isinstance(axl_data, dict):
+            raise TypeError("Columnar AXL model data must be a dictionary of column name to column values")
+        self._columns = tuple(axl_data)
+        self._data = axl_data
+
+    @property
+    def columns(self):
+        """Tuple of column names"""
+        return self._columns
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(columns={self._columns}, rows={len(self)})"
+
+    def __len__(self):
+        """Number of rows"""
+        return len(self._data[self._columns[0]]) if self._columns else 0
+
+    def __getitem__(self, column):
+        """Values for a column"""
+        try:
+            return self._data[column]
+        except KeyError:
+            raise AXLAttributeError(f"Unknown column for SQL response: {column}")
+
+    def rows(self):
+        """Iterate over rows as tuples of values in column order"""
+        return zip(*(self._data[column] for column in self._columns))
+
+    def __iter__(self):
+        """Iterate over rows as OrderedDicts, as per the row-oriented data model"""
+        return (OrderedDict(zip(self._columns, row)) for row in self.rows())
+
+    def to_numpy(self):
+        """Convert to a 2-dimensional NumPy object array of shape (rows, columns)"""
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("NumPy is required for 'to_numpy'.  Install with 'pip install numpy'")
+        array = np.empty((len(self), len(self._columns)), dtype=object)
+        for i, column in enumerate(self._columns):
+            array[:, i] = self._data[column]
+        return array
+
+    def to_pandas(self):
+        """Convert to a pandas DataFrame"""
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("pandas is required for 'to_pandas'.  Install with 'pip install pandas'")
+        return pd.DataFrame(self._data, columns=self._columns)
+
+    def to_arrow(self):
+        """Convert to a pyarrow Table"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow is required for 'to_arrow'.  Install with 'pip install pyarrow'")
+        return pa.table(self._data)
+
+    def csv(self, destination_path):
+        """Write to csv in familiar table format"""
+        rows_to_csv(self._columns, self.rows(), destination_path)
@@ -0,0 +1,118 @@
+"""Continuous RisPort device registration monitoring, emitting only state transitions"""
+
+import threading
+import time
+from collections import namedtuple
+
+from .definitions import RISPORT
+from .helpers import merge_ris_nodes
+from .helpers import ris_items
+
+DeviceTransition = namedtuple("DeviceTransition", ["name", "field", "old", "new", "device"])
+DeviceTransition.__doc__ = """Change in a monitored device field.  Devices first reported, or no longer reported,
+e.g. unregistered devices when monitoring registered devices only, are a single 'Status' transition from or to None."""
+
+
+def _field_value(device, field):
+    """Comparable value of a device field, reducing IP address arrays to a tuple of addresses"""
+    if device is None:
+        return None
+    if field == "IPAddress":
+        return tuple(address["IP"] for address in ris_items(device, field))
+    return device.get(field)
+
+
+class RegistrationMonitor(object):
+    """Last known real-time state of a set of devices, kept current by polling RisPort for changes only
+
+    Each batch of devices is re-queried with the StateInfo returned by its previous query, so that RisPort only
+    returns devices for nodes with changes, flagging all other nodes as NoChange.  Devices on unchanged nodes keep
+    their last known state, and monitored fields are compared across the merged view to emit transitions, e.g.
+    Registered to UnRegistered, or a changed IP address.
+
+    Example:
+
+    monitor = ris.monitor(phone_names, device_class="Phone")
+    for transition in monitor.transitions(interval=60):
+        print(transition.name, transition.field, transition.old, transition.new)
+    """
+
+    def __init__(self, connector, items, fields=RISPORT["monitor_fields"], **criteria):
+        """Monitor devices through a RisPortConnector
+
+        :param connector: RisPortConnector
+        :param items: iterable of items to select by, e.g. device names
+        :param fields: device fields to emit transitions for
+        :param criteria: RisPortConnector.iter_cm_devices selection criteria, e.g. device_class or status
+        """
+        self.connector = connector
+        self.fields = fields
+        self._criteria = connector._criteria(**criteria)
+        self._batches = [
+            {"items": batch, "state_info": "", "nodes": {}, "devices": {}}
+            for batch in connector._batches(items)
+        ]
+        self.devices = {}
+        self.last_poll = None
+        self._stopped = threading.Event()
+
+    def _poll_batch(self, batch):
+        nodes, batch["state_info"] = self.connector._select_batch(batch["items"], self._criteria,
+                                                                  state_info=batch["state_info"])
+        # nodes omitted from a response no longer report any devices
+        changed = {}
+        for node in nodes:
+            if not node.get("NoChange"):
+                changed.setdefault(node["Name"], []).append(node)
+        batch["nodes"] = {node["Name"]: changed.get(node["Name"]) or batch["nodes"].get(node["Name"], [])
+                          for node in nodes}
+        devices = merge_ris_nodes(node for pages in batch["nodes"].values() for node in pages)
+        transitions = []
+        for name in list(batch["devices"]) + [_ for _ in devices if _ not in batch["devices"]]:
+            old, new = batch["devices"].get(name), devices.get(name)
+            for field in self.fields if old and new else ("Status",):
+                old_value, new_value = _field_value(old, field), _field_value(new, field)
+                if old_value != new_value:
+                    transitions.append(DeviceTransition(name, field, old_value, new_value, new))
+            if new is None:
+                self.devices.pop(name, None)
+            else:
+                self.devices[name] = new
+        batch["devices"] = devices
+        return transitions
+
+    def poll(self):
+        """Query all device batches for changes since the last poll
+
+        The first poll reports every device found as a 'Status' transition from None.
+
+        :return: list of DeviceTransition
+        """
+        transitions = []
+        for batch in self._batches:
+            transitions.extend(self._poll_batch(batch))
+        self.last_poll = time.time()
+        return transitions
+
+    def transitions(self, interval=RISPORT["monitor_interval"], initial=False):
+        """Generator polling for changes until stopped, yielding transitions as they are found
+
+        Polls are additionally paced by the connector's RisPort request quota.
+
+        :param interval: (float) seconds between the start of consecutive polls
+        :param initial: (bool) yield the first poll's transitions, i.e. every device found
+        :return: generator of DeviceTransition
+        """
+        self._stopped.clear()
+        first = self.last_poll is None
+        while not self._stopped.is_set():
+            started = time.monotonic()
+            transitions = self.poll()
+            if initial or not first:
+                yield from transitions
+            first = False
+            self._stopped.wait(max(interval - (time.monotonic() - started), 0))
+
+    def stop(self):
+        """Stop polling, ending the transitions generator after its current poll"""
+        self._stopped.set()
@@ -0,0 +1,291 @@
+"""PerfMon performance counter connector with session-based collection"""
+
+import logging
+import math
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+from zeep.exceptions import Fault
+from zeep.helpers import serialize_object
+
+from .connectors import UCSOAPConnector
+from .connectors import get_connection_kwargs
+from .definitions import PERFMON
+from .definitions import WSDL_URLS
+from .throttle import RequestQuota
+
+logger = logging.getLogger(__name__)
+
+
+def counter_path(host, object_name, counter, instance=None):
+    """PerfMon counter name, e.g. '\\\\cucm-sub1\\Cisco CallManager\\CallsActive'
+
+    :param host: node fqdn or IP address, as known to the cluster
+    :param object_name: PerfMon object, e.g. 'Processor'
+    :param counter: counter name, e.g. '% CPU Time'
+    :param instance: object instance, e.g. '_Total', for multi-instance objects
+    :return: (str) counter name
+    """
+    instance = f"({instance})" if instance is not None else ""
+    return f"\\\\{host}\\{object_name}{instance}\\{counter}"
+
+
+class CounterRing(object):
+    """Fixed-capacity time series of counter samples, preallocated as one float array per counter
+
+    Once full, each sample overwrites the oldest.  Missing and invalid counter values are stored as NaN.
+    """
+
+    def __init__(self, counters, capacity=PERFMON["capacity"]):
+        """Allocate the ring
+
+        :param counters: iterable of counter names
+        :param capacity: (int) samples kept
+        """
+        self.counters = list(counters)
+        self.capacity = capacity
+        # counter names are matched case-insensitively, as PerfMon may return host names in a different case
+        self._index = {name.lower(): i for i, name in enumerate(self.counters)}
+        self._timestamps = array("d", [0.0]) * capacity
+        self._values = [array("d", [math.nan]) * capacity for _ in self.counters]
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def _slots(self):
+        """Occupied slots, oldest first"""
+        start = (self._next - self._count) % self.capacity
+        return [(start + i) % self.capacity for i in range(self._count)]
+
+    def append(self, timestamp, samples):
+        """Store a sample of all counters
+
+        :param timestamp: (float) sample time
+        :param samples: dict of counter name to value.  Unknown counter names are ignored.
+        :return: None
+        """
+        with self._lock:
+            slot = self._next
+            self._timestamps[slot] = timestamp
+            for values in self._values:
+                values[slot] = math.nan
+            for name, value in samples.items():
+                i = self._index.get(name.lower())
+                if i is not None:
+                    self._values[i][slot] = value
+            self._next = (slot + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def timestamps(self):
+        """Sample times, oldest first"""
+        with self._lock:
+            return [self._timestamps[slot] for slot in self._slots()]
+
+    def series(self, counter):
+        """Samples of a counter
+
+        :param counter: counter name
+        :return: list of (timestamp, value) tuples, oldest first
+        """
+        values = self._values[self._index[counter.lower()]]
+        with self._lock:
+            return [(self._timestamps[slot], values[slot]) for slot in self._slots()]
+
+    def latest(self):
+        """Most recent sample of all counters
+
+        :return: OrderedDict of counter name to value, or None before any sample
+        """
+        with self._lock:
+            if not self._count:
+                return None
+            slot = (self._next - 1) % self.capacity
+            return OrderedDict((name, self._values[i][slot]) for i, name in enumerate(self.counters))
+
+
+class PerfMonSession(object):
+    """PerfMon session collecting a fixed set of counters into a CounterRing
+
+    Counters are added to the session once, so that each collection is a single perfmonCollectSessionData request
+    regardless of the number of counters.  Counters may name any node in the cluster, so a single session on one
+    node can collect from all nodes.  Expired sessions are closed and re-opened on collection.
+
+    Example:
+
+    with perfmon.session(counters) as session:
+        session.start(interval=10)
+        ...
+        session.samples.series(counters[0])
+    """
+
+    def __init__(self, connector, counters, capacity=PERFMON["capacity"]):
+        """Define a session.  The session is opened on first collection.
+
+        :param connector: PerfMonConnector
+        :param counters: iterable of counter names.  See counter_path.
+        :param capacity: (int) samples kept
+        """
+        self.connector = connector
+        self.counters = list(OrderedDict.fromkeys(counters))
+        self.samples = CounterRing(self.counters, capacity=capacity)
+        self.handle = None
+        self.last_error = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def open(self):
+        """Open the session and add its counters in bulk
+
+        :return: self
+        """
+        self.handle = self.connector._call("perfmonOpenSession")
+        self.connector._call("perfmonAddCounter", SessionHandle=self.handle,
+                             ArrayOfCounter={"Counter": [{"Name": counter} for counter in self.counters]})
+        return self
+
+    def _close_session(self):
+        """Close the session handle, if open, ignoring faults for handles that have already expired"""
+        if self.handle is not None:
+            try:
+                self.connector._call("perfmonCloseSession", SessionHandle=self.handle)
+            except Fault:
+                pass
+            self.handle = None
+
+    def _collect_session_data(self):
+        if self.handle is None:
+            self.open()
+        try:
+            return self.connector._call("perfmonCollectSessionData", SessionHandle=self.handle)
+        except Fault as fault:
+            if not any(text in (fault.message or "").lower() for text in PERFMON["session_faults"]):
+                raise
+        # the session expired, or its node restarted
+        self._close_session()
+        self.open()
+        return self.connector._call("perfmonCollectSessionData", SessionHandle=self.handle)
+
+    def collect(self):
+        """Collect a sample of all counters
+
+        :return: dict of counter name to value, NaN for invalid values
+        """
+        timestamp = time.time()
+        samples = {
+            counter["Name"]: counter["Value"] if counter["CStatus"] in PERFMON["valid_statuses"] else math.nan
+            for counter in serialize_object(self._collect_session_data()) or []
+        }
+        self.samples.append(timestamp, samples)
+        return samples
+
+    def _run(self, interval):
+        deadline = time.monotonic()
+        while not self._stopped.is_set():
+            try:
+                self.collect()
+                self.last_error = None
+            except Exception as error:
+                self.last_error = error
+                logger.warning(f"PerfMon collection failed: {error}")
+            # schedule on fixed deadlines so that slow collections do not drift the interval
+            deadline += interval
+            self._stopped.wait(max(deadline - time.monotonic(), 0))
+
+    def start(self, interval=PERFMON["interval"]):
+        """Collect on an interval in a background thread until stopped
+
+        :param interval: (float) seconds between collections
+        :return: None
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop collecting, waiting for an in-flight collection to complete"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        """Stop collecting and close the session.  Samples remain available."""
+        self.stop()
+        self._close_session()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class PerfMonConnector(UCSOAPConnector):
+    """PerfMon performance counter connector
+
+    Requests are paced to stay within the node's per-minute PerfMon query quota.
+
+    Example:
+
+    perfmon = PerfMonConnector(username="perfmon", password="secret", fqdn="cucm")
+    counters = [counter_path(node, "Cisco CallManager", "CallsActive") for node in nodes]
+    with perfmon.session(counters) as session:
+        session.start(interval=10)
+    """
+
+    _ENV = {
+        "username": "PERFMON_USERNAME",
+        "password": "PERFMON_PASSWORD",
+        "fqdn": "PERFMON_FQDN",
+        "wsdl": "PERFMON_WSDL_URL"
+    }
+    _ADDRESS = "https://{fqdn}:8443/perfmonservice2/services/PerfmonService"
+
+    def __init__(self, requests_per_minute=PERFMON["requests_per_minute"], **kwargs):
+        """Connect to PerfMon
+
+        :param requests_per_minute: (int) PerfMon query quota
+        :param kwargs: UCSOAPConnector parameters, plus 'fqdn'.  'wsdl' defaults to the node's PerfMon WSDL.
+        """
+        connection_kwargs = get_connection_kwargs(self._ENV, kwargs)
+        connection_kwargs["wsdl"] = connection_kwargs["wsdl"] or WSDL_URLS["PerfMon"].format(**connection_kwargs)
+        connection_kwargs["binding_name"] = "{http://schemas.cisco.com/ast/soap}PerfmonBinding"
+        connection_kwargs["address"] = self._ADDRESS.format(**connection_kwargs)
+        del connection_kwargs["fqdn"]  # remove fqdn as not used in super() call
+        super().__init__(**connection_kwargs)
+        self._quota = RequestQuota(requests_per_minute, fault=PERFMON["quota_fault"], retries=PERFMON["retries"])
+
+    @property
+    def quota(self):
+        """Per-minute PerfMon request quota"""
+        return self._quota
+
+    def _call(self, operation, **kwargs):
+        """Call a PerfMon operation within the request quota"""
+        return self._quota.call(getattr(self.service, operation), **kwargs)
+
+    def collect_counter_data(self, host, object_name):
+        """Current values of all counters of a PerfMon object, without a session
+
+        :param host: node fqdn or IP address
+        :param object_name: PerfMon object, e.g. 'Cisco CallManager'
+        :return: OrderedDict of counter name to value
+        """
+        counters = serialize_object(self._call("perfmonCollectCounterData", Host=host, Object=object_name)) or []
+        return OrderedDict((counter["Name"], counter["Value"]) for counter in counters)
+
+    def session(self, counters, capacity=PERFMON["capacity"]):
+        """PerfMon session collecting counters into a ring buffer.  See perfmon.PerfMonSession.
+
+        :param counters: iterable of counter names.  See counter_path.
+        :param capacity: (int) samples kept
+        :return: PerfMonSession
+        """
+        return PerfMonSession(self, counters, capacity=capacity)
@@ -0,0 +1,146 @@
+"""Batched, cached name to pkid resolution via Thin AXL"""
+
+import threading
+
+from .definitions import RESOLVER
+from .exceptions import AmbiguousNameError
+from .helpers import extract_pkid_from_uuid
+from .sql_utils import query_chunks
+
+
+class PkidResolver(object):
+    """Resolves names to pkids for foreign key fields, batching lookups into 'IN (...)' queries
+
+    Names are queued with add() and resolved together on the next lookup, with one query per lookup table
+    and chunk of names.  Results are cached in both directions for the lifetime of the resolver.  Names that are
+    not unique in a lookup, e.g. DNs in several route partitions, raise AmbiguousNameError when resolved.
+
+    Example:
+
+    axl.resolver.add("device", *device_names)
+    axl.resolver.add("enduser", *userids)
+    for device_name, userid in associations:  # two queries in total
+        associate_device_to_enduser(axl, axl.resolver.pkid("enduser", userid), axl.resolver.pkid("device", device_name))
+    """
+
+    def __init__(self, connector):
+        self.connector = connector
+        self._lookups = dict(RESOLVER["lookups"])
+        self._pkids = {}
+        self._names = {}
+        self._pending = {}
+        self._ambiguous = {}
+        self._lock = threading.RLock()
+
+    def register(self, lookup, table, column, condition=None):
+        """Register an additional lookup
+
+        :param lookup: (str) lookup name
+        :param table: (str) database table
+        :param column: (str) name column, expected to be unique within the condition
+        :param condition: (str) additional SQL condition, e.g. "tkpatternusage = 2"
+        :return: None
+        """
+        self._lookups[lookup] = (table, column, condition)
+
+    def _spec(self, lookup):
+        try:
+            return self._lookups[lookup]
+        except KeyError:
+            raise ValueError(f"Unsupported lookup '{lookup}'.  Supported: {', '.join(sorted(self._lookups))}")
+
+    def _query(self, lookup, column, values):
+        """Query and cache pkid and name pairs for values of 'pkid' or the lookup's name column"""
+        table, name_column, condition = self._spec(lookup)
+        name_select = name_column if name_column == "name" else f"{name_column} as name"
+        template = f"select pkid, {name_select} from {table} where {column} in :values"
+        if condition:
+            template += f" and {condition}"
+        rows = query_chunks(self.connector, template + " order by pkid", "values", values,
+                            chunk_size=RESOLVER["in_list_size"])
+        pkids = self._pkids.setdefault(lookup, {})
+        for row in rows:
+            if pkids.get(row["name"]) not in (None, row["pkid"]):
+                self._ambiguous.setdefault(lookup, set()).add(row["name"])
+            pkids[row["name"]] = row["pkid"]
+            self._names.setdefault(lookup, {})[row["pkid"]] = row["name"]
+
+    def add(self, lookup, *names):
+        """Queue names for resolution with the next batch
+
+        :param lookup: lookup name, e.g. "device"
+        :param names: names to resolve
+        :return: None
+        """
+        self._spec(lookup)
+        with self._lock:
+            cached = self._pkids.get(lookup, {})
+            self._pending.setdefault(lookup, set()).update(_ for _ in names if _ not in cached)
+
+    def flush(self, lookup=None):
+        """Resolve all queued names
+
+        :param lookup: resolve only queued names for a lookup.  Defaults to all lookups.
+        :return: None
+        """
+        with self._lock:
+            for _ in [lookup] if lookup else list(self._pending):
+                pending = self._pending.pop(_, None)
+                if pending:
+                    self._query(_, self._spec(_)[1], sorted(pending))
+                    # cache misses, so unknown names are not re-queried
+                    cached = self._pkids.setdefault(_, {})
+                    for name in pending:
+                        cached.setdefault(name, None)
+
+    def resolve(self, lookup, names):
+        """Resolve names to pkids in as few queries as possible
+
+        :param lookup: lookup name, e.g. "device"
+        :param names: iterable of names
+        :return: (dict) name to pkid, with None for names that do not exist
+        """
+        names = list(names)
+        with self._lock:
+            self.add(lookup, *names)
+            self.flush(lookup)
+            ambiguous = self._ambiguous.get(lookup, set()).intersection(names)
+            if ambiguous:
+                raise AmbiguousNameError(f"Names match more than one '{lookup}' object: {', '.join(sorted(ambiguous))}")
+            cached = self._pkids[lookup] if names else {}
+            return {name: cached[name] for name in names}
+
+    def pkid(self, lookup, name):
+        """Resolve a single name, together with any queued names for the same lookup
+
+        :param lookup: lookup name, e.g. "device"
+        :param name: name to resolve
+        :return: (str) pkid, or None if the name does not exist
+        """
+        return self.resolve(lookup, [name])[name]
+
+    def name(self, lookup, pkid_or_uuid):
+        """Resolve a pkid or uuid to its name
+
+        :param lookup: lookup name, e.g. "ldap_directory"
+        :param pkid_or_uuid: pkid or uuid
+        :return: (str) name, or None if the pkid does not exist
+        """
+        pkid = extract_pkid_from_uuid(pkid_or_uuid).lower()
+        with self._lock:
+            if pkid not in self._names.get(lookup, {}):
+                self._query(lookup, "pkid", [pkid])
+            return self._names.get(lookup, {}).get(pkid)
+
+    def invalidate(self, lookup=None):
+        """Clear cached results, e.g. after objects are renamed or removed
+
+        :param lookup: clear only a single lookup's results.  Defaults to all lookups.
+        :return: None
+        """
+        with self._lock:
+            for cache in (self._pkids, self._names, self._pending, self._ambiguous):
+                if lookup:
+                    cache.pop(lookup, None)
+                else:
+                    cache.clear()
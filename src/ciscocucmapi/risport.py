@@ -0,0 +1,153 @@
+"""RisPort70 real-time device information connector"""
+
+from collections import OrderedDict
+
+from zeep.helpers import serialize_object
+
+from .connectors import UCSOAPConnector
+from .connectors import get_connection_kwargs
+from .definitions import RISPORT
+from .definitions import WSDL_URLS
+from .helpers import merge_ris_nodes
+from .helpers import ris_items
+from .monitor import RegistrationMonitor
+from .throttle import RequestQuota
+
+
+class RisPortConnector(UCSOAPConnector):
+    """RisPort70 real-time information connector
+
+    Device queries are split into batches of RisPort's max returned devices, and requests are paced to stay within
+    the per-minute RisPort request quota, i.e. 40k devices take 40 requests and just under 3 minutes at the default
+    quota of 15 requests per minute.
+
+    Example:
+
+    ris = RisPortConnector(username="ris", password="secret", fqdn="cucm")
+    devices = ris.select_cm_devices(["SEP001122334455", "SEP00AABBCCDDEE"])
+    devices["SEP001122334455"]["Status"]
+    """
+
+    _ENV = {
+        "username": "RIS_USERNAME",
+        "password": "RIS_PASSWORD",
+        "fqdn": "RIS_FQDN",
+        "wsdl": "RIS_WSDL_URL"
+    }
+    _ADDRESS = "https://{fqdn}:8443/realtimeservice2/services/RISService70"
+
+    def __init__(self, max_devices=RISPORT["max_devices"]["default"],
+                 requests_per_minute=RISPORT["requests_per_minute"], **kwargs):
+        """Connect to RisPort70
+
+        :param max_devices: (int) max devices returned per request
+        :param requests_per_minute: (int) RisPort request quota.  Shared by all clients of a node, so lower this when
+        other applications also query RisPort.
+        :param kwargs: UCSOAPConnector parameters, plus 'fqdn'.  'wsdl' defaults to the node's RisPort70 WSDL.
+        """
+        connection_kwargs = get_connection_kwargs(self._ENV, kwargs)
+        connection_kwargs["wsdl"] = connection_kwargs["wsdl"] or WSDL_URLS["RisPort70"].format(**connection_kwargs)
+        connection_kwargs["binding_name"] = "{http://schemas.cisco.com/ast/soap}RisBinding"
+        connection_kwargs["address"] = self._ADDRESS.format(**connection_kwargs)
+        del connection_kwargs["fqdn"]  # remove fqdn as not used in super() call
+        super().__init__(**connection_kwargs)
+        self._max_devices = max_devices
+        self._quota = RequestQuota(requests_per_minute, fault=RISPORT["quota_fault"], retries=RISPORT["retries"])
+
+    @property
+    def max_devices(self):
+        return self._max_devices
+
+    @property
+    def quota(self):
+        """Per-minute RisPort request quota"""
+        return self._quota
+
+    def _select_cm_device_ext(self, criteria, state_info=""):
+        """Call selectCmDeviceExt within the request quota"""
+        return serialize_object(self._quota.call(self.service.selectCmDeviceExt, CmSelectionCriteria=criteria,
+                                                 StateInfo=state_info))
+
+    def _select_batch(self, items, criteria, state_info=""):
+        """Select a batch of up to max_devices items, following the StateInfo cursor for further results
+
+        :param items: items to select by
+        :param criteria: CmSelectionCriteria, excluding SelectItems
+        :param state_info: (str) StateInfo of a previous selection of the batch, to only return changed nodes' devices
+        :return: tuple of CmNode OrderedDicts across all pages, and the final StateInfo
+        """
+        criteria = dict(criteria, SelectItems={"item": [{"Item": item} for item in items]})
+        # a full page of exact device names needs no further request once every name is found
+        exact_names = criteria["SelectBy"] == "Name" and not any("*" in item for item in items)
+        nodes, names = [], set()
+        while True:
+            resp = self._select_cm_device_ext(criteria, state_info=state_info)
+            page = ris_items(resp["SelectCmDeviceResult"], "CmNodes")
+            nodes.extend(page)
+            devices = [device for node in page for device in ris_items(node, "CmDevices")]
+            names.update(device["Name"] for device in devices)
+            if len(devices) < self._max_devices or not resp["StateInfo"] or resp["StateInfo"] == state_info \
+                    or exact_names and len(names) >= len(items):
+                return nodes, resp["StateInfo"]
+            state_info = resp["StateInfo"]
+
+    def _criteria(self, select_by="Name", device_class="Any", status="Any", model=RISPORT["all_models"],
+                  node_name=None, protocol="Any", download_status="Any"):
+        return {
+            "MaxReturnedDevices": self._max_devices,
+            "DeviceClass": device_class,
+            "Model": model,
+            "Status": status,
+            "NodeName": node_name,
+            "SelectBy": select_by,
+            "Protocol": protocol,
+            "DownloadStatus": download_status
+        }
+
+    def _batches(self, items):
+        """Split unique items into batches of max_devices"""
+        items = list(OrderedDict.fromkeys(items))
+        return [items[i:i + self._max_devices] for i in range(0, len(items), self._max_devices)]
+
+    def iter_cm_devices(self, items, select_by="Name", device_class="Any", status="Any",
+                        model=RISPORT["all_models"], node_name=None, protocol="Any", download_status="Any"):
+        """Generator of real-time device information, queried in batches of max_devices items
+
+        Devices registered to, or having registered to, several nodes are merged to a single entry, preferring
+        the registered entry, else the latest.  The entry's node is added as 'NodeName'.
+
+        :param items: iterable of items to select by, e.g. device names.  Supports '*' wildcards.
+        :param select_by: (str) one of RISPORT["type"]
+        :param device_class: (str) one of RISPORT["class"]
+        :param status: (str) one of RISPORT["status"]
+        :param model: (int) device model enum.  Defaults to all models.
+        :param node_name: (str) restrict to devices on a node
+        :param protocol: (str) device protocol, e.g. 'SIP' or 'SCCP'
+        :param download_status: (str) firmware download status
+        :return: generator of device OrderedDicts
+        """
+        criteria = self._criteria(select_by=select_by, device_class=device_class, status=status, model=model,
+                                  node_name=node_name, protocol=protocol, download_status=download_status)
+        for batch in self._batches(items):
+            nodes, _ = self._select_batch(batch, criteria)
+            yield from merge_ris_nodes(nodes).values()
+
+    def select_cm_devices(self, items, **kwargs):
+        """Real-time device information for any number of devices.  See iter_cm_devices for parameters.
+
+        Devices not found, e.g. never registered since the last node restart, are omitted.
+
+        :param items: iterable of items to select by, e.g. device names
+        :return: OrderedDict of device name to device OrderedDict
+        """
+        return OrderedDict((device["Name"], device) for device in self.iter_cm_devices(items, **kwargs))
+
+    def monitor(self, items, fields=RISPORT["monitor_fields"], **criteria):
+        """Registration monitor emitting only device state transitions.  See monitor.RegistrationMonitor.
+
+        :param items: iterable of items to select by, e.g. device names
+        :param fields: device fields to emit transitions for
+        :param criteria: iter_cm_devices selection criteria, e.g. device_class="Phone"
+        :return: RegistrationMonitor
+        """
+        return RegistrationMonitor(self, items, fields=fields, **criteria)
@@ -0,0 +1,359 @@
+"""Pre-compiled WSDL/XSD schema bundles
+
+Parsing the AXL schema through python-zeep takes seconds per process.  A schema bundle is the
+fully parsed and resolved zeep WSDL Document serialized to disk, alongside a fingerprint of the
+source schema files and the zeep and Python versions used to build it.  Bundles are rejected and
+the WSDL parsed as normal if the fingerprint no longer matches.
+
+Bundles are built per schema directory, e.g.::
+
+    cucm-schema-bundle schema/12.5 schema/current
+
+Note:
+Bundles are pickles and can execute code when loaded, so they are never loaded implicitly - connectors only load a
+bundle from a path explicitly given by the caller, which must be a trusted location.  The fingerprint is a JSON
+header, so stale bundles are rejected without unpickling.  Building bundles requires Python 3.8+.
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import logging
+import pickle
+import platform
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+import zeep
+from lxml import etree
+from zeep.settings import Settings
+from zeep.transports import Transport
+from zeep.wsdl import Document
+from zeep.xsd.elements.element import Element
+from zeep.xsd.elements.indicators import Sequence
+
+from ._internal_utils import get_choices
+from .helpers import freeze_model
+from .helpers import get_model_dict
+from .helpers import sanitize_model_dict
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_SUFFIX = ".bundle"
+RECURSION_LIMIT = 20000
+
+# zeep creates xsd type classes dynamically while visiting the schema, and value classes lazily per type
+_DYNAMIC_MODULES = ("zeep.xsd.dynamic_types", "zeep.objects")
+_DICT_VIEWS = tuple(type(view) for view in ({}.keys(), {}.values(), {}.items()))
+_TRANSPORT_ID = "transport"
+_SETTINGS_ID = "settings"
+
+
+def _rebuild_type(name, bases, namespace):
+    """Re-create a dynamically generated zeep type class"""
+    return type(name, bases, namespace)
+
+
+class _SchemaPickler(pickle.Pickler):
+    """Pickler for zeep Documents
+
+    Connection-specific objects are stored as persistent references and re-bound on load.
+    """
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Transport):
+            return _TRANSPORT_ID
+        if isinstance(obj, Settings):
+            return _SETTINGS_ID
+        return None
+
+    def reducer_override(self, obj):
+        if isinstance(obj, type):
+            if obj.__module__ in _DYNAMIC_MODULES:
+                namespace = {k: v for k, v in vars(obj).items() if k not in ("__dict__", "__weakref__")}
+                return _rebuild_type, (obj.__name__, obj.__bases__, namespace)
+            return NotImplemented
+        if isinstance(obj, _DICT_VIEWS):
+            return list, (list(obj),)
+        if isinstance(obj, etree.QName):
+            return etree.QName, (obj.text,)
+        if isinstance(obj, etree._Element):
+            return etree.fromstring, (etree.tostring(obj),)
+        return NotImplemented
+
+
+class _SchemaUnpickler(pickle.Unpickler):
+    """Unpickler re-binding a bundled zeep Document to a connector's transport and settings"""
+
+    def __init__(self, file, transport, settings):
+        super().__init__(file)
+        self._persistent = {
+            _TRANSPORT_ID: transport,
+            _SETTINGS_ID: settings
+        }
+
+    def persistent_load(self, pid):
+        return self._persistent[pid]
+
+
+@contextmanager
+def _bulk_objects():
+    """Suspend garbage collection and raise the recursion limit for (de)serializing large object graphs"""
+    gc_enabled = gc.isenabled()
+    recursion_limit = sys.getrecursionlimit()
+    gc.disable()
+    sys.setrecursionlimit(max(recursion_limit, RECURSION_LIMIT))
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+        if gc_enabled:
+            gc.enable()
+
+
+def wsdl_path(wsdl):
+    """Local filesystem path for a WSDL location, if it is local
+
+    :param wsdl: WSDL location - path, or 'file://' url
+    :return: (Path) resolved path, or None for remote WSDLs
+    """
+    if not wsdl:
+        return None
+    location = str(wsdl)
+    if location.startswith("file://"):
+        location = location[len("file://"):]
+    elif "://" in location:
+        return None
+    path = Path(location)
+    return path.resolve() if path.is_file() else None
+
+
+def bundle_path(wsdl):
+    """Conventional bundle location for a local WSDL, i.e. alongside the WSDL in its schema directory"""
+    path = wsdl_path(wsdl)
+    return path.with_suffix(BUNDLE_SUFFIX) if path else None
+
+
+def schema_fingerprint(wsdl=None):
+    """Fingerprint the runtime and, for a local WSDL, the content of the WSDL and its schema directory
+
+    :param wsdl: WSDL location
+    :return: (dict) 'runtime' and 'source' hex digests.  'source' is None for remote WSDLs.
+    """
+    runtime = f"{zeep.__version__}:{platform.python_implementation()}:{sys.version_info[:2]}"
+    fingerprint = {
+        "runtime": hashlib.sha1(runtime.encode()).hexdigest(),
+        "source": None
+    }
+    path = wsdl_path(wsdl)
+    if path:
+        digest = hashlib.sha1()
+        for source in [path] + sorted(path.parent.glob("*.xsd")):
+            digest.update(source.name.encode())
+            digest.update(source.read_bytes())
+        fingerprint["source"] = digest.hexdigest()
+    return fingerprint
+
+
+def build_schema_bundle(wsdl, destination=None):
+    """Parse a local WSDL and write the resolved zeep Document to a schema bundle
+
+    :param wsdl: local WSDL location
+    :param destination: bundle path.  Defaults to the WSDL path with a '.bundle' suffix.
+    :return: (Path) bundle path
+    """
+    path = wsdl_path(wsdl)
+    if not path:
+        raise ValueError(f"Schema bundles require a local WSDL file: {wsdl}")
+    destination = Path(destination) if destination else bundle_path(path)
+    document = Document(str(path), Transport(cache=None), settings=Settings())
+    with _bulk_objects(), open(destination, "wb") as _:
+        _.write(json.dumps(schema_fingerprint(path)).encode() + b"\n")
+        _SchemaPickler(_, protocol=pickle.HIGHEST_PROTOCOL).dump(document)
+    return destination
+
+
+def load_schema_bundle(wsdl, transport, settings, bundle):
+    """Load a pre-compiled zeep Document for a WSDL from a trusted bundle path, if the bundle is current
+
+    :param wsdl: WSDL location
+    :param transport: zeep Transport to bind the Document to
+    :param settings: zeep Settings to bind the Document to
+    :param bundle: trusted bundle path.  Bundles for remote WSDLs are only checked against the zeep and Python
+    versions.
+    :return: zeep Document, or None if the bundle is missing or stale
+    """
+    path = Path(bundle)
+    if not path.is_file():
+        logger.warning(f"Schema bundle not found: {path}")
+        return None
+    with _bulk_objects(), open(path, "rb") as _:
+        try:
+            built, current = json.loads(_.readline()), schema_fingerprint(wsdl)
+            if built["runtime"] != current["runtime"] or current["source"] not in (None, built["source"]):
+                logger.warning(f"Ignoring stale schema bundle: {path}")
+                return None
+            return _SchemaUnpickler(_, transport, settings).load()
+        except (ValueError, pickle.UnpicklingError, AttributeError, EOFError, ImportError, KeyError,
+                TypeError) as error:
+            logger.warning(f"Ignoring unreadable schema bundle {path}: {error}")
+            return None
+
+
+def _to_tuples(obj):
+    """Restore nested identifier tuples from their JSON list representation"""
+    return tuple(_to_tuples(_) for _ in obj) if isinstance(obj, list) else obj
+
+
+class SchemaIndex(object):
+    """Per-connector index of schema-derived API metadata
+
+    Search criteria, model and returnedTags templates and identifier choices are resolved from the zeep type
+    tree on first use per API, after which lookups do no schema traversal.  The index can be saved to disk and
+    re-loaded by later connectors for the same schema.
+
+    Note:
+    Templates are shared across calls and are returned frozen.  Use thaw() for a mutable copy.
+    """
+
+    def __init__(self, connector, path=None):
+        self._connector = connector
+        self._entries = {}
+        self._lock = threading.Lock()
+        if path and Path(path).is_file():
+            self.load(path)
+
+    def _get_type(self, obj_name):
+        return self._connector.client.get_type(f'ns0:{obj_name}')
+
+    def _lookup(self, api, field, build):
+        """Get an API's indexed field, resolving it from the schema on first use"""
+        entry = self._entries.get(api.__class__.__name__)
+        if entry is None or field not in entry:
+            with self._lock:
+                entry = self._entries.setdefault(api.__class__.__name__, {})
+                if field not in entry:
+                    entry[field] = build(api)
+        return entry[field]
+
+    def search_criteria(self, api):
+        """Supported 'list' search criteria names for an API, in schema order"""
+        return self._lookup(api, "search_criteria", lambda _: freeze_model([
+            element[0] for element in self._get_type(_._list_method_name).elements[0][1].type.elements
+        ]))
+
+    def list_returned_tags(self, api):
+        """Complete 'list' returnedTags template for an API"""
+        return self._lookup(api, "list_returned_tags", lambda _: freeze_model(
+            get_model_dict(self._get_type(_._list_model_name))
+        ))
+
+    def get_returned_tags(self, api):
+        """Complete 'get' returnedTags template for an API"""
+        return self._lookup(api, "get_returned_tags", lambda _: freeze_model(
+            get_model_dict(self._get_type(_._get_model_name))
+        ))
+
+    def add_model(self, api, sanitized=True, include_types=False):
+        """Empty 'add' model template for an API
+
+        :param api: API wrapper instance
+        :param sanitized: collapse nested '_value_1' and 'uuid' dicts into simple k,v pairs
+        :param include_types: (bool) use the AXL type name of each attr as its value
+        :return: (FrozenModelDict) model template
+        """
+        def build(_):
+            model = get_model_dict(self._get_type(_._add_model_name), include_types=include_types)
+            return freeze_model(sanitize_model_dict(model) if sanitized else model)
+
+        return self._lookup(api, f"add_model:{sanitized}:{include_types}", build)
+
+    def identifiers(self, api):
+        """Nested tuple of the identifier choices accepted by an API's 'get' method
+
+        Empty for APIs whose 'get' takes no identifiers, e.g. LdapSystem.
+        """
+        def build(_):
+            elements = self._get_type(_._get_method_name).elements_nested
+            if not elements:
+                return ()
+            first = elements[0][1][0]
+            if isinstance(first, Element):
+                # a single required identifier, rather than a choice
+                return () if first.name == "returnedTags" else (first.name,)
+            if isinstance(first, Sequence):
+                return (get_choices(first),)
+            return get_choices(first)
+
+        return self._lookup(api, "identifiers", build)
+
+    def build(self, apis):
+        """Eagerly index all supported fields for the given APIs, e.g. prior to saving
+
+        :param apis: iterable of API wrapper instances
+        :return: None
+        """
+        for api in apis:
+            if "list" in api.supported_methods:
+                self.search_criteria(api)
+                self.list_returned_tags(api)
+            if "get" in api.supported_methods:
+                self.get_returned_tags(api)
+                self.identifiers(api)
+            if "model" in api.supported_methods:
+                self.add_model(api)
+
+    def save(self, path):
+        """Write the index to disk as JSON, fingerprinted against the connector's schema
+
+        :param path: (str or Path) destination
+        :return: None
+        """
+        fingerprint = schema_fingerprint(self._connector.wsdl)
+        if fingerprint["source"] is None:
+            raise ValueError(f"Schema indexes require a local WSDL file: {self._connector.wsdl}")
+        with open(path, "w") as _:
+            json.dump({"fingerprint": fingerprint, "entries": self._entries}, _)
+
+    def load(self, path):
+        """Merge a saved index into this index, provided it was built from the same schema.
+
+        Indexes are only loaded for local WSDLs, as a remote schema cannot be checked for changes.
+
+        :param path: (str or Path) saved index
+        :return: (bool) True if loaded
+        """
+        with open(path) as _:
+            saved = json.load(_, object_pairs_hook=OrderedDict)
+        current = schema_fingerprint(self._connector.wsdl)
+        if current["source"] is None:
+            logger.warning(f"Ignoring schema index {path} for remote WSDL: {self._connector.wsdl}")
+            return False
+        if saved["fingerprint"] != current:
+            logger.warning(f"Ignoring stale schema index: {path}")
+            return False
+        for name, entry in saved["entries"].items():
+            for field, value in entry.items():
+                entry[field] = _to_tuples(value) if field == "identifiers" else freeze_model(value)
+            self._entries.setdefault(name, {}).update(entry)
+        return True
+
+
+def main(argv=None):
+    """Build schema bundles for one or more schema directories"""
+    parser = argparse.ArgumentParser(description="Build pre-compiled AXL schema bundles")
+    parser.add_argument("schema_dirs", nargs="+", type=Path, help="schema/<version> directories")
+    parser.add_argument("--wsdl", default="AXLAPI.wsdl", help="WSDL file name within each schema directory")
+    args = parser.parse_args(argv)
+    for schema_dir in args.schema_dirs:
+        print(build_schema_bundle(schema_dir / args.wsdl))
+
+
+if __name__ == "__main__":
+    # run from the package module so that pickled references resolve to 'ciscocucmapi.schema', not '__main__'
+    from ciscocucmapi import schema
+    schema.main()
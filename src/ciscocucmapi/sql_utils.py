@@ -1,77 +1,356 @@
 """Useful SQL query utils for specific UC System Administration tasks"""
 
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from .definitions import AXL
+from .definitions import RESOLVER
+from .exceptions import IllegalSQLStatement
 from .helpers import extract_pkid_from_uuid
 
+SQLRowResult = namedtuple("SQLRowResult", ["values", "success", "error"])
+
+# quoted string literals are matched so that ':name' within them is not taken as a parameter, nor '::' casts
+_SQL_PARAMETER = re.compile(r"'(?:[^']|'')*'|(?<!:):([A-Za-z_]\w*)")
+
+
+def sql_literal(value):
+    """Render a value as an Informix SQL literal
+
+    :param value: str, int, float, bool or None, or a list, tuple or set of these for 'IN' clauses
+    :return: (str) SQL literal
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "'t'" if value else "'f'"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        # 'IN (NULL)' matches no rows, whereas 'IN ()' is a syntax error
+        return f"({', '.join(sql_literal(_) for _ in value) or 'NULL'})"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+@lru_cache(maxsize=256)
+def compile_sql(template):
+    """Split a SQL template into literal text and parameter names.  Templates are cached once compiled.
+
+    :param template: SQL statement with ':name' parameters
+    :return: tuple of alternating literal text and parameter names, starting and ending with text
+    """
+    parts, position = [], 0
+    for match in _SQL_PARAMETER.finditer(template):
+        if match.group(1):
+            parts.extend((template[position:match.start()], match.group(1)))
+            position = match.end()
+    parts.append(template[position:])
+    return tuple(parts)
+
+
+def render_sql(template, **params):
+    """Render a SQL template with safely escaped parameter values
+
+    Example:
+
+    render_sql("select pkid from device where name in :names and tkclass = :tkclass", names=names, tkclass=1)
+
+    :param template: SQL statement with ':name' parameters
+    :param params: parameter values.  Lists, tuples and sets render as parenthesised 'IN' lists.
+    :return: (str) SQL statement
+    """
+    parts = compile_sql(template)
+    try:
+        rendered = [parts[0]]
+        for i in range(1, len(parts), 2):
+            rendered.extend((sql_literal(params[parts[i]]), parts[i + 1]))
+    except KeyError as error:
+        raise ValueError(f"Missing SQL parameter {error} for template: {template}")
+    return "".join(rendered)
+
+
+def render_sql_chunks(template, param, values, chunk_size=RESOLVER["in_list_size"], **params):
+    """Render a SQL template once per chunk of an 'IN' list parameter
+
+    :param template: SQL statement with ':name' parameters
+    :param param: name of the 'IN' list parameter
+    :param values: iterable of 'IN' list values
+    :param chunk_size: (int) max values per statement
+    :param params: other parameter values
+    :return: generator of (str) SQL statements
+    """
+    values = list(values)
+    for i in range(0, len(values), chunk_size):
+        params[param] = values[i:i + chunk_size]
+        yield render_sql(template, **params)
+
+
+def query_chunks(axl_connector, template, param, values, chunk_size=RESOLVER["in_list_size"], **params):
+    """Execute a SQL query for many 'IN' list values in chunked statements
+
+    :param axl_connector: (UCMAXLConnector) axl connector
+    :param template: SQL select statement with ':name' parameters, without SKIP or FIRST
+    :param param: name of the 'IN' list parameter
+    :param values: iterable of 'IN' list values
+    :param chunk_size: (int) max values per statement
+    :param params: other parameter values
+    :return: generator of OrderedDict rows
+    """
+    for sql_statement in render_sql_chunks(template, param, values, chunk_size=chunk_size, **params):
+        yield from axl_connector.sql.query_iter(sql_statement)
+
+
+class SQLInsertBatch(object):
+    """Batch writer for Thin AXL inserts, e.g. association tables
+
+    Rows are collected with add() and written on flush(), either as multi-row INSERT ... SELECT statements
+    no larger than a maximum statement size, or as single-row statements executed in parallel.  If a multi-row
+    statement fails, its rows are retried individually so that failures are reported per row.
+
+    Example:
+
+    batch = SQLInsertBatch(axl, "enduserdirgroupmap", ("fkenduser", "fkdirgroup"))
+    for enduser_pkid in enduser_pkids:
+        batch.add(enduser_pkid, dirgroup_pkid)
+    failed = [result for result in batch.flush() if not result.success]
+    """
+
+    def __init__(self, axl_connector, table, columns, max_statement_size=AXL["sql_max_statement_size"],
+                 parallel=False, workers=None):
+        """Create a batch writer for a table
+
+        :param axl_connector: (UCMAXLConnector) axl connector
+        :param table: (str) table name
+        :param columns: (tuple) column names of added rows
+        :param max_statement_size: (int) max characters per multi-row statement
+        :param parallel: (bool) write single-row statements in parallel rather than multi-row statements
+        :param workers: (int) concurrent statements.  Defaults to, and is capped by, the connector's max_concurrency.
+        """
+        self.axl_connector = axl_connector
+        self.table = table
+        self.columns = tuple(columns)
+        self.max_statement_size = max_statement_size
+        self.parallel = parallel
+        self.workers = min(workers or axl_connector.max_concurrency, axl_connector.max_concurrency)
+        self._rows = []
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, *values):
+        """Add a row to the batch
+
+        :param values: column values, in column order
+        :return: None
+        """
+        if len(values) != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} values for columns {self.columns}, got {len(values)}")
+        self._rows.append(values)
+
+    def _insert_values(self, values):
+        return f"insert into {self.table} ({', '.join(self.columns)}) values {sql_literal(values)}"
+
+    def _select_values(self, values, aliased=False):
+        literals = (sql_literal(value) for value in values)
+        if aliased:
+            literals = (f"{literal} {column}" for literal, column in zip(literals, self.columns))
+        return f"select {', '.join(literals)} from systables where tabid = 1"
+
+    def _statements(self, rows):
+        """Split rows into multi-row statements within the max statement size
+
+        :param rows: list of row values
+        :return: list of (statement, rows) tuples
+        """
+        prefix = f"insert into {self.table} ({', '.join(self.columns)}) select {', '.join(self.columns)} from ("
+        suffix = ") batch"
+        statements, selects, batch_rows = [], [], []
+        size = len(prefix) + len(suffix)
+        for values in rows:
+            select = self._select_values(values, aliased=not selects)
+            if selects and size + len(select) + len(" union all ") > self.max_statement_size:
+                statements.append((prefix + " union all ".join(selects) + suffix, batch_rows))
+                select = self._select_values(values, aliased=True)
+                selects, batch_rows, size = [], [], len(prefix) + len(suffix)
+            selects.append(select)
+            batch_rows.append(values)
+            size += len(select) + len(" union all ")
+        if selects:
+            statements.append((prefix + " union all ".join(selects) + suffix, batch_rows))
+        return statements
+
+    def _write_row(self, values):
+        try:
+            self.axl_connector.sql.update(self._insert_values(values))
+            return SQLRowResult(values, True, None)
+        except IllegalSQLStatement as error:
+            return SQLRowResult(values, False, error)
+
+    def _write_statement(self, statement_rows):
+        statement, rows = statement_rows
+        if len(rows) == 1:
+            return [self._write_row(rows[0])]
+        try:
+            self.axl_connector.sql.update(statement)
+            return [SQLRowResult(values, True, None) for values in rows]
+        except IllegalSQLStatement:
+            return [self._write_row(values) for values in rows]
+
+    def flush(self):
+        """Write all added rows
+
+        :return: list of SQLRowResult, in the order rows were added
+        """
+        rows, self._rows = self._rows, []
+        if not rows:
+            return []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            if self.parallel:
+                return list(executor.map(self._write_row, rows))
+            statement_results = executor.map(self._write_statement, self._statements(rows))
+            return [result for results in statement_results for result in results]
+
 
 def get_device_pkid(axl_connector, device_name):
-    """Get a device pkid from the device name"""
-    sql_statement = f"select pkid from device where name={device_name}"
-    return axl_connector.sql.query(sql_statement)
+    """Get a device pkid from the device name.  Resolved with any names queued on the connector's resolver.
+
+    :return: (str) pkid, or None if the device does not exist
+    """
+    return axl_connector.resolver.pkid("device", device_name)
+
+
+def get_device_pkids(axl_connector, device_names):
+    """Get device pkids for many device names in batched queries
+
+    :return: (dict) device name to pkid, with None for unknown devices
+    """
+    return axl_connector.resolver.resolve("device", device_names)
 
 
 def get_enduser_pkid(axl_connector, userid):
-    """Get an enduser pkid from the enduser userid"""
-    sql_statement = f"select pkid from enduser where userid={userid}"
-    return axl_connector.sql.query(sql_statement)
+    """Get an enduser pkid from the enduser userid.  Resolved with any userids queued on the connector's resolver.
+
+    :return: (str) pkid, or None if the enduser does not exist
+    """
+    return axl_connector.resolver.pkid("enduser", userid)
+
+
+def get_enduser_pkids(axl_connector, userids):
+    """Get enduser pkids for many userids in batched queries
+
+    :return: (dict) userid to pkid, with None for unknown endusers
+    """
+    return axl_connector.resolver.resolve("enduser", userids)
 
 
 def associate_device_to_enduser(axl_connector, enduser_pkid_or_uuid, device_pkid_or_uuid, tkuserassociation=1):
     """Insert row into enduserdevicemap table to add user/device association"""
-    enduser_pkid = extract_pkid_from_uuid(enduser_pkid_or_uuid)
-    device_pkid = extract_pkid_from_uuid(device_pkid_or_uuid)
-    sql_statement = f"insert into enduserdevicemap (fkenduser, fkdevice, defaultprofile, tkuserassociation)" \
-                    f"values ('{enduser_pkid}','{device_pkid}','f','{tkuserassociation}')"
+    sql_statement = render_sql(
+        "insert into enduserdevicemap (fkenduser, fkdevice, defaultprofile, tkuserassociation) "
+        "values (:fkenduser, :fkdevice, 'f', :tkuserassociation)",
+        fkenduser=extract_pkid_from_uuid(enduser_pkid_or_uuid),
+        fkdevice=extract_pkid_from_uuid(device_pkid_or_uuid),
+        tkuserassociation=tkuserassociation
+    )
     return axl_connector.sql.update(sql_statement)
 
 
+def associate_devices_to_endusers(axl_connector, associations, tkuserassociation=1, **kwargs):
+    """Batch insert rows into enduserdevicemap table to add user/device associations
+
+    :param axl_connector: (UCMAXLConnector) axl connector
+    :param associations: iterable of (enduser_pkid_or_uuid, device_pkid_or_uuid) tuples
+    :param tkuserassociation: (int) user association type
+    :param kwargs: SQLInsertBatch options, e.g. max_statement_size, parallel, workers
+    :return: list of SQLRowResult
+    """
+    batch = SQLInsertBatch(axl_connector, "enduserdevicemap",
+                           ("fkenduser", "fkdevice", "defaultprofile", "tkuserassociation"), **kwargs)
+    for enduser_pkid_or_uuid, device_pkid_or_uuid in associations:
+        batch.add(extract_pkid_from_uuid(enduser_pkid_or_uuid), extract_pkid_from_uuid(device_pkid_or_uuid),
+                  "f", tkuserassociation)
+    return batch.flush()
+
+
 def associate_enduser_to_user_group(axl_connector, enduser_pkid_or_uuid, dirgroup_pkid_or_uuid):
     """Insert row into enduserdirgroupmap table to add enduser/user group association"""
-    enduser_pkid = extract_pkid_from_uuid(enduser_pkid_or_uuid)
-    dirgroup_pkid = extract_pkid_from_uuid(dirgroup_pkid_or_uuid)
-    sql_statement = f"insert into enduserdirgroupmap (fkenduser, fkdirgroup) " \
-                    f"values ('{enduser_pkid}', '{dirgroup_pkid}')"
+    sql_statement = render_sql(
+        "insert into enduserdirgroupmap (fkenduser, fkdirgroup) values (:fkenduser, :fkdirgroup)",
+        fkenduser=extract_pkid_from_uuid(enduser_pkid_or_uuid),
+        fkdirgroup=extract_pkid_from_uuid(dirgroup_pkid_or_uuid)
+    )
     return axl_connector.sql.update(sql_statement)
 
 
-def get_dn_pkid(axl_connector, dnorpattern, tkpatternusage=2):
+def associate_endusers_to_user_groups(axl_connector, associations, **kwargs):
+    """Batch insert rows into enduserdirgroupmap table to add enduser/user group associations
+
+    :param axl_connector: (UCMAXLConnector) axl connector
+    :param associations: iterable of (enduser_pkid_or_uuid, dirgroup_pkid_or_uuid) tuples
+    :param kwargs: SQLInsertBatch options, e.g. max_statement_size, parallel, workers
+    :return: list of SQLRowResult
+    """
+    batch = SQLInsertBatch(axl_connector, "enduserdirgroupmap", ("fkenduser", "fkdirgroup"), **kwargs)
+    for enduser_pkid_or_uuid, dirgroup_pkid_or_uuid in associations:
+        batch.add(extract_pkid_from_uuid(enduser_pkid_or_uuid), extract_pkid_from_uuid(dirgroup_pkid_or_uuid))
+    return batch.flush()
+
+
+def get_dn_pkid(axl_connector, dnorpattern, tkpatternusage=2, route_partition=None):
     """Get dn pkid from the dnorpattern from numplan table.
 
     Note:
-        Does not ensure uniqueness as does not include join on route partition table
+        DNs are only unique within a route partition.  Without a route partition, DNs in more than one partition
+        raise AmbiguousNameError.
     :param axl_connector: (UCMAXLConnector) axl connector
     :param (str) dnorpattern: pattern or DN
     :param (int) tkpatternusage: defaults to 2 for DNs
-    :return: (str) pkid
+    :param (str) route_partition: route partition name, or '' for DNs in no partition.  Defaults to any partition.
+    :return: (str) pkid, or None if the DN does not exist
     """
-    sql_statement = f"select pkid from numplan " \
-                    f"where dnorpattern={dnorpattern} "\
-                    f"and tkpatternusage={tkpatternusage}"
-    return axl_connector.sql.query(sql_statement)
+    lookup = "dn" if tkpatternusage == 2 else f"numplan:{tkpatternusage}"
+    condition = render_sql("tkpatternusage = :usage", usage=int(tkpatternusage))
+    if route_partition is not None:
+        lookup = f"{lookup}:{route_partition}"
+        if route_partition:
+            condition += render_sql(" and fkroutepartition = (select pkid from routepartition where name = :name)",
+                                    name=route_partition)
+        else:
+            condition += " and fkroutepartition is null"
+    if lookup != "dn":
+        axl_connector.resolver.register(lookup, "numplan", "dnorpattern", condition)
+    return axl_connector.resolver.pkid(lookup, dnorpattern)
 
 
 def get_service_parameter_details(axl_connector, parameter_name):
     """Get individual service parameters tuple"""
-    sql_statement = f"select * from processconfig "  \
-                    f"where paramname = '{parameter_name}'"
+    sql_statement = render_sql("select * from processconfig where paramname = :paramname", paramname=parameter_name)
     return axl_connector.sql.query(sql_statement)
 
 
 def update_service_parameter(axl_connector, parameter_name, parameter_value):
     """Update service parameter with specified value"""
-    sql_statement = f"update processconfig " \
-                    f"set paramvalue = '{parameter_value}' " \
-                    f"where paramname = '{parameter_name}'"
+    sql_statement = render_sql("update processconfig set paramvalue = :paramvalue where paramname = :paramname",
+                               paramvalue=parameter_value, paramname=parameter_name)
     return axl_connector.sql.update(sql_statement)
 
 
 def ldap_sync(axl_connector, name=None, uuid=None):
-    """SQL-based LDAP sync fallback method for AXL versions not supporting doLdapSync"""
-    try:
-        return axl_connector.sql.update(
-            sql_statement=f"update directorypluginconfig set syncnow = '1' where name = '{name}'"
-        )
-    except TypeError:
-        name = extract_pkid_from_uuid(
-            axl_connector.ldap_directory.get(uuid=uuid, returnedTags={"name": ""})
-        )
-        return ldap_sync(axl_connector, name=name)
+    """SQL-based LDAP sync fallback method for AXL versions not supporting doLdapSync
+
+    :param name: LDAP directory name
+    :param uuid: LDAP directory uuid or pkid, if no name is given
+    :return: executeSQLUpdate result
+    :raises ValueError: if neither a name nor the uuid of an existing LDAP directory is given
+    """
+    if name is None:
+        if uuid is None:
+            raise ValueError("Requires one of 'name' or 'uuid'")
+        name = axl_connector.resolver.name("ldap_directory", uuid)
+        if name is None:
+            raise ValueError(f"No LDAP directory with uuid '{uuid}'")
+    return axl_connector.sql.update(
+        sql_statement=render_sql("update directorypluginconfig set syncnow = '1' where name = :name", name=name)
+    )
@@ -0,0 +1,183 @@
+"""Incremental AXL change tracking using the listChange change notification queue"""
+
+import json
+import time
+from collections import OrderedDict
+
+from zeep.exceptions import Fault
+
+from .definitions import AXL
+from .helpers import extract_pkid_from_uuid
+
+
+def _axl_bool(value):
+    """AXL booleans are returned as strings, e.g. 'true' or 't'"""
+    return str(value).lower() in ("t", "true", "1")
+
+
+def _snapshot_key(uuid):
+    """Normalize AXL uuids for snapshot keys, as braces and case differ between list and change responses"""
+    return extract_pkid_from_uuid(uuid).lower()
+
+
+class ChangeFeed(object):
+    """Local snapshot of AXL objects kept current from the listChange queue
+
+    The first sync lists every tracked object.  Subsequent syncs poll listChange from the last change id and apply
+    only the queued changes to the snapshot: removals are dropped, changed tags are updated in place, and objects
+    are re-fetched where AXL flags that the change cannot be described by tags alone.  A full resync is performed
+    whenever changes may have been lost, i.e. the queue was reset or has overflowed past the last change id.
+
+    Example:
+
+    feed = axl.change_feed(["phone", "line", "user"])
+    feed.sync()  # full sync
+    ...
+    applied = feed.sync()  # deltas only
+    phones = feed.snapshot["Phone"]
+    """
+
+    def __init__(self, connector, apis, returnedTags=None):
+        """Track API endpoint objects for a connector
+
+        :param connector: UCMAXLConnector
+        :param apis: iterable of connector API attribute names, e.g. ["phone", "line"]
+        :param returnedTags: (dict) returnedTags per API attribute name.  Defaults to the full list model.
+        """
+        self.connector = connector
+        returnedTags = returnedTags or {}
+        # AXL change types are named after the AXL object, as are the API wrapper classes
+        self._apis = OrderedDict((getattr(connector, name).__class__.__name__, getattr(connector, name))
+                                 for name in apis)
+        self._returned_tags = {getattr(connector, name).__class__.__name__: tags
+                               for name, tags in returnedTags.items()}
+        self.snapshot = {change_type: {} for change_type in self._apis}
+        self.queue_id = None
+        self.next_change_id = None
+        self.last_sync = None
+        self.last_full_sync = None
+
+    def _list_changes(self, startChangeId=None):
+        return self.connector.change.list(startChangeId=startChangeId, queueId=self.queue_id,
+                                          objectList=list(self._apis))
+
+    def _fetch(self, change_type, uuid):
+        api = self._apis[change_type]
+        return api.get(uuid=uuid, returnedTags=self._returned_tags.get(change_type))
+
+    def resync(self):
+        """Rebuild the snapshot from a full list of all tracked objects
+
+        The queue position is taken before listing, so changes made while listing are re-applied by the next sync.
+
+        :return: None
+        """
+        queue_info = self._list_changes()["queueInfo"]
+        snapshot = {}
+        for change_type, api in self._apis.items():
+            snapshot[change_type] = {
+                _snapshot_key(obj["uuid"]): obj
+                for obj in api.iter_list(returnedTags=self._returned_tags.get(change_type))
+            }
+        self.snapshot = snapshot
+        self.queue_id = queue_info["queueId"]
+        self.next_change_id = queue_info["nextStartChangeId"]
+        self.last_sync = self.last_full_sync = time.time()
+
+    def _overflowed(self, queue_info):
+        """Changes may have been lost if the queue was reset, or has dropped changes past the last change id"""
+        return queue_info["queueId"] != self.queue_id or \
+            (queue_info["firstChangeId"] is not None and self.next_change_id < queue_info["firstChangeId"])
+
+    def _apply(self, change):
+        """Apply a single change to the snapshot"""
+        objects = self.snapshot[change["type"]]
+        uuid = _snapshot_key(change["uuid"])
+        if change["action"] == "r":
+            objects.pop(uuid, None)
+        elif _axl_bool(change["doGet"]) or uuid not in objects:
+            try:
+                objects[uuid] = self._fetch(change["type"], change["uuid"])
+            except Fault as fault:
+                # removed after the change was queued, e.g. added and removed between syncs
+                if AXL["not_found_fault"] not in (fault.message or "").lower():
+                    raise
+                objects.pop(uuid, None)
+        else:
+            changed_tags = (change["changedTags"] or {}).get("changedTag") or []
+            # Data Model membership tests raise on unknown attributes, so compare against the keys
+            tracked = set(objects[uuid])
+            for tag in changed_tags:
+                if tag["name"] in tracked:
+                    objects[uuid][tag["name"]] = tag["_value_1"]
+
+    def sync(self):
+        """Bring the snapshot up to date, applying only queued changes where possible
+
+        :return: list of applied changes, or None if a full resync was performed
+        """
+        if self.queue_id is None:
+            self.resync()
+            return None
+        applied = []
+        while True:
+            try:
+                response = self._list_changes(startChangeId=self.next_change_id)
+            except Fault:
+                # start change ids outside of the queue are rejected
+                self.resync()
+                return None
+            queue_info = response["queueInfo"]
+            if self._overflowed(queue_info):
+                self.resync()
+                return None
+            changes = (response["changes"] or {}).get("change") or []
+            for change in changes:
+                if change["type"] in self.snapshot:
+                    self._apply(change)
+                    applied.append(change)
+            last_page = not changes or queue_info["nextStartChangeId"] == self.next_change_id
+            # applied pages are not replayed if a later page fails
+            self.next_change_id = queue_info["nextStartChangeId"]
+            if last_page:
+                break
+        self.last_sync = time.time()
+        return applied
+
+    def save(self, path):
+        """Write the snapshot and queue position to disk as JSON, for incremental syncs across runs
+
+        :param path: (str or Path) destination
+        :return: None
+        """
+        state = {
+            "queueId": self.queue_id,
+            "nextStartChangeId": self.next_change_id,
+            "lastSync": self.last_sync,
+            "lastFullSync": self.last_full_sync,
+            "snapshot": {change_type: {uuid: dict(obj) for uuid, obj in objects.items()}
+                         for change_type, objects in self.snapshot.items()}
+        }
+        with open(path, "w") as _:
+            json.dump(state, _)
+
+    def load(self, path):
+        """Restore a saved snapshot and queue position.  State saved for other API types is ignored.
+
+        :param path: (str or Path) saved state
+        :return: (bool) True if loaded
+        """
+        with open(path) as _:
+            state = json.load(_, object_pairs_hook=OrderedDict)
+        if set(state["snapshot"]) != set(self._apis):
+            return False
+        self.snapshot = {
+            change_type: {uuid: self._apis[change_type].object_factory(change_type, obj)
+                          for uuid, obj in objects.items()}
+            for change_type, objects in state["snapshot"].items()
+        }
+        self.queue_id = state["queueId"]
+        self.next_change_id = state["nextStartChangeId"]
+        self.last_sync = state["lastSync"]
+        self.last_full_sync = state["lastFullSync"]
+        return True
@@ -0,0 +1,229 @@
+"""Adaptive request throttling for UC SOAP services"""
+
+import functools
+import random
+import threading
+import time
+from collections import deque
+
+from zeep.exceptions import Fault
+from zeep.exceptions import TransportError
+
+from .definitions import THROTTLE
+
+
+def is_throttle_error(error):
+    """Check if an error is the cluster pushing back on load, rather than a request error
+
+    :param error: exception raised by a SOAP call
+    :return: (bool) True for HTTP 503s and overload faults
+    """
+    if isinstance(error, TransportError):
+        return error.status_code in THROTTLE["status_codes"]
+    if isinstance(error, Fault):
+        return any(fault in (error.message or "") for fault in THROTTLE["faults"])
+    return False
+
+
+class AIMDThrottle(object):
+    """Concurrency limit adapting to cluster load by additive increase, multiplicative decrease (AIMD)
+
+    Each successful request raises the concurrency limit by 1/limit, i.e. by one request per round of requests,
+    up to the connector's max_concurrency.  Throttle responses cut the limit by the decrease factor, at most once
+    per average round trip, as requests already in flight will be rejected too.  Throttled idempotent requests
+    are retried after an exponential backoff; other requests raise the throttle error.  Other errors, e.g. invalid
+    requests, say nothing about cluster load and leave the limit, latency and rate unchanged.
+    """
+
+    def __init__(self, max_limit, min_limit=1, decrease_factor=THROTTLE["decrease_factor"],
+                 retries=THROTTLE["retries"], backoff=THROTTLE["backoff"], max_backoff=THROTTLE["max_backoff"],
+                 rate_window=THROTTLE["rate_window"]):
+        """Create a throttle
+
+        :param max_limit: (int) max concurrent requests
+        :param min_limit: (int) min concurrent requests
+        :param decrease_factor: (float) limit multiplier on throttle responses
+        :param retries: (int) max retries of throttled idempotent requests
+        :param backoff: (float) initial retry backoff in seconds, doubled per retry
+        :param max_backoff: (float) max retry backoff in seconds
+        :param rate_window: (float) seconds over which the request rate is measured
+        """
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.decrease_factor = decrease_factor
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rate_window = rate_window
+        self.limit = float(max_limit)
+        self.throttled = 0
+        self._in_flight = 0
+        self._latency = None
+        self._last_decrease = 0.0
+        self._completed = deque()
+        self._condition = threading.Condition()
+
+    @property
+    def in_flight(self):
+        """Requests currently in flight"""
+        return self._in_flight
+
+    @property
+    def latency(self):
+        """Moving average latency of successful requests in seconds, or None before any complete"""
+        return self._latency
+
+    @property
+    def rate(self):
+        """Successful requests per second over the rate window"""
+        with self._condition:
+            self._trim(time.monotonic())
+            return len(self._completed) / self.rate_window
+
+    def _trim(self, now):
+        while self._completed and self._completed[0] < now - self.rate_window:
+            self._completed.popleft()
+
+    def _acquire(self):
+        with self._condition:
+            while self._in_flight >= max(int(self.limit), self.min_limit):
+                self._condition.wait()
+            self._in_flight += 1
+        return time.monotonic()
+
+    def _release(self, started, throttled, failed=False):
+        now = time.monotonic()
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                if now - self._last_decrease > (self._latency or 0):
+                    self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+                    self._last_decrease = now
+            elif not failed:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+                latency = now - started
+                self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+                self._completed.append(now)
+                self._trim(now)
+            self._condition.notify_all()
+
+    def call(self, operation_name, operation, *args, **kwargs):
+        """Call a SOAP operation within the throttle
+
+        :param operation_name: (str) operation name, used to determine if the operation is idempotent
+        :param operation: callable SOAP operation
+        :return: operation response
+        """
+        idempotent = operation_name.startswith(THROTTLE["idempotent_prefixes"])
+        attempt = 0
+        while True:
+            started = self._acquire()
+            throttled = failed = False
+            try:
+                return operation(*args, **kwargs)
+            except BaseException as error:
+                throttled = is_throttle_error(error)
+                failed = not throttled
+                if not (throttled and idempotent and attempt < self.retries):
+                    raise
+            finally:
+                self._release(started, throttled, failed)
+            time.sleep(min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0))
+            attempt += 1
+
+    def stats(self):
+        """Current throttle state
+
+        :return: (dict) limit, in_flight, latency, rate and throttled count
+        """
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "latency": self.latency,
+            "rate": self.rate,
+            "throttled": self.throttled
+        }
+
+
+class ThrottledService(object):
+    """zeep service proxy wrapper calling all operations through a throttle"""
+
+    def __init__(self, service, throttle):
+        self._service = service
+        self._throttle = throttle
+
+    def __getattr__(self, name):
+        operation = functools.partial(self._throttle.call, name, getattr(self._service, name))
+        self.__dict__[name] = operation
+        return operation
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+
+class RequestQuota(object):
+    """Sliding window request quota, e.g. the per-minute limits of the UCM serviceability APIs
+
+    Callers block until a request is allowed, so that quota faults are avoided rather than retried.
+    """
+
+    def __init__(self, requests, period=60.0, fault=None, retries=0):
+        """Create a quota
+
+        :param requests: (int) requests allowed per period
+        :param period: (float) quota period in seconds
+        :param fault: (str) fault message text of requests exceeding the quota
+        :param retries: (int) max retries of requests faulted for exceeding the quota, e.g. due to other clients
+        """
+        self.requests = requests
+        self.period = period
+        self.fault = fault
+        self.retries = retries
+        self._sent = deque()
+        self._lock = threading.Lock()
+
+    def wait_time(self):
+        """Seconds until the next request is allowed"""
+        with self._lock:
+            return self._wait_time(time.monotonic())
+
+    def _wait_time(self, now):
+        while self._sent and self._sent[0] <= now - self.period:
+            self._sent.popleft()
+        if len(self._sent) < self.requests:
+            return 0.0
+        return self._sent[0] + self.period - now
+
+    def acquire(self):
+        """Block until a request is allowed, and count it against the quota"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._wait_time(now)
+                if not wait:
+                    self._sent.append(now)
+                    return
+            time.sleep(wait)
+
+    def exhaust(self):
+        """Mark the quota as used up for a full period, e.g. on a quota fault caused by other clients"""
+        with self._lock:
+            self._sent = deque([time.monotonic()] * self.requests)
+
+    def call(self, operation, *args, **kwargs):
+        """Call a SOAP operation within the quota, waiting out and retrying quota faults
+
+        :param operation: callable SOAP operation
+        :return: operation response
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                return operation(*args, **kwargs)
+            except Fault as fault:
+                if not self.fault or self.fault not in (fault.message or "") or attempt >= self.retries:
+                    raise
+                self.exhaust()
+                attempt += 1
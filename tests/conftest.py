@@ -0,0 +1,154 @@
+import re
+import threading
+from collections import OrderedDict
+from fnmatch import fnmatch
+from pathlib import Path
+
+import pytest
+from lxml import etree
+from zeep.cache import InMemoryCache
+from zeep.exceptions import Fault
+
+from ciscocucmapi import UCMAXLConnector
+
+WSDL = (Path(__file__).parent.parent / "schema" / "current" / "AXLAPI.wsdl").as_uri()
+
+
+def plain_factory(model, axl_data):
+    return axl_data
+
+
+class FakeService(object):
+    """zeep service proxy stand-in, calling a handler per operation and recording calls"""
+
+    def __init__(self, **handlers):
+        self.handlers = handlers
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __getattr__(self, operation):
+        if operation.startswith("_") or operation not in self.handlers:
+            raise AttributeError(operation)
+
+        def call(*args, **kwargs):
+            with self._lock:
+                self.calls.append((operation, args, kwargs))
+            return self.handlers[operation](*args, **kwargs)
+
+        return call
+
+    def __getitem__(self, operation):
+        return getattr(self, operation)
+
+    def count(self, operation):
+        return sum(1 for call in self.calls if call[0] == operation)
+
+
+def fake_list(return_name, rows, max_first=None, delay=None):
+    """'list' handler paging through rows with skip/first, faulting on pages over max_first"""
+    def handler(searchCriteria=None, returnedTags=None, skip=None, first=None):
+        if delay:
+            delay()
+        if max_first and (first is None or first > max_first):
+            raise Fault(f"Query request too large. Total rows matched: {len(rows)}. "
+                        f"Suggestive Row Fetch: less than {max_first} rows")
+        skip = int(skip or 0)
+        page = rows[skip:skip + first] if first else rows[skip:]
+        return {"return": {return_name: [OrderedDict(row) for row in page] or None}}
+    return handler
+
+
+def fake_sql(query):
+    """'executeSQLQuery' handler returning query(sql) rows as Thin AXL row elements, paged by SKIP and FIRST"""
+    def handler(sql=None):
+        rows = query(sql)
+        paged = re.match(r"\s*select\s+SKIP (\d+) FIRST (\d+) ", sql, re.IGNORECASE)
+        if paged:
+            skip, first = int(paged.group(1)), int(paged.group(2))
+            rows = rows[skip:skip + first]
+        elements = []
+        for row in rows:
+            elements.append([])
+            for column, value in row.items():
+                element = etree.Element(column)
+                element.text = None if value is None else str(value)
+                elements[-1].append(element)
+        return {"return": {"row": elements} if elements else None}
+    return handler
+
+
+def sql_in_values(sql):
+    """String values of the first 'IN (...)' list in a SQL statement"""
+    in_list = re.search(r" in \((.*?)\)(?: and | order |$)", sql).group(1)
+    return [value.replace("''", "'") for value in re.findall(r"'((?:[^']|'')*)'", in_list)]
+
+
+class FakeRisPort(object):
+    """RisPort70 selectCmDeviceExt stand-in over devices of (name, node, status, ip, timestamp)
+
+    Pages followed by further devices return a 'page:<offset>' StateInfo cursor.  The last page returns the current
+    'v<version>' StateInfo, and selections with the current StateInfo return every node as NoChange.
+    """
+
+    def __init__(self, devices, nodes=("cucm-sub1", "cucm-sub2")):
+        self.devices = devices
+        self.nodes = nodes
+        self.version = 1
+
+    def change(self, devices):
+        self.devices = devices
+        self.version += 1
+
+    def service(self):
+        return FakeService(selectCmDeviceExt=self.select)
+
+    def select(self, CmSelectionCriteria, StateInfo):
+        if StateInfo == f"v{self.version}":
+            nodes = [{"Name": node, "NoChange": True, "CmDevices": None} for node in self.nodes]
+            return {"SelectCmDeviceResult": {"CmNodes": {"item": nodes}}, "StateInfo": StateInfo}
+        limit = CmSelectionCriteria["MaxReturnedDevices"]
+        patterns = [item["Item"] for item in CmSelectionCriteria["SelectItems"]["item"]]
+        offset = int(StateInfo[len("page:"):]) if StateInfo.startswith("page:") else 0
+        names = set(patterns)
+        wildcards = [pattern for pattern in patterns if "*" in pattern]
+        matched = [device for device in self.devices
+                   if device[0] in names or any(fnmatch(device[0], _) for _ in wildcards)]
+        page = matched[offset:offset + limit]
+        nodes = [
+            {"Name": node, "NoChange": False, "CmDevices": {"item": [
+                OrderedDict([("Name", name), ("Status", status), ("IPAddress", {"item": [{"IP": ip}]}),
+                             ("TimeStamp", timestamp)])
+                for name, device_node, status, ip, timestamp in page if device_node == node
+            ]}}
+            for node in self.nodes
+        ]
+        state_info = f"page:{offset + limit}" if offset + limit < len(matched) else f"v{self.version}"
+        return {"SelectCmDeviceResult": {"CmNodes": {"item": nodes}}, "StateInfo": state_info}
+
+
+def fake_connector(connector_class, service, **kwargs):
+    """Build a connector calling a fake service, without loading its WSDL"""
+    connector = connector_class(username="user", password="secret", fqdn="cucm", **kwargs)
+    connector._client = object()
+    connector._service = service
+    return connector
+
+
+@pytest.fixture(scope="session")
+def axl_client():
+    return UCMAXLConnector(username="axl", password="secret", fqdn="cucm", wsdl=WSDL, cache=InMemoryCache(),
+                           throttle=False).client
+
+
+@pytest.fixture
+def make_axl(axl_client):
+    """Build AXL connectors on a shared zeep client, calling a fake service, with plain dict API objects"""
+    def make(service, connector_class=UCMAXLConnector, **kwargs):
+        kwargs.setdefault("throttle", False)
+        connector = connector_class(username="axl", password="secret", fqdn="cucm", wsdl=WSDL, **kwargs)
+        connector._client = axl_client
+        connector._service = service
+        connector._model_factory = axl_client.type_factory("ns0")
+        connector._create_api = lambda api_class, object_factory: api_class(connector, plain_factory)
+        return connector
+    return make
@@ -0,0 +1,137 @@
+import asyncio
+import re
+import subprocess
+import sys
+
+import pytest
+from conftest import WSDL
+from conftest import plain_factory
+from zeep.cache import Base
+
+httpx = pytest.importorskip("httpx")
+
+from ciscocucmapi import AsyncUCMAXLConnector  # noqa: E402 isort:skip
+from ciscocucmapi import aio  # noqa: E402 isort:skip
+from ciscocucmapi import sql_utils  # noqa: E402 isort:skip
+
+ENVELOPE = (
+    '<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"><soapenv:Body>'
+    '<ns:{operation}Response xmlns:ns="http://www.cisco.com/AXL/API/12.5">{body}</ns:{operation}Response>'
+    '</soapenv:Body></soapenv:Envelope>'
+)
+PHONES = ['<phone uuid="{{AAAA0000-0000-0000-0000-{:012d}}}"><name>SEP{:012d}</name></phone>'.format(i, i)
+          for i in range(5)]
+
+
+class NoCache(Base):
+    """zeep cache never returning documents, so that the WSDL is always loaded through the transport"""
+
+    def add(self, url, content):
+        pass
+
+    def get(self, url):
+        return None
+
+
+def axl_response(request):
+    """Respond to getPhone and listPhone requests from a small phone table"""
+    content = request.content.decode()
+    operation = re.search(r"<ns0:(\w+)", content).group(1)
+    if operation == "getPhone":
+        name = re.search(r"<name>(\w+)</name>", content).group(1)
+        phones = [phone for phone in PHONES if f"<name>{name}</name>" in phone]
+        body = f"<return>{phones[0]}</return>"
+    else:
+        skip, first = (re.search(rf"<{tag}>(\d+)</{tag}>", content) for tag in ("skip", "first"))
+        skip = int(skip.group(1)) if skip else 0
+        first = int(first.group(1)) if first else len(PHONES)
+        body = f"<return>{''.join(PHONES[skip:skip + first])}</return>"
+    return httpx.Response(200, text=ENVELOPE.format(operation=operation, body=body),
+                          headers={"Content-Type": "text/xml; charset=utf-8"})
+
+
+@pytest.fixture
+def connector(monkeypatch):
+    """Async connector on a real zeep AsyncClient, with HTTP requests answered by a mock transport"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return axl_response(request)
+
+    class MockAsyncClient(httpx.AsyncClient):
+        def __init__(self, **kwargs):
+            super().__init__(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(aio.httpx, "AsyncClient", MockAsyncClient)
+    axl = AsyncUCMAXLConnector(username="axl", password="secret", fqdn="cucm", wsdl=WSDL, cache=NoCache())
+    axl._create_api = lambda api_class, object_factory: aio.AsyncAXLAPI(
+        api_class(aio._ReplayingConnector(axl), plain_factory), axl)
+    axl.requests = requests
+    return axl
+
+
+def test_async_service_proxy(connector):
+    # the local WSDL is loaded through the synchronous transport, as httpx does not support 'file://' locations
+    assert isinstance(connector.service, aio.AsyncServiceProxy)
+    assert connector.requests == []
+
+
+def test_async_get(connector):
+    async def get():
+        async with connector:
+            return await asyncio.gather(*(connector.phone.get(name=f"SEP{i:012d}", returnedTags=["name"])
+                                          for i in range(3)))
+
+    phones = asyncio.run(get())
+    assert [phone["name"] for phone in phones] == [f"SEP{i:012d}" for i in range(3)]
+    assert phones[0]["uuid"] == "{AAAA0000-0000-0000-0000-000000000000}"
+    assert len(connector.requests) == 3
+    assert connector.requests[0].headers["authorization"].startswith("Basic ")
+
+
+def test_async_list(connector):
+    async def list_phones():
+        async with connector:
+            return await connector.phone.list(returnedTags=["name"])
+
+    assert [phone["name"] for phone in asyncio.run(list_phones())] == [f"SEP{i:012d}" for i in range(5)]
+
+
+def test_async_iter_list(connector):
+    async def iter_list():
+        async with connector:
+            return [phone["name"] async for phone in connector.phone.iter_list(returnedTags=["name"], page_size=2)]
+
+    assert asyncio.run(iter_list()) == [f"SEP{i:012d}" for i in range(5)]
+    # pages of 2, 2 and 1
+    assert len(connector.requests) == 3
+
+
+@pytest.mark.parametrize("options", [{"stream": True}, {"parallel": True}])
+def test_async_list_rejects_thread_based_paging(connector, options):
+    with pytest.raises(TypeError, match="iter_list"):
+        connector.phone.list(returnedTags=["name"], **options)
+    assert connector.requests == []
+
+
+def test_blocking_helpers_are_rejected(connector):
+    with pytest.raises(TypeError, match="bulk"):
+        connector.bulk(connector.phone.get, [{"name": "SEP000000000001"}])
+    with pytest.raises(TypeError, match="iter_bulk"):
+        connector.iter_bulk(connector.phone.get, [{"name": "SEP000000000001"}])
+    with pytest.raises(TypeError, match="change_feed"):
+        connector.change_feed(["Phone"])
+    with pytest.raises(TypeError, match="local_mirror"):
+        connector.local_mirror()
+    with pytest.raises(TypeError, match="resolver"):
+        connector.resolver
+    with pytest.raises(TypeError, match="resolver"):
+        sql_utils.get_device_pkid(connector, "SEP000000000001")
+    assert connector.requests == []
+
+
+def test_package_import_does_not_import_aio():
+    # the asyncio connector needs Python 3.7+, and is only imported on first use
+    code = "import sys, ciscocucmapi; assert 'ciscocucmapi.aio' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,160 @@
+import struct
+from contextlib import contextmanager
+
+import pytest
+from conftest import fake_connector
+
+from ciscocucmapi import LogCollectionConnector
+from ciscocucmapi.attachments import DimeStreamParser
+from ciscocucmapi.attachments import MultipartStreamParser
+from ciscocucmapi.attachments import attachment_parser
+from ciscocucmapi.exceptions import AttachmentError
+
+ENVELOPE = b'<soapenv:Envelope><soapenv:Body><ns:GetOneFileResponse/></soapenv:Body></soapenv:Envelope>'
+# attachment content including partial delimiters
+CONTENT = b"".join(b"line %d \r\n--MIMEBoundar\r\n-\r\n--MIMEBoundaryY\r" % i for i in range(200))
+
+
+def multipart(envelope=ENVELOPE, content=CONTENT, boundary=b"MIMEBoundaryX"):
+    return b"".join([
+        b"preamble\r\n--", boundary, b"\r\nContent-Type: text/xml\r\n\r\n", envelope,
+        b"\r\n--", boundary, b"\r\nContent-Type: application/octet-stream\r\nContent-Id: <1>\r\n\r\n",
+        content, b"\r\n--", boundary, b"--\r\nepilogue"
+    ])
+
+
+def dime_record(data, first=False, last=False, chunked=False, type_name=b""):
+    flags = (1 << 3) | (0x04 if first else 0) | (0x02 if last else 0) | (0x01 if chunked else 0)
+
+    def padded(field):
+        return field + b"\0" * (-len(field) % 4)
+
+    return struct.pack(">BBHHHI", flags, 0x20 if type_name else 0, 0, 0, len(type_name), len(data)) \
+        + padded(type_name) + padded(data)
+
+
+def dime(content=CONTENT):
+    # the attachment is split over chunked records
+    third = len(content) // 3
+    return b"".join([
+        dime_record(ENVELOPE, first=True, type_name=b"http://schemas.xmlsoap.org/soap/envelope/"),
+        dime_record(content[:third], chunked=True, type_name=b"application/octet-stream"),
+        dime_record(content[third:2 * third], chunked=True),
+        dime_record(content[2 * third:], last=True)
+    ])
+
+
+def parse(parser_class, message, chunk_size, *args):
+    received = bytearray()
+    parser = parser_class(*args, received.extend)
+    for i in range(0, len(message), chunk_size):
+        parser.feed(message[i:i + chunk_size])
+    parser.close()
+    return parser, bytes(received)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 13, 14, 15, 64, 1000, 100000])
+def test_multipart(chunk_size):
+    parser, received = parse(MultipartStreamParser, multipart(), chunk_size, "MIMEBoundaryX")
+    assert received == CONTENT
+    assert bytes(parser.envelope) == ENVELOPE
+    assert parser.parts == 2
+
+
+def test_multipart_passes_views_of_the_chunks():
+    views = []
+    message = multipart()
+    parser = MultipartStreamParser("MIMEBoundaryX", views.append)
+    parser.feed(message)
+    assert all(isinstance(view, memoryview) and view.obj is message for view in views)
+
+
+def test_multipart_requires_attachment():
+    message = multipart()
+    truncated = message[:message.rindex(b"\r\n--MIMEBoundaryX--")]
+    with pytest.raises(AttachmentError):
+        parse(MultipartStreamParser, truncated, 100, "MIMEBoundaryX")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 4, 5, 12, 64, 100000])
+def test_dime(chunk_size):
+    parser, received = parse(DimeStreamParser, dime(), chunk_size)
+    assert received == CONTENT
+    assert bytes(parser.envelope) == ENVELOPE
+    assert parser.records == 2
+
+
+def test_dime_requires_attachment():
+    with pytest.raises(AttachmentError):
+        parse(DimeStreamParser, dime_record(ENVELOPE, first=True, last=True), 100)
+
+
+def test_attachment_parser():
+    assert isinstance(attachment_parser("application/dime", print), DimeStreamParser)
+    parser = attachment_parser('multipart/related; type="text/xml"; boundary="MIMEBoundaryX"', print)
+    assert isinstance(parser, MultipartStreamParser)
+    with pytest.raises(AttachmentError):
+        attachment_parser("text/xml", print)
+
+
+class FakeResponse(object):
+
+    def __init__(self, content, chunk_size=4096, fail_after=None):
+        self.status_code = 200
+        self.headers = {"Content-Type": 'multipart/related; boundary="MIMEBoundaryX"'}
+        self.content = content
+        self.chunk_size = chunk_size
+        self.fail_after = fail_after
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), self.chunk_size):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise ConnectionError("connection reset")
+            yield self.content[i:i + self.chunk_size]
+
+
+class FakeSession(object):
+
+    def __init__(self, response):
+        self.response = response
+        self.posts = []
+
+    @contextmanager
+    def post(self, url, data=None, headers=None, stream=False, timeout=None):
+        self.posts.append(data)
+        yield self.response
+
+
+def log_collection(response):
+    connector = fake_connector(LogCollectionConnector, None)
+    connector._session = FakeSession(response)
+    return connector
+
+
+def test_get_one_file(tmp_path):
+    logs = log_collection(FakeResponse(multipart()))
+    assert logs.get_one_file("/var/log/active/cm/trace/ccm/sdl/SDL001_100_000001.txt.gz", tmp_path) == len(CONTENT)
+    assert (tmp_path / "SDL001_100_000001.txt.gz").read_bytes() == CONTENT
+    assert b"<FileName>/var/log/active/cm/trace/ccm/sdl/SDL001_100_000001.txt.gz</FileName>" in logs._session.posts[0]
+
+
+def test_partial_downloads_are_removed(tmp_path):
+    logs = log_collection(FakeResponse(multipart(), fail_after=4096))
+    with pytest.raises(ConnectionError):
+        logs.get_one_file("/var/log/active/syslog/messages", tmp_path / "messages")
+    assert not (tmp_path / "messages").exists()
+
+
+def test_get_files_rejects_paths_outside_the_directory(tmp_path):
+    logs = log_collection(FakeResponse(multipart()))
+    with pytest.raises(ValueError):
+        logs.get_files(["/var/log/active/../../../../etc/cron.d/job"], tmp_path / "logs")
+    assert logs._session.posts == []
+    assert not (tmp_path / "etc").exists()
+
+
+def test_get_files_mirrors_node_paths(tmp_path):
+    logs = log_collection(FakeResponse(multipart()))
+    results = logs.get_files(["/var/log/active/syslog/messages"], tmp_path)
+    assert [(result.result, result.error) for result in results] == [(len(CONTENT), None)]
+    assert (tmp_path / "var/log/active/syslog/messages").read_bytes() == CONTENT
@@ -0,0 +1,63 @@
+import threading
+import time
+
+from conftest import FakeService
+from zeep.exceptions import Fault
+
+
+def add_phone(phone):
+    time.sleep(0.001 * (threading.get_ident() % 5))
+    if phone["name"] == "SEPBAD":
+        raise Fault("Item not valid: The specified Product was not found")
+    return {"return": "{" + phone["name"] + "}"}
+
+
+def phones(names):
+    return [{"name": name, "product": "Cisco 8865", "devicePoolName": "Default"} for name in names]
+
+
+def test_bulk_results_are_in_input_order(make_axl):
+    service = FakeService(addPhone=add_phone)
+    axl = make_axl(service)
+    names = [f"SEP{i:012d}" for i in range(50)]
+    results = axl.bulk(axl.phone.add, phones(names), workers=4)
+    assert [result.result for result in results] == ["{" + name + "}" for name in names]
+    assert [result.kwargs["name"] for result in results] == names
+    assert all(result.error is None for result in results)
+
+
+def test_bulk_collects_errors(make_axl):
+    axl = make_axl(FakeService(addPhone=add_phone))
+    results = axl.bulk(axl.phone.add, phones(["SEP000000000001", "SEPBAD", "SEP000000000002"]))
+    assert [result.error is None for result in results] == [True, False, True]
+    assert isinstance(results[1].error, Fault)
+    assert results[2].result == "{SEP000000000002}"
+
+
+def test_bulk_stop_on_error(make_axl):
+    service = FakeService(addPhone=add_phone)
+    axl = make_axl(service, max_concurrency=2)
+    names = ["SEP000000000001", "SEPBAD"] + [f"SEP{i:012d}" for i in range(2, 100)]
+    results = axl.bulk(axl.phone.add, phones(names), stop_on_error=True)
+    assert len(results) == 2
+    assert results[1].error is not None
+    # only the bounded window of calls was submitted
+    assert service.count("addPhone") < 10
+
+
+def test_bulk_concurrency_is_capped_by_the_connector(make_axl):
+    axl = make_axl(FakeService(), max_concurrency=3)
+    peak, running, lock = [0], [0], threading.Lock()
+
+    def call(i):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.005)
+        with lock:
+            running[0] -= 1
+        return i
+
+    results = list(axl.iter_bulk(call, ({"i": i} for i in range(30)), workers=10))
+    assert [result.result for result in results] == list(range(30))
+    assert peak[0] <= 3
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+
+from conftest import FakeService
+
+from ciscocucmapi.cache import DiskCacheBackend
+from ciscocucmapi.cache import GetCache
+
+PHONE = OrderedDict([("uuid", "{AAAA0000-0000-0000-0000-000000000001}"), ("name", "SEP000000000001"),
+                     ("description", "lobby")])
+
+
+def get_phone(name=None, uuid=None, returnedTags=None):
+    phone = OrderedDict([("uuid", PHONE["uuid"])])
+    for tag in returnedTags or PHONE:
+        if tag != "uuid":
+            phone[tag] = PHONE[tag]
+    return {"return": {"phone": phone}}
+
+
+def make_service():
+    return FakeService(getPhone=get_phone,
+                       updatePhone=lambda **kwargs: {"return": PHONE["uuid"]},
+                       removePhone=lambda **kwargs: {"return": PHONE["uuid"]},
+                       getLdapSystem=lambda: {"return": {"ldapSystem": {"syncEnabled": "true"}}},
+                       updateLdapSystem=lambda **kwargs: {"return": "{BBBB0000-0000-0000-0000-000000000001}"})
+
+
+def test_cache_hits(make_axl):
+    service = make_service()
+    cache = GetCache(ttl=None)
+    axl = make_axl(service, get_cache=cache)
+    for _ in range(3):
+        assert axl.phone.get(name="SEP000000000001", returnedTags=["description"])["description"] == "lobby"
+    assert service.count("getPhone") == 1
+    assert cache.stats()["hits"] == 2
+
+
+def test_entries_are_keyed_by_returned_tags(make_axl):
+    service = make_service()
+    axl = make_axl(service, get_cache=GetCache(ttl=None))
+    axl.phone.get(name="SEP000000000001", returnedTags=["description"])
+    axl.phone.get(name="SEP000000000001", returnedTags=["name"])
+    assert service.count("getPhone") == 2
+
+
+def test_update_by_name_invalidates_entries_cached_by_uuid(make_axl):
+    service = make_service()
+    cache = GetCache(ttl=None)
+    axl = make_axl(service, get_cache=cache)
+    axl.phone.get(uuid=PHONE["uuid"], returnedTags=["description"])
+    # restricted returnedTags are extended with identifiers, so the entry is tagged by name too
+    assert "name" in service.calls[0][2]["returnedTags"]
+    axl.phone.update(name="SEP000000000001", description="reception")
+    axl.phone.get(uuid=PHONE["uuid"], returnedTags=["description"])
+    assert service.count("getPhone") == 2
+
+
+def test_remove_by_uuid_invalidates_entries_cached_by_name(make_axl):
+    service = make_service()
+    axl = make_axl(service, get_cache=GetCache(ttl=None))
+    axl.phone.get(name="SEP000000000001")
+    axl.phone.remove(uuid=PHONE["uuid"].strip("{}").lower())
+    axl.phone.get(name="SEP000000000001")
+    assert service.count("getPhone") == 2
+
+
+def test_apis_without_identifiers_are_not_cached(make_axl):
+    service = make_service()
+    axl = make_axl(service, get_cache=GetCache(ttl=None))
+    assert axl.schema_index.identifiers(axl.ldap_system) == ()
+    axl.ldap_system.get()
+    axl.ldap_system.update(syncEnabled=True)
+    assert service.count("updateLdapSystem") == 1
+
+
+def test_single_identifier_apis(make_axl):
+    axl = make_axl(make_service())
+    # a single required identifier is one choice, not a string of choices
+    assert axl.schema_index.identifiers(axl.snmp_community_string) == ("communityName",)
+
+
+def test_expiry(make_axl):
+    service = make_service()
+    cache = GetCache(ttl=-1)
+    axl = make_axl(service, get_cache=cache)
+    axl.phone.get(name="SEP000000000001")
+    axl.phone.get(name="SEP000000000001")
+    assert service.count("getPhone") == 2
+
+
+def test_disk_backend(make_axl, tmp_path):
+    service = make_service()
+    axl = make_axl(service, get_cache=GetCache(ttl=None, backend=DiskCacheBackend(tmp_path / "cache.db")))
+    axl.phone.get(name="SEP000000000001")
+    restarted = make_axl(service, get_cache=GetCache(ttl=None, backend=DiskCacheBackend(tmp_path / "cache.db")))
+    assert restarted.phone.get(name="SEP000000000001")["description"] == "lobby"
+    assert service.count("getPhone") == 1
+    restarted.phone.update(uuid=PHONE["uuid"], description="reception")
+    restarted.phone.get(name="SEP000000000001")
+    assert service.count("getPhone") == 2
@@ -0,0 +1,103 @@
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+from conftest import FakeService
+from conftest import fake_connector
+from zeep.exceptions import Fault
+
+from ciscocucmapi import CDRonDemandConnector
+from ciscocucmapi.cdr import file_time
+from ciscocucmapi.cdr import parse_cdr_file
+from ciscocucmapi.cdr import split_windows
+
+START = datetime(2019, 1, 1)
+CDR_FILE = (
+    '"cdrRecordType","globalCallID_callId","callingPartyNumber","duration","origDeviceName"\r\n'
+    'INTEGER,INTEGER,VARCHAR(50),INTEGER,VARCHAR(129)\r\n'
+    '1,{call_id},"1000",{duration},"SEP000000000001"\r\n'
+    '1,{next_call_id},"1001",,"SEP000000000002"\r\n'
+)
+
+
+class FakeCDRonDemand(object):
+    """CDR on Demand handlers, listing a CDR and CMR file every 30 minutes and 'transferring' files to a directory"""
+
+    def __init__(self, directory, failing=()):
+        self.directory = directory
+        self.failing = failing
+        self.files = {}
+        for i in range(12):
+            created = (START + timedelta(minutes=30 * i)).strftime("%Y%m%d%H%M")
+            for file_type in ("cdr", "cmr"):
+                self.files[f"{file_type}_Stand_Alone_Cluster_01_{created}_{i}"] = i
+
+    def service(self):
+        return FakeService(get_file_list=self.get_file_list, get_file=self.get_file)
+
+    def get_file_list(self, start, end, just_files):
+        return [name for name in self.files if start <= file_time(name) <= end] or None
+
+    def get_file(self, host, username, password, directory, file_name, sftp):
+        if file_name in self.failing:
+            raise Fault("File transfer failed")
+        i = self.files[file_name]
+        (self.directory / file_name).write_text(
+            CDR_FILE.format(call_id=2 * i, next_call_id=2 * i + 1, duration=i * 10), encoding="utf-8")
+
+
+def cdr_connector(cdr):
+    service = cdr.service()
+    return service, fake_connector(CDRonDemandConnector, service)
+
+
+def test_split_windows():
+    assert split_windows(START, START + timedelta(minutes=150)) == [
+        (START, START + timedelta(hours=1)),
+        (START + timedelta(hours=1), START + timedelta(hours=2)),
+        (START + timedelta(hours=2), START + timedelta(minutes=150)),
+    ]
+    assert split_windows(START, START) == []
+
+
+def test_parse_cdr_file(tmp_path):
+    path = tmp_path / "cdr_Cluster_01_201901010000_1"
+    path.write_text(CDR_FILE.format(call_id=1, next_call_id=2, duration=42), encoding="utf-8")
+    records = list(parse_cdr_file(path))
+    assert records[0] == {"cdrRecordType": 1, "globalCallID_callId": 1, "callingPartyNumber": "1000",
+                          "duration": 42, "origDeviceName": "SEP000000000001"}
+    assert records[1]["duration"] is None
+    empty = tmp_path / "empty"
+    empty.write_text("")
+    assert list(parse_cdr_file(empty)) == []
+
+
+def test_get_file_list_in_hour_windows(tmp_path):
+    service, cdr = cdr_connector(FakeCDRonDemand(tmp_path))
+    files = cdr.get_file_list(START, START + timedelta(hours=6), file_types=("cdr",))
+    assert service.count("get_file_list") == 6
+    # files on window boundaries are listed once, in creation order
+    assert [file_time(name) for name in files] == sorted(file_time(name) for name in files)
+    assert len(files) == len(set(files)) == 12
+    assert all(name.startswith("cdr_") for name in files)
+    assert ("201901010000", "201901010100") in {call[1][:2] for call in service.calls}
+
+
+def test_iter_records_in_file_order(tmp_path):
+    service, cdr = cdr_connector(FakeCDRonDemand(tmp_path))
+    records = list(cdr.iter_records(START, START + timedelta(hours=6), host="billing", username="sftp",
+                                    password="secret", directory=str(tmp_path)))
+    assert [record["globalCallID_callId"] for record in records] == list(range(24))
+    assert service.count("get_file") == 12
+    assert service.calls[-1][1][:4] == ("billing", "sftp", "secret", str(tmp_path))
+
+
+def test_failed_transfers_stop_iteration(tmp_path):
+    cdr_service = FakeCDRonDemand(tmp_path, failing=("cdr_Stand_Alone_Cluster_01_201901010100_2",))
+    service, cdr = cdr_connector(cdr_service)
+    paths = cdr.iter_files(START, START + timedelta(hours=6), host="billing", username="sftp", password="secret",
+                           directory="/srv/cdr", local_directory=tmp_path, file_types=("cdr",))
+    assert [path.name for path in (next(paths), next(paths))] == [
+        "cdr_Stand_Alone_Cluster_01_201901010000_0", "cdr_Stand_Alone_Cluster_01_201901010030_1"]
+    with pytest.raises(Fault):
+        next(paths)
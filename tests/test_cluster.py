@@ -0,0 +1,119 @@
+import threading
+
+import pytest
+from conftest import WSDL
+from conftest import FakeService
+from requests.exceptions import ConnectionError
+from zeep.exceptions import Fault
+from zeep.exceptions import TransportError
+
+from ciscocucmapi import UCMAXLClusterConnector
+from ciscocucmapi import cluster
+from ciscocucmapi.cluster import Node
+from ciscocucmapi.cluster import NodeRoutingService
+from ciscocucmapi.cluster import is_node_failure
+from ciscocucmapi.definitions import CLUSTER
+
+
+def node_service(fqdn, error=None, barrier=None):
+    def operation(**kwargs):
+        if barrier:
+            barrier.wait()
+        if error:
+            raise error
+        return fqdn
+    return FakeService(getPhone=operation, listPhone=operation, addPhone=operation)
+
+
+def routing(*services):
+    nodes = [Node(f"cucm-{i}", service, publisher=i == 0) for i, service in enumerate(services)]
+    return NodeRoutingService(nodes)
+
+
+@pytest.fixture
+def now(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(cluster.time, "monotonic", lambda: clock[0])
+    return clock
+
+
+def test_node_failures():
+    assert is_node_failure(ConnectionError())
+    assert is_node_failure(TransportError(status_code=503))
+    assert not is_node_failure(TransportError(status_code=404))
+    assert not is_node_failure(Fault("Item not valid"))
+
+
+def test_writes_go_to_the_publisher():
+    service = routing(*(node_service(f"cucm-{i}") for i in range(3)))
+    assert {service.addPhone(phone={}) for _ in range(5)} == {"cucm-0"}
+    assert service.nodes[0].requests == 5
+
+
+def test_reads_prefer_subscribers():
+    service = routing(*(node_service(f"cucm-{i}") for i in range(3)))
+    assert service.getPhone(name="SEP000000000001") == "cucm-1"
+    assert all(node.outstanding == 0 for node in service.nodes)
+
+
+def test_concurrent_reads_spread_by_outstanding_requests():
+    barrier = threading.Barrier(3, timeout=5)
+    service = routing(*(node_service(f"cucm-{i}", barrier=barrier) for i in range(3)))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.listPhone())) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == ["cucm-0", "cucm-1", "cucm-2"]
+
+
+def test_failed_reads_are_retried_on_the_next_node():
+    service = routing(node_service("cucm-0"), node_service("cucm-1", error=ConnectionError()),
+                      node_service("cucm-2"))
+    assert service.getPhone(name="SEP000000000001") == "cucm-2"
+    assert service.nodes[1].failures == 1
+
+
+def test_request_errors_are_not_retried():
+    service = routing(node_service("cucm-0"), node_service("cucm-1", error=Fault("Item not valid")))
+    with pytest.raises(Fault):
+        service.getPhone(name="SEPUNKNOWN")
+    assert service.nodes[0].requests == 0
+    assert service.nodes[1].failures == 0
+
+
+def test_failing_node_is_ejected_with_doubling_ejection_time(now):
+    service = routing(node_service("cucm-0"), node_service("cucm-1", error=TransportError(status_code=503)))
+    subscriber = service.nodes[1]
+    for _ in range(CLUSTER["failure_threshold"]):
+        assert service.getPhone() == "cucm-0"
+    assert not subscriber.healthy
+    assert subscriber.ejected_until == now[0] + CLUSTER["ejection_time"]
+    # ejected nodes receive no reads
+    requests = subscriber.requests
+    service.getPhone()
+    assert subscriber.requests == requests
+    now[0] = subscriber.ejected_until
+    for _ in range(CLUSTER["failure_threshold"]):
+        service.getPhone()
+    assert subscriber.ejected_until == now[0] + CLUSTER["ejection_time"] * 2
+
+
+def test_success_resets_ejections():
+    node = Node("cucm-1", None)
+    for _ in range(CLUSTER["failure_threshold"]):
+        node.record(True)
+    assert node.ejections == 1
+    node.record(False)
+    assert node.ejections == node.failures == 0
+
+
+def test_cluster_connector_creates_a_service_per_node():
+    axl = UCMAXLClusterConnector(nodes=["cucm-pub", "cucm-sub1"], username="axl", password="secret", wsdl=WSDL)
+    assert isinstance(axl.service, NodeRoutingService)
+    assert [node.fqdn for node in axl.nodes] == ["cucm-pub", "cucm-sub1"]
+    assert axl.nodes[0].publisher and not axl.nodes[1].publisher
+    assert axl.nodes[1].service._binding_options["address"] == "https://cucm-sub1:8443/axl/"
+    with pytest.raises(ValueError):
+        UCMAXLClusterConnector(nodes=[], username="axl", password="secret", wsdl=WSDL)
@@ -0,0 +1,35 @@
+from conftest import WSDL
+
+from ciscocucmapi import UCMAXLConnector
+from ciscocucmapi.api import Phone
+from ciscocucmapi.connectors import LazyAPI
+
+
+def connector():
+    return UCMAXLConnector(username="axl", password="secret", fqdn="cucm", wsdl=WSDL)
+
+
+def test_apis_are_created_on_first_access():
+    axl = connector()
+    assert isinstance(UCMAXLConnector.__dict__["phone"], LazyAPI)
+    assert "phone" not in axl.__dict__
+    created = []
+    create_api = axl._create_api
+
+    def record_create_api(api_class, object_factory):
+        created.append(api_class)
+        return create_api(api_class, object_factory)
+
+    axl._create_api = record_create_api
+    phone = axl.phone
+    assert isinstance(phone, Phone)
+    assert axl.phone is phone
+    assert axl.__dict__["phone"] is phone
+    assert created == [Phone]
+
+
+def test_connector_creation_does_not_load_the_wsdl():
+    axl = connector()
+    assert axl._client is None
+    assert axl.phone.connector is axl
+    assert axl._client is None
@@ -0,0 +1,112 @@
+import json
+import pickle
+from collections import OrderedDict
+
+import pytest
+from conftest import FakeService
+
+from ciscocucmapi.exceptions import ParseError
+from ciscocucmapi.helpers import FilterPlan
+from ciscocucmapi.helpers import FrozenModelDict
+from ciscocucmapi.helpers import compile_filter_plan
+from ciscocucmapi.helpers import filter_dict_to_target_model
+from ciscocucmapi.helpers import filter_many
+from ciscocucmapi.helpers import freeze_model
+from ciscocucmapi.model import AXLDataModel
+
+TARGET = {
+    "name": None,
+    "devicePoolName": {"_value_1": None, "uuid": None},
+    "lines": {"line": [{"index": None, "dirn": {"pattern": None, "routePartitionName": None}}]},
+    "speeddials": None,
+}
+PHONE = OrderedDict([
+    ("uuid", "{AAAA0000-0000-0000-0000-000000000001}"),
+    ("name", "SEP000000000001"),
+    ("model", "Cisco 8865"),
+    ("devicePoolName", {"_value_1": "DP_HQ", "uuid": "{DDDD0000-0000-0000-0000-000000000001}"}),
+    ("lines", {"line": [
+        {"index": 1, "display": "Reception", "dirn": {"pattern": "1000", "routePartitionName": "PT_INTERNAL",
+                                                      "uuid": "{EEEE0000-0000-0000-0000-000000000001}"}},
+        {"index": 2, "display": None, "dirn": {"pattern": "1001", "routePartitionName": None}},
+    ]}),
+    ("speeddials", {"speeddial": [{"dirn": "2000", "index": 1}]}),
+])
+FILTERED = OrderedDict([
+    ("name", "SEP000000000001"),
+    ("devicePoolName", {"_value_1": "DP_HQ", "uuid": "{DDDD0000-0000-0000-0000-000000000001}"}),
+    ("lines", {"line": [{"index": 1, "dirn": {"pattern": "1000", "routePartitionName": "PT_INTERNAL"}},
+                        {"index": 2, "dirn": {"pattern": "1001", "routePartitionName": None}}]}),
+    ("speeddials", {"speeddial": [{"dirn": "2000", "index": 1}]}),
+])
+
+
+def test_model_templates_are_memoized(make_axl):
+    axl = make_axl(FakeService())
+    model = axl.phone.model()
+    assert isinstance(model, FrozenModelDict)
+    assert axl.phone.model() is model
+    assert axl.phone.model(sanitized=False) is not model
+    assert axl.phone.model(include_types=True) is not model
+
+
+def test_frozen_models_are_immutable():
+    model = freeze_model({"name": None, "lines": {"line": [{"index": None}]}})
+    with pytest.raises(TypeError):
+        model["name"] = "SEP000000000001"
+    with pytest.raises(TypeError):
+        model.update(name="SEP000000000001")
+    with pytest.raises(TypeError):
+        model["lines"]["line"].append({"index": 2})
+    with pytest.raises(TypeError):
+        del model["lines"]["line"][0]["index"]
+
+
+def test_thaw_returns_a_mutable_deep_copy():
+    model = freeze_model({"name": None, "lines": {"line": [{"index": None}]}})
+    thawed = model.thaw()
+    thawed["name"] = "SEP000000000001"
+    thawed["lines"]["line"][0]["index"] = 1
+    thawed["lines"]["line"].append({"index": 2})
+    assert model["name"] is None
+    assert model["lines"]["line"] == [{"index": None}]
+
+
+def test_frozen_models_serialize_as_dicts():
+    model = freeze_model({"name": None, "lines": {"line": [{"index": None}]}})
+    assert json.loads(json.dumps(model)) == model
+    assert pickle.loads(pickle.dumps(model)) == model
+
+
+def data_model(axl_data):
+    """Data Model wrapping a response dict, as returned by the API wrappers"""
+    model = AXLDataModel.__new__(AXLDataModel)
+    object.__setattr__(model, "_axl_data", OrderedDict(axl_data))
+    return model
+
+
+def test_filter_plan():
+    assert filter_dict_to_target_model(PHONE, TARGET) == FILTERED
+    assert FilterPlan(TARGET)(PHONE) == FILTERED
+    # empty nested values are passed through
+    assert filter_dict_to_target_model({"name": "SEP1", "lines": None}, TARGET) == {"name": "SEP1", "lines": None}
+
+
+def test_filter_plan_is_cached_on_frozen_templates():
+    target = freeze_model(TARGET)
+    plan = compile_filter_plan(target)
+    assert compile_filter_plan(target) is plan
+    assert compile_filter_plan(plan) is plan
+    assert plan(PHONE) == FILTERED
+
+
+def test_filter_many():
+    filtered = list(filter_many([PHONE, data_model(PHONE)], freeze_model(TARGET)))
+    assert filtered[0] == FILTERED
+    assert isinstance(filtered[1], AXLDataModel)
+    assert filtered[1]._axl_data == FILTERED
+
+
+def test_filter_plan_parse_error():
+    with pytest.raises(ParseError):
+        filter_dict_to_target_model({"lines": {"line": ["1000"]}}, TARGET)
@@ -0,0 +1,63 @@
+from conftest import FakeService
+
+from ciscocucmapi import _internal_utils
+from ciscocucmapi._internal_utils import flatten_signature_kwargs
+from ciscocucmapi._internal_utils import get_signature_kwargs_key
+from ciscocucmapi._internal_utils import get_signature_locals
+
+
+class Api(object):
+
+    def add(self, name, description=None, **kwargs):
+        return flatten_signature_kwargs(self.add, locals())
+
+    def remove(self, name):
+        return flatten_signature_kwargs(self.remove, locals())
+
+
+def test_flatten_signature_kwargs():
+    api = Api()
+    assert api.add("SEP000000000001", product="Cisco 8865") == {
+        "name": "SEP000000000001", "description": None, "product": "Cisco 8865"}
+    assert api.remove("SEP000000000001") == {"name": "SEP000000000001"}
+
+
+def test_signature_helpers():
+    def add(name, **options):
+        extra = None  # noqa: F841
+        return locals()
+
+    assert get_signature_kwargs_key(add) == "options"
+    assert get_signature_kwargs_key(Api().remove) is None
+    assert get_signature_locals(add, add("SEP000000000001", product="Cisco 8865")) == {
+        "name": "SEP000000000001", "options": {"product": "Cisco 8865"}}
+
+
+def test_signatures_are_inspected_once_per_function(monkeypatch):
+    inspected = []
+    signature = _internal_utils.signature
+
+    def counting_signature(func):
+        inspected.append(func)
+        return signature(func)
+
+    monkeypatch.setattr(_internal_utils, "signature", counting_signature)
+
+    class Line(object):
+
+        def add(self, pattern, usage="Device", **kwargs):
+            return flatten_signature_kwargs(self.add, locals())
+
+    for i in range(3):
+        assert Line().add(f"100{i}", routePartitionName="PT_INTERNAL") == {
+            "pattern": f"100{i}", "usage": "Device", "routePartitionName": "PT_INTERNAL"}
+    assert len(inspected) == 1
+
+
+def test_api_add_flattens_kwargs(make_axl):
+    service = FakeService(addAdvertisedPatterns=lambda **kwargs: {"return": "{AAAA0000-0000-0000-0000-000000000001}"})
+    axl = make_axl(service)
+    axl.advertised_patterns.add("1000", description="HQ")
+    assert service.calls[0][2]["advertisedPatterns"] == {
+        "pattern": "1000", "patternType": "Enterprise Number", "hostedRoutePSTNRule": "No PSTN", "pstnFailStrip": 0,
+        "description": "HQ"}
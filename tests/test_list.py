@@ -0,0 +1,93 @@
+import threading
+import time
+
+from conftest import FakeService
+from conftest import fake_list
+
+ROWS = [{"name": f"SEP{i:012d}"} for i in range(2345)]
+
+
+def names(objs):
+    return [obj["name"] for obj in objs]
+
+
+def test_list_single_page(make_axl):
+    service = FakeService(listPhone=fake_list("phone", ROWS))
+    axl = make_axl(service)
+    assert names(axl.phone.list(returnedTags=["name"], first=10)) == names(ROWS[:10])
+
+
+def test_stream_pages_through_all_results(make_axl):
+    service = FakeService(listPhone=fake_list("phone", ROWS))
+    axl = make_axl(service)
+    assert names(axl.phone.iter_list(returnedTags=["name"], page_size=500)) == names(ROWS)
+    assert service.count("listPhone") == 5
+
+
+def test_stream_is_lazy(make_axl):
+    service = FakeService(listPhone=fake_list("phone", ROWS))
+    axl = make_axl(service)
+    phones = axl.phone.list(returnedTags=["name"], stream=True, page_size=100)
+    assert next(phones)["name"] == ROWS[0]["name"]
+    # the first page, and at most the prefetched next page
+    assert service.count("listPhone") <= 2
+    phones.close()
+
+
+def test_stream_empty_result(make_axl):
+    service = FakeService(listPhone=fake_list("phone", []))
+    axl = make_axl(service)
+    assert list(axl.phone.iter_list(returnedTags=["name"])) == []
+    assert service.count("listPhone") == 1
+
+
+def test_stream_reduces_page_size_on_response_size_faults(make_axl):
+    service = FakeService(listPhone=fake_list("phone", ROWS, max_first=300))
+    axl = make_axl(service)
+    assert names(axl.phone.iter_list(returnedTags=["name"], page_size=1000)) == names(ROWS)
+
+
+def test_stream_honours_skip(make_axl):
+    service = FakeService(listPhone=fake_list("phone", ROWS))
+    axl = make_axl(service)
+    assert names(axl.phone.iter_list(returnedTags=["name"], skip=2000, page_size=100)) == names(ROWS[2000:])
+
+
+def test_parallel_preserves_order_without_counting(make_axl):
+    # later windows return first, so results must be re-ordered
+    def delay():
+        time.sleep(0.001 * (threading.get_ident() % 7))
+
+    service = FakeService(listPhone=fake_list("phone", ROWS, delay=delay))
+    axl = make_axl(service, max_concurrency=4)
+    result = axl.phone.list(returnedTags=["name"], parallel=True, page_size=100)
+    assert names(result) == names(ROWS)
+    # 24 windows, plus at most 3 speculative windows past the end - no count pass
+    assert service.count("listPhone") <= 24 + 3
+    assert all(call[2]["first"] <= 100 for call in service.calls)
+
+
+def test_parallel_shares_reduced_page_size(make_axl):
+    service = FakeService(listPhone=fake_list("phone", ROWS, max_first=250))
+    axl = make_axl(service, max_concurrency=4)
+    result = axl.phone.list(returnedTags=["name"], parallel=True, page_size=1000)
+    assert names(result) == names(ROWS)
+    faults = [call for call in service.calls if call[2]["first"] > 250]
+    # the first windows in flight discover the limit, later windows start at the reduced size
+    assert len(faults) <= 4
+
+
+def test_parallel_empty_result(make_axl):
+    service = FakeService(listPhone=fake_list("phone", []))
+    axl = make_axl(service)
+    assert list(axl.phone.iter_list(returnedTags=["name"], parallel=True)) == []
+
+
+def test_enterprise_parameters_page_through_service_parameters(make_axl):
+    service = FakeService(listServiceParameter=fake_list("serviceParameter", ROWS[:250]))
+    axl = make_axl(service)
+    assert names(axl.enterprise_parameter.iter_list(returnedTags=["name"], page_size=100)) == names(ROWS[:250])
+    assert names(axl.enterprise_parameter.list(returnedTags=["name"], parallel=True, page_size=100)) == names(
+        ROWS[:250])
+    assert names(axl.enterprise_parameter.list(returnedTags=["name"], first=10)) == names(ROWS[:10])
+    assert {call[2]["searchCriteria"]["service"] for call in service.calls} == {"Enterprise Wide"}
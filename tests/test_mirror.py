@@ -0,0 +1,61 @@
+from collections import OrderedDict
+
+from conftest import FakeService
+from conftest import fake_list
+
+from ciscocucmapi.model import AXLDataModel
+
+PHONES = [
+    {"uuid": "{AAAA0000-0000-0000-0000-000000000001}", "name": "SEP000000000001",
+     "callingSearchSpaceName": {"_value_1": "CSS_INTERNAL", "uuid": "{CCCC0000-0000-0000-0000-000000000001}"}},
+    {"uuid": "{AAAA0000-0000-0000-0000-000000000002}", "name": "SEP000000000002",
+     "callingSearchSpaceName": {"_value_1": "CSS_NATIONAL", "uuid": "{CCCC0000-0000-0000-0000-000000000002}"}},
+]
+
+
+def data_model(axl_data):
+    """Data Model wrapping a response dict, as returned by the API wrappers"""
+    model = AXLDataModel.__new__(AXLDataModel)
+    object.__setattr__(model, "_axl_data", OrderedDict(axl_data))
+    return model
+
+
+def make_mirror(make_axl):
+    axl = make_axl(FakeService(listPhone=fake_list("phone", PHONES)))
+    return axl.local_mirror()
+
+
+def test_refresh_and_find(make_axl):
+    mirror = make_mirror(make_axl)
+    assert mirror.refresh("phone", returnedTags=["name", "callingSearchSpaceName"]) == 2
+    phones = mirror.find("phone", callingSearchSpaceName="CSS_INTERNAL")
+    assert [_["name"] for _ in phones] == ["SEP000000000001"]
+    assert phones.age is not None and phones.age >= 0
+    assert mirror.find("phone", uuid="aaaa0000-0000-0000-0000-000000000002")[0]["name"] == "SEP000000000002"
+
+
+def test_data_model_round_trip(make_axl):
+    mirror = make_mirror(make_axl)
+    phone = data_model({"uuid": "{AAAA0000-0000-0000-0000-000000000003}", "name": "SEP000000000003",
+                        "callingSearchSpaceName": {"_value_1": "CSS_INTERNAL", "uuid": None}})
+    mirror.update("phone", phone)
+    found = mirror.find("phone", name="SEP000000000003")
+    assert found[0] == dict(phone)
+    assert found.age is None
+
+
+def test_discard(make_axl):
+    mirror = make_mirror(make_axl)
+    mirror.refresh("phone", returnedTags=["name", "callingSearchSpaceName"])
+    mirror.discard("phone", "{AAAA0000-0000-0000-0000-000000000001}")
+    assert mirror.count("phone") == 1
+
+
+def test_persistent_mirror(make_axl, tmp_path):
+    axl = make_axl(FakeService(listPhone=fake_list("phone", PHONES)))
+    mirror = axl.local_mirror(tmp_path / "cucm.db")
+    mirror.refresh("phone", returnedTags=["name", "callingSearchSpaceName"])
+    mirror.close()
+    reopened = axl.local_mirror(tmp_path / "cucm.db")
+    assert sorted(_["name"] for _ in reopened.find("phone")) == ["SEP000000000001", "SEP000000000002"]
+    assert reopened.refreshed("phone") is not None
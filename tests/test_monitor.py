@@ -0,0 +1,90 @@
+import threading
+
+from conftest import FakeRisPort
+from conftest import fake_connector
+
+from ciscocucmapi import RisPortConnector
+
+DEVICES = [("SEP000000000001", "cucm-sub1", "Registered", "10.0.0.1", 100),
+           ("SEP000000000002", "cucm-sub2", "Registered", "10.0.0.2", 100),
+           ("SEP000000000003", "cucm-sub1", "Registered", "10.0.0.3", 100)]
+NAMES = [device[0] for device in DEVICES]
+
+
+def monitor(ris, **kwargs):
+    service = ris.service()
+    connector = fake_connector(RisPortConnector, service, requests_per_minute=1000, **kwargs)
+    return service, connector.monitor(NAMES)
+
+
+def changes(transitions):
+    return [(_.name, _.field, _.old, _.new) for _ in transitions]
+
+
+def test_first_poll_reports_every_device():
+    service, registrations = monitor(FakeRisPort(DEVICES))
+    assert sorted(changes(registrations.poll())) == [(name, "Status", None, "Registered") for name in NAMES]
+    assert set(registrations.devices) == set(NAMES)
+
+
+def test_unchanged_nodes_keep_their_devices():
+    service, registrations = monitor(FakeRisPort(DEVICES))
+    registrations.poll()
+    assert registrations.poll() == []
+    assert service.calls[-1][2]["StateInfo"] == "v1"
+    assert set(registrations.devices) == set(NAMES)
+
+
+def test_transitions():
+    ris = FakeRisPort(DEVICES)
+    service, registrations = monitor(ris)
+    registrations.poll()
+    ris.change([("SEP000000000001", "cucm-sub1", "UnRegistered", "10.0.0.1", 200),
+                ("SEP000000000002", "cucm-sub2", "Registered", "10.0.0.22", 200)])
+    assert sorted(changes(registrations.poll())) == [
+        ("SEP000000000001", "Status", "Registered", "UnRegistered"),
+        ("SEP000000000002", "IPAddress", ("10.0.0.2",), ("10.0.0.22",)),
+        ("SEP000000000003", "Status", "Registered", None),
+    ]
+    assert set(registrations.devices) == {"SEP000000000001", "SEP000000000002"}
+
+
+def test_device_moving_node():
+    ris = FakeRisPort(DEVICES)
+    service, registrations = monitor(ris)
+    registrations.poll()
+    ris.change(DEVICES[:2] + [("SEP000000000003", "cucm-sub2", "Registered", "10.0.0.3", 200)])
+    assert changes(registrations.poll()) == [("SEP000000000003", "NodeName", "cucm-sub1", "cucm-sub2")]
+
+
+def test_batches_are_polled_with_their_own_state_info():
+    ris = FakeRisPort(DEVICES)
+    service, registrations = monitor(ris, max_devices=2)
+    registrations.poll()
+    ris.change([("SEP000000000001", "cucm-sub1", "UnRegistered", "10.0.0.1", 200)] + DEVICES[1:])
+    assert changes(registrations.poll()) == [("SEP000000000001", "Status", "Registered", "UnRegistered")]
+    assert [len(call[2]["CmSelectionCriteria"]["SelectItems"]["item"]) for call in service.calls] == [2, 1, 2, 1]
+
+
+def test_transitions_generator_skips_the_first_poll_until_stopped():
+    ris = FakeRisPort(DEVICES)
+    service, registrations = monitor(ris)
+    polls = []
+
+    def poll():
+        polls.append(len(polls))
+        if len(polls) == 2:
+            ris.change(DEVICES[:2])
+        transitions = type(registrations).poll(registrations)
+        if len(polls) == 3:
+            registrations.stop()
+        return transitions
+
+    registrations.poll = poll
+    found = []
+    thread = threading.Thread(target=lambda: found.extend(registrations.transitions(interval=0)))
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert changes(found) == [("SEP000000000003", "Status", "Registered", None)]
+    assert len(polls) == 3
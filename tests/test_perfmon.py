@@ -0,0 +1,111 @@
+import math
+from itertools import count
+
+import pytest
+from conftest import FakeService
+from conftest import fake_connector
+from zeep.exceptions import Fault
+
+from ciscocucmapi import PerfMonConnector
+from ciscocucmapi.perfmon import CounterRing
+from ciscocucmapi.perfmon import counter_path
+
+COUNTERS = [counter_path("cucm-sub1", "Cisco CallManager", "CallsActive"),
+            counter_path("cucm-sub1", "Processor", "% CPU Time", instance="_Total")]
+
+
+class FakePerfMon(object):
+    """PerfMon session handlers, with collection faults raised in turn"""
+
+    def __init__(self, *faults):
+        self.faults = list(faults)
+        self.handles = (f"handle-{i}" for i in count(1))
+        self.open = set()
+
+    def service(self):
+        return FakeService(perfmonOpenSession=self.open_session, perfmonAddCounter=lambda **kwargs: None,
+                           perfmonCollectSessionData=self.collect, perfmonCloseSession=self.close_session)
+
+    def open_session(self):
+        handle = next(self.handles)
+        self.open.add(handle)
+        return handle
+
+    def close_session(self, SessionHandle):
+        if SessionHandle not in self.open:
+            raise Fault("Invalid session handle")
+        self.open.remove(SessionHandle)
+
+    def collect(self, SessionHandle):
+        if self.faults:
+            fault = self.faults.pop(0)
+            if fault.message.startswith("Invalid"):
+                self.open.discard(SessionHandle)  # expired on the node
+            raise fault
+        return [{"Name": COUNTERS[0].upper(), "Value": 12, "CStatus": 1},
+                {"Name": COUNTERS[1], "Value": 97, "CStatus": 3}]
+
+
+def make_session(perfmon):
+    service = perfmon.service()
+    connector = fake_connector(PerfMonConnector, service)
+    return service, connector.session(COUNTERS, capacity=3)
+
+
+def test_counter_path():
+    assert COUNTERS[1] == "\\\\cucm-sub1\\Processor(_Total)\\% CPU Time"
+
+
+def test_collect_opens_one_session_with_all_counters():
+    service, session = make_session(FakePerfMon())
+    samples = session.collect()
+    session.collect()
+    assert service.count("perfmonOpenSession") == 1
+    assert service.count("perfmonAddCounter") == 1
+    assert len(service.calls[1][2]["ArrayOfCounter"]["Counter"]) == 2
+    # counter names match case-insensitively, and invalid statuses are NaN
+    assert session.samples.latest()[COUNTERS[0]] == 12
+    assert math.isnan(samples[COUNTERS[1]])
+
+
+def test_expired_session_is_closed_and_reopened():
+    perfmon = FakePerfMon(Fault("Invalid session handle"))
+    service, session = make_session(perfmon)
+    session.open()
+    session.collect()
+    assert session.handle == "handle-2"
+    assert service.count("perfmonCloseSession") == 1
+    assert service.count("perfmonOpenSession") == 2
+    assert len(session.samples) == 1
+
+
+def test_other_faults_do_not_reopen_or_leak_sessions():
+    perfmon = FakePerfMon(Fault("Counter not found"))
+    service, session = make_session(perfmon)
+    with pytest.raises(Fault):
+        session.collect()
+    assert session.handle == "handle-1"
+    assert service.count("perfmonOpenSession") == 1
+    session.collect()
+    session.close()
+    assert perfmon.open == set()
+
+
+def test_close_session():
+    perfmon = FakePerfMon()
+    service, session = make_session(perfmon)
+    with session:
+        session.collect()
+    assert perfmon.open == set()
+    assert session.handle is None
+    assert len(session.samples) == 1
+
+
+def test_counter_ring_overwrites_oldest():
+    ring = CounterRing(["a", "b"], capacity=2)
+    assert ring.latest() is None
+    for timestamp in (1.0, 2.0, 3.0):
+        ring.append(timestamp, {"a": timestamp, "unknown": 0})
+    assert ring.timestamps() == [2.0, 3.0]
+    assert ring.series("A") == [(2.0, 2.0), (3.0, 3.0)]
+    assert math.isnan(ring.latest()["b"])
@@ -0,0 +1,103 @@
+import re
+from collections import OrderedDict
+
+import pytest
+from conftest import FakeService
+from conftest import fake_sql
+from conftest import sql_in_values
+
+from ciscocucmapi.exceptions import AmbiguousNameError
+from ciscocucmapi.sql_utils import get_device_pkid
+from ciscocucmapi.sql_utils import get_dn_pkid
+
+PARTITIONS = {"PT_INTERNAL": "pt-1", "PT_LOBBY": "pt-2"}
+TABLES = {
+    "device": [{"pkid": f"dev-{i}", "name": f"SEP{i:012d}"} for i in range(1200)],
+    "enduser": [{"pkid": "user-1", "userid": "jdoe"}],
+    "numplan": [
+        {"pkid": "dn-1", "dnorpattern": "1000", "fkroutepartition": "pt-1", "tkpatternusage": 2},
+        {"pkid": "dn-2", "dnorpattern": "1000", "fkroutepartition": "pt-2", "tkpatternusage": 2},
+        {"pkid": "dn-3", "dnorpattern": "2000", "fkroutepartition": None, "tkpatternusage": 2},
+        {"pkid": "dn-4", "dnorpattern": "2000", "fkroutepartition": "pt-1", "tkpatternusage": 2},
+    ],
+}
+TABLES["device"].append({"pkid": "dev-quote", "name": "O'Brien phone"})
+
+
+def query(sql):
+    table = re.search(r" from (\w+) ", sql).group(1)
+    column = re.search(r" where (\w+) in ", sql).group(1)
+    name_column = re.search(r"pkid, (\w+)", sql).group(1)
+    values = sql_in_values(sql)
+    rows = [row for row in TABLES[table] if row[column] in values]
+    if "fkroutepartition is null" in sql:
+        rows = [row for row in rows if row["fkroutepartition"] is None]
+    partition = re.search(r"routepartition where name = '(.*?)'", sql)
+    if partition:
+        rows = [row for row in rows if row["fkroutepartition"] == PARTITIONS.get(partition.group(1))]
+    return [OrderedDict([("pkid", row["pkid"]), ("name", row[name_column])]) for row in rows]
+
+
+@pytest.fixture
+def service():
+    return FakeService(executeSQLQuery=fake_sql(query))
+
+
+def test_batched_resolution(make_axl, service):
+    axl = make_axl(service)
+    names = [f"SEP{i:012d}" for i in range(1200)]
+    axl.resolver.add("device", *names)
+    resolved = axl.resolver.resolve("device", names[:10])
+    assert resolved == {name: f"dev-{i}" for i, name in enumerate(names[:10])}
+    # all queued names resolved in 'IN' lists of at most 500
+    assert service.count("executeSQLQuery") == 3
+    assert axl.resolver.pkid("device", names[-1]) == "dev-1199"
+    assert service.count("executeSQLQuery") == 3
+
+
+def test_duplicate_and_unknown_names(make_axl, service):
+    axl = make_axl(service)
+    resolved = axl.resolver.resolve("device", ["SEP000000000001", "SEP000000000001", "SEPUNKNOWN"])
+    assert resolved == {"SEP000000000001": "dev-1", "SEPUNKNOWN": None}
+    assert sql_in_values(service.calls[0][2]["sql"]) == ["SEP000000000001", "SEPUNKNOWN"]
+    # misses are cached too
+    assert axl.resolver.pkid("device", "SEPUNKNOWN") is None
+    assert service.count("executeSQLQuery") == 1
+
+
+def test_names_are_escaped(make_axl, service):
+    axl = make_axl(service)
+    assert get_device_pkid(axl, "O'Brien phone") == "dev-quote"
+
+
+def test_reverse_lookup(make_axl, service):
+    axl = make_axl(service)
+    assert axl.resolver.name("enduser", "{USER-1}") == "jdoe"
+    assert axl.resolver.pkid("enduser", "jdoe") == "user-1"
+    assert service.count("executeSQLQuery") == 1
+
+
+def test_dn_in_several_partitions_is_ambiguous(make_axl, service):
+    axl = make_axl(service)
+    with pytest.raises(AmbiguousNameError):
+        get_dn_pkid(axl, "1000")
+
+
+def test_dn_by_partition(make_axl, service):
+    axl = make_axl(service)
+    assert get_dn_pkid(axl, "1000", route_partition="PT_LOBBY") == "dn-2"
+    assert get_dn_pkid(axl, "1000", route_partition="PT_INTERNAL") == "dn-1"
+    assert get_dn_pkid(axl, "2000", route_partition="") == "dn-3"
+    assert get_dn_pkid(axl, "3000", route_partition="PT_LOBBY") is None
+
+
+def test_invalidate(make_axl, service):
+    axl = make_axl(service)
+    with pytest.raises(AmbiguousNameError):
+        get_dn_pkid(axl, "2000")
+    axl.resolver.invalidate("dn")
+    TABLES["numplan"][3]["dnorpattern"] = "2001"
+    try:
+        assert get_dn_pkid(axl, "2000") == "dn-3"
+    finally:
+        TABLES["numplan"][3]["dnorpattern"] = "2000"
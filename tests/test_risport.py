@@ -0,0 +1,77 @@
+import pytest
+from conftest import FakeRisPort
+from conftest import fake_connector
+from zeep.exceptions import Fault
+
+from ciscocucmapi import RisPortConnector
+from ciscocucmapi import throttle as throttle_module
+
+DEVICES = [(f"SEP{i:012d}", f"cucm-sub{i % 2 + 1}", "Registered", f"10.0.0.{i % 250}", 100) for i in range(2500)]
+
+
+def risport(ris, **kwargs):
+    service = ris.service()
+    return service, fake_connector(RisPortConnector, service, **kwargs)
+
+
+@pytest.fixture
+def now(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(throttle_module.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(throttle_module.time, "sleep", lambda seconds: clock.__setitem__(0, clock[0] + seconds))
+    return clock
+
+
+def test_devices_are_selected_in_batches(now):
+    service, connector = risport(FakeRisPort(DEVICES))
+    names = [device[0] for device in DEVICES]
+    devices = connector.select_cm_devices(names + names[:10])
+    assert set(devices) == set(names)
+    assert devices["SEP000000000001"]["NodeName"] == "cucm-sub2"
+    # 2500 unique names in batches of 1000
+    batches = [call[2]["CmSelectionCriteria"]["SelectItems"]["item"] for call in service.calls]
+    assert [len(batch) for batch in batches] == [1000, 1000, 500]
+
+
+def test_wildcards_follow_the_state_info_cursor():
+    service, connector = risport(FakeRisPort(DEVICES[:5]), max_devices=2)
+    assert len(connector.select_cm_devices(["SEP*"])) == 5
+    assert [call[2]["StateInfo"] for call in service.calls] == ["", "page:2", "page:4"]
+
+
+def test_devices_on_several_nodes_are_merged():
+    devices = [("SEP000000000001", "cucm-sub1", "UnRegistered", "10.0.0.1", 300),
+               ("SEP000000000001", "cucm-sub2", "Registered", "10.0.0.1", 200),
+               ("SEP000000000002", "cucm-sub1", "UnRegistered", "10.0.0.2", 100),
+               ("SEP000000000002", "cucm-sub2", "UnRegistered", "10.0.0.2", 200)]
+    service, connector = risport(FakeRisPort(devices))
+    merged = connector.select_cm_devices(["SEP000000000001", "SEP000000000002", "SEPUNKNOWN"])
+    assert list(merged) == ["SEP000000000001", "SEP000000000002"]
+    assert merged["SEP000000000001"]["NodeName"] == "cucm-sub2"
+    assert merged["SEP000000000002"]["TimeStamp"] == 200
+
+
+def test_requests_are_paced_by_the_quota(now):
+    service, connector = risport(FakeRisPort(DEVICES), max_devices=100, requests_per_minute=15)
+    connector.select_cm_devices(device[0] for device in DEVICES[:2000])
+    # 20 requests: 15 in the first minute, then 5 once the window slides
+    assert service.count("selectCmDeviceExt") == 20
+    assert now[0] == 60.0
+
+
+def test_quota_faults_from_other_clients_are_retried(now):
+    ris = FakeRisPort(DEVICES[:3])
+    select = ris.select
+    faults = [Fault("AxisFault: Exceeded allowed rate for Reatime information. Current allowed rate is 15")]
+
+    def quota_select(**kwargs):
+        if faults:
+            raise faults.pop()
+        return select(**kwargs)
+
+    ris.select = quota_select
+    service, connector = risport(ris)
+    assert len(connector.select_cm_devices(["SEP*"])) == 3
+    assert service.count("selectCmDeviceExt") == 2
+    # the fault marks the quota as used up for a minute
+    assert now[0] == 60.0
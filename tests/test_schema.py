@@ -0,0 +1,126 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from conftest import FakeService
+from zeep.settings import Settings
+from zeep.transports import Transport
+
+from ciscocucmapi import UCMAXLConnector
+from ciscocucmapi import connectors
+from ciscocucmapi.schema import build_schema_bundle
+from ciscocucmapi.schema import load_schema_bundle
+
+SCHEMA_DIR = Path(__file__).parent.parent / "schema" / "current"
+
+
+@pytest.fixture(scope="module")
+def schema_dir(tmp_path_factory):
+    """Copy of the schema directory with a bundle alongside the WSDL"""
+    path = tmp_path_factory.mktemp("schema")
+    for source in SCHEMA_DIR.iterdir():
+        shutil.copy(source, path)
+    build_schema_bundle(path / "AXLAPI.wsdl")
+    return path
+
+
+def test_bundle_header_is_json(schema_dir):
+    with open(schema_dir / "AXLAPI.bundle", "rb") as _:
+        fingerprint = json.loads(_.readline())
+    assert set(fingerprint) == {"runtime", "source"}
+
+
+def test_load_bundle_from_explicit_path(schema_dir):
+    wsdl = schema_dir / "AXLAPI.wsdl"
+    document = load_schema_bundle(wsdl, Transport(cache=None), Settings(), schema_dir / "AXLAPI.bundle")
+    assert document is not None
+    assert "{http://www.cisco.com/AXLAPIService/}AXLAPIBinding" in document.bindings
+
+
+def test_connector_loads_bundles_only_when_given(schema_dir, monkeypatch):
+    loaded = []
+
+    def load(wsdl, transport, settings, bundle):
+        loaded.append(bundle)
+        return load_schema_bundle(wsdl, transport, settings, bundle)
+
+    monkeypatch.setattr(connectors, "load_schema_bundle", load)
+    wsdl = str(schema_dir / "AXLAPI.wsdl")
+    # a bundle alongside the WSDL is ignored unless opted in
+    axl = UCMAXLConnector(username="axl", password="secret", fqdn="cucm", wsdl=wsdl)
+    assert axl.client.get_type("ns0:XPhone")
+    assert loaded == []
+
+    bundled = UCMAXLConnector(username="axl", password="secret", fqdn="cucm", wsdl=wsdl,
+                              schema_bundle=schema_dir / "AXLAPI.bundle")
+    assert bundled.client.get_type("ns0:XPhone")
+    assert loaded == [schema_dir / "AXLAPI.bundle"]
+
+
+def test_stale_bundle_is_not_unpickled(schema_dir, tmp_path):
+    bundle = tmp_path / "stale.bundle"
+    # the pickle payload must never be read for a stale bundle
+    bundle.write_bytes(json.dumps({"runtime": "other", "source": None}).encode() + b"\n" + b"\x80invalid")
+    assert load_schema_bundle(schema_dir / "AXLAPI.wsdl", Transport(cache=None), Settings(), bundle) is None
+
+
+def test_missing_bundle(schema_dir, tmp_path):
+    assert load_schema_bundle(schema_dir / "AXLAPI.wsdl", Transport(cache=None), Settings(),
+                              tmp_path / "missing.bundle") is None
+
+
+def test_schema_index_resolves_each_field_once(make_axl):
+    axl = make_axl(FakeService())
+    index = axl.schema_index
+    get_type = index._get_type
+    resolved = []
+
+    def resolve(obj_name):
+        resolved.append(obj_name)
+        return get_type(obj_name)
+
+    index._get_type = resolve
+    assert index.identifiers(axl.phone) == ("name", "uuid")
+    assert "devicePoolName" in index.search_criteria(axl.phone)
+    assert index.search_criteria(axl.phone) is index.search_criteria(axl.phone)
+    assert "product" in index.get_returned_tags(axl.phone)
+    assert resolved == ["GetPhoneReq", "ListPhoneReq", "RPhone"]
+
+
+def test_schema_index_save_and_load(make_axl, tmp_path):
+    axl = make_axl(FakeService())
+    axl.schema_index.build([axl.phone, axl.line])
+    axl.schema_index.save(tmp_path / "index.json")
+
+    # a later connector for the same schema loads the index without resolving types
+    loaded = UCMAXLConnector(username="axl", password="secret", fqdn="cucm", wsdl=axl.wsdl,
+                             schema_index=tmp_path / "index.json")
+    assert loaded.schema_index.identifiers(loaded.phone) == ("name", "uuid")
+    assert loaded.schema_index.list_returned_tags(loaded.line) == axl.schema_index.list_returned_tags(axl.line)
+    assert loaded._client is None
+
+
+def test_stale_schema_index_is_ignored(make_axl, tmp_path):
+    axl = make_axl(FakeService())
+    path = tmp_path / "index.json"
+    path.write_text(json.dumps({"fingerprint": {"runtime": "other", "source": None},
+                                "entries": {"Phone": {"identifiers": [["name"]]}}}))
+    assert axl.schema_index.load(path) is False
+    assert axl.schema_index.identifiers(axl.phone) == ("name", "uuid")
+
+
+def test_schema_index_requires_a_local_wsdl(make_axl, tmp_path):
+    axl = make_axl(FakeService())
+    axl.schema_index.build([axl.phone])
+    path = tmp_path / "index.json"
+    axl.schema_index.save(path)
+
+    remote = UCMAXLConnector(username="axl", password="secret", fqdn="cucm",
+                             wsdl="https://cucm:8443/axl/AXLAPI.wsdl", schema_index=path)
+    # the remote schema may have changed since the index was saved
+    assert remote.schema_index._entries == {}
+    assert remote.schema_index.load(path) is False
+    with pytest.raises(ValueError):
+        remote.schema_index.save(tmp_path / "remote.json")
+    assert not (tmp_path / "remote.json").exists()
@@ -0,0 +1,147 @@
+from collections import OrderedDict
+
+import pytest
+from conftest import FakeService
+from conftest import fake_sql
+from conftest import sql_in_values
+from zeep.exceptions import Fault
+
+from ciscocucmapi.sql_utils import SQLInsertBatch
+from ciscocucmapi.sql_utils import associate_devices_to_endusers
+from ciscocucmapi.sql_utils import associate_endusers_to_user_groups
+from ciscocucmapi.sql_utils import compile_sql
+from ciscocucmapi.sql_utils import ldap_sync
+from ciscocucmapi.sql_utils import render_sql
+from ciscocucmapi.sql_utils import render_sql_chunks
+from ciscocucmapi.sql_utils import sql_literal
+
+
+@pytest.mark.parametrize("value, literal", [
+    (None, "NULL"),
+    (True, "'t'"),
+    (False, "'f'"),
+    (2, "2"),
+    (1.5, "1.5"),
+    ("SEP000000000001", "'SEP000000000001'"),
+    ("O'Brien", "'O''Brien'"),
+    ("'; drop table device; --", "'''; drop table device; --'"),
+    (["a", "b'c", 3], "('a', 'b''c', 3)"),
+    ([], "(NULL)"),
+])
+def test_sql_literal(value, literal):
+    assert sql_literal(value) == literal
+
+
+def test_render_sql():
+    sql = render_sql("select pkid from device where name in :names and tkclass = :tkclass",
+                     names=("SEP000000000001", "O'Brien phone"), tkclass=1)
+    assert sql == "select pkid from device where name in ('SEP000000000001', 'O''Brien phone') and tkclass = 1"
+
+
+def test_render_sql_ignores_literals_and_casts():
+    template = "select name::lvarchar from device where description = 'on :ext' and name = :name"
+    assert compile_sql(template) == (
+        "select name::lvarchar from device where description = 'on :ext' and name = ", "name", "")
+    assert render_sql(template, name=":ext") == (
+        "select name::lvarchar from device where description = 'on :ext' and name = ':ext'")
+
+
+def test_render_sql_parameter_values_are_not_rendered_again():
+    assert render_sql("update device set description = :a where name = :b", a=":b", b="x'") == (
+        "update device set description = ':b' where name = 'x'''")
+
+
+def test_render_sql_missing_parameter():
+    with pytest.raises(ValueError):
+        render_sql("select pkid from device where name = :name")
+
+
+def test_compiled_templates_are_cached():
+    template = "select pkid from enduser where userid = :userid"
+    compile_sql(template)
+    hits = compile_sql.cache_info().hits
+    render_sql(template, userid="jdoe")
+    assert compile_sql.cache_info().hits == hits + 1
+
+
+def test_render_sql_chunks():
+    statements = list(render_sql_chunks("select pkid from device where name in :names and tkclass = :tkclass",
+                                        "names", [f"SEP{i:012d}" for i in range(5)], chunk_size=2, tkclass=1))
+    assert len(statements) == 3
+    assert statements[-1] == "select pkid from device where name in ('SEP000000000004') and tkclass = 1"
+
+
+def sql_update(sql):
+    """'executeSQLUpdate' handler rejecting statements which insert the 'duplicate' pkid"""
+    if "'duplicate'" in sql:
+        raise Fault("Unique constraint (informix.enduserdirgroupmap_uniq) violated.")
+    return {"return": {"rowsUpdated": max(sql.count(" from systables "), 1)}}
+
+
+@pytest.fixture
+def service():
+    return FakeService(executeSQLUpdate=sql_update)
+
+
+def test_batch_writes_multi_row_statements(make_axl, service):
+    axl = make_axl(service)
+    pairs = [(f"user-{i}", "group-1") for i in range(100)]
+    results = associate_endusers_to_user_groups(axl, pairs, max_statement_size=2000)
+    assert [result.values for result in results] == pairs
+    assert all(result.success for result in results)
+    statements = [call[2]["sql"] for call in service.calls]
+    assert 1 < len(statements) < 100
+    assert all(len(sql) <= 2000 for sql in statements)
+    assert statements[0].startswith("insert into enduserdirgroupmap (fkenduser, fkdirgroup) select fkenduser, "
+                                    "fkdirgroup from (select 'user-0' fkenduser, 'group-1' fkdirgroup from "
+                                    "systables where tabid = 1 union all select 'user-1', 'group-1' from")
+
+
+def test_failed_statement_is_retried_row_by_row(make_axl, service):
+    axl = make_axl(service)
+    batch = SQLInsertBatch(axl, "enduserdirgroupmap", ("fkenduser", "fkdirgroup"))
+    for userid in ("user-1", "duplicate", "user-3"):
+        batch.add(userid, "group-1")
+    results = batch.flush()
+    assert [result.success for result in results] == [True, False, True]
+    assert "violated" in str(results[1].error)
+    # one multi-row statement, then one statement per row
+    assert service.count("executeSQLUpdate") == 4
+    assert service.calls[-1][2]["sql"] == (
+        "insert into enduserdirgroupmap (fkenduser, fkdirgroup) values ('user-3', 'group-1')")
+    assert len(batch) == 0 and batch.flush() == []
+
+
+def test_parallel_batch_writes_single_rows_in_order(make_axl, service):
+    axl = make_axl(service, max_concurrency=4)
+    pairs = [(f"{{USER-{i}}}", f"{{DEVICE-{i}}}") for i in range(20)]
+    results = associate_devices_to_endusers(axl, pairs, parallel=True, workers=8)
+    assert [result.values[:2] for result in results] == [(f"USER-{i}", f"DEVICE-{i}") for i in range(20)]
+    assert service.count("executeSQLUpdate") == 20
+    assert all(" values (" in call[2]["sql"] for call in service.calls)
+
+
+def test_batch_rows_must_match_columns(make_axl, service):
+    batch = SQLInsertBatch(make_axl(service), "enduserdirgroupmap", ("fkenduser", "fkdirgroup"))
+    with pytest.raises(ValueError):
+        batch.add("user-1")
+
+
+def test_ldap_sync(make_axl, service):
+    def directories(sql):
+        return [OrderedDict([("pkid", "aaaa0000-0000-0000-0000-000000000001"), ("name", "LDAP_HQ")])] if (
+            "aaaa0000-0000-0000-0000-000000000001" in sql_in_values(sql)) else []
+
+    service.handlers["executeSQLQuery"] = fake_sql(directories)
+    axl = make_axl(service)
+    ldap_sync(axl, name="LDAP_BRANCH")
+    ldap_sync(axl, uuid="{AAAA0000-0000-0000-0000-000000000001}")
+    assert [call[2]["sql"] for call in service.calls if call[0] == "executeSQLUpdate"] == [
+        "update directorypluginconfig set syncnow = '1' where name = 'LDAP_BRANCH'",
+        "update directorypluginconfig set syncnow = '1' where name = 'LDAP_HQ'",
+    ]
+    with pytest.raises(ValueError):
+        ldap_sync(axl)
+    with pytest.raises(ValueError):
+        ldap_sync(axl, uuid="{AAAA0000-0000-0000-0000-000000000002}")
+    assert service.count("executeSQLUpdate") == 2
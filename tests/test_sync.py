@@ -0,0 +1,146 @@
+import json
+from collections import OrderedDict
+
+import pytest
+from conftest import FakeService
+from conftest import fake_list
+from zeep.exceptions import Fault
+
+from ciscocucmapi.sync import ChangeFeed
+
+PHONES = [
+    {"uuid": "{AAAA0000-0000-0000-0000-000000000001}", "name": "SEP000000000001", "description": "one"},
+    {"uuid": "{AAAA0000-0000-0000-0000-000000000002}", "name": "SEP000000000002", "description": "two"},
+]
+
+
+def change(action, uuid, do_get, changed_tags=None):
+    return OrderedDict([
+        ("type", "Phone"),
+        ("uuid", uuid.strip("{}").lower()),
+        ("action", action),
+        ("doGet", do_get),
+        ("changedTags", {"changedTag": [{"name": name, "_value_1": value}
+                                        for name, value in (changed_tags or {}).items()]}),
+    ])
+
+
+class FakeChangeQueue(object):
+    """listChange handler serving queued changes from a change id"""
+
+    def __init__(self):
+        self.changes = []
+        self.first_change_id = 1
+
+    def __call__(self, startChangeId=None, objectList=None):
+        start = startChangeId["_value_1"] if startChangeId else len(self.changes) + self.first_change_id
+        pending = self.changes[start - self.first_change_id:]
+        return {
+            "queueInfo": {"queueId": "q1", "firstChangeId": self.first_change_id,
+                          "nextStartChangeId": self.first_change_id + len(self.changes)},
+            "changes": {"change": pending} if startChangeId else None
+        }
+
+
+def get_phone(uuid=None, returnedTags=None, **kwargs):
+    return {"return": {"phone": OrderedDict([("uuid", uuid), ("name", "fetched"), ("description", "fetched")])}}
+
+
+def make_feed(make_axl, queue):
+    service = FakeService(listChange=queue, listPhone=fake_list("phone", PHONES), getPhone=get_phone)
+    axl = make_axl(service)
+    feed = ChangeFeed(axl, ["phone"], returnedTags={"phone": ["name", "description"]})
+    feed.sync()
+    return service, feed
+
+
+def test_first_sync_lists_everything(make_axl):
+    service, feed = make_feed(make_axl, FakeChangeQueue())
+    assert len(feed.snapshot["Phone"]) == 2
+    assert service.count("listPhone") == 1
+
+
+def test_changed_tags_applied_without_get_when_do_get_is_false(make_axl):
+    queue = FakeChangeQueue()
+    service, feed = make_feed(make_axl, queue)
+    # AXL booleans are strings, and "false" must not trigger a re-fetch
+    queue.changes.append(change("u", PHONES[0]["uuid"], "false", {"description": "updated"}))
+    queue.changes.append(change("u", PHONES[1]["uuid"], "f", {"description": "updated too", "untracked": "x"}))
+    applied = feed.sync()
+    assert len(applied) == 2
+    assert service.count("getPhone") == 0
+    descriptions = sorted(obj["description"] for obj in feed.snapshot["Phone"].values())
+    assert descriptions == ["updated", "updated too"]
+
+
+def test_do_get_refetches(make_axl):
+    queue = FakeChangeQueue()
+    service, feed = make_feed(make_axl, queue)
+    queue.changes.append(change("u", PHONES[0]["uuid"], "true"))
+    feed.sync()
+    assert service.count("getPhone") == 1
+    assert sorted(obj["name"] for obj in feed.snapshot["Phone"].values()) == ["SEP000000000002", "fetched"]
+
+
+def test_added_and_removed(make_axl):
+    queue = FakeChangeQueue()
+    service, feed = make_feed(make_axl, queue)
+    queue.changes.append(change("a", "{BBBB0000-0000-0000-0000-000000000003}", "false"))
+    queue.changes.append(change("r", PHONES[1]["uuid"], "false"))
+    feed.sync()
+    # unknown objects are fetched, whatever doGet says
+    assert service.count("getPhone") == 1
+    assert len(feed.snapshot["Phone"]) == 2
+    assert "aaaa0000-0000-0000-0000-000000000002" not in feed.snapshot["Phone"]
+
+
+def test_overflow_resyncs(make_axl):
+    queue = FakeChangeQueue()
+    service, feed = make_feed(make_axl, queue)
+    queue.changes.append(change("u", PHONES[0]["uuid"], "false"))
+    queue.first_change_id = 10
+    assert feed.sync() is None
+    assert service.count("listPhone") == 2
+
+
+def test_save_and_load(make_axl, tmp_path):
+    queue = FakeChangeQueue()
+    _, feed = make_feed(make_axl, queue)
+    feed.save(tmp_path / "feed.json")
+    restored = ChangeFeed(feed.connector, ["phone"])
+    assert restored.load(tmp_path / "feed.json")
+    assert json.loads(json.dumps(restored.snapshot)) == json.loads(json.dumps(feed.snapshot))
+    assert restored.next_change_id == feed.next_change_id
+
+
+def test_objects_removed_before_the_poll_are_dropped(make_axl):
+    queue = FakeChangeQueue()
+    service, feed = make_feed(make_axl, queue)
+
+    def removed_phone(uuid=None, returnedTags=None, **kwargs):
+        raise Fault("Item not valid: The specified Phone was not found")
+
+    service.handlers["getPhone"] = removed_phone
+    queue.changes.append(change("a", "{BBBB0000-0000-0000-0000-000000000003}", "true"))
+    queue.changes.append(change("r", "{BBBB0000-0000-0000-0000-000000000003}", "false"))
+    queue.changes.append(change("u", PHONES[0]["uuid"], "true"))
+    assert len(feed.sync()) == 3
+    assert feed.next_change_id == 4
+    assert list(feed.snapshot["Phone"]) == ["aaaa0000-0000-0000-0000-000000000002"]
+    assert feed.sync() == []
+
+
+def test_other_fetch_faults_are_raised_without_replaying_applied_pages(make_axl):
+    queue = FakeChangeQueue()
+    service, feed = make_feed(make_axl, queue)
+    queue.changes.append(change("u", PHONES[0]["uuid"], "false", {"description": "updated"}))
+    feed.sync()
+
+    def failing_phone(uuid=None, returnedTags=None, **kwargs):
+        raise Fault("Database error")
+
+    service.handlers["getPhone"] = failing_phone
+    queue.changes.append(change("u", PHONES[1]["uuid"], "true"))
+    with pytest.raises(Fault):
+        feed.sync()
+    assert feed.next_change_id == 2
@@ -0,0 +1,125 @@
+import re
+from collections import OrderedDict
+
+import pytest
+from conftest import FakeService
+from conftest import fake_sql
+from zeep.exceptions import Fault
+
+from ciscocucmapi.api import ThinAXLAPI
+from ciscocucmapi.api.base import paged_sql_statement
+from ciscocucmapi.exceptions import AXLAttributeError
+from ciscocucmapi.exceptions import IllegalSQLStatement
+from ciscocucmapi.model import ThinAXLColumnarDataModel
+from ciscocucmapi.model import axl_factory
+
+DEVICES = [OrderedDict([("pkid", f"dev-{i}"), ("name", f"SEP{i:012d}")]) for i in range(1234)]
+
+
+def query(sql):
+    return DEVICES
+
+
+def limited_query(max_first):
+    """Query rejecting pages of more than max_first rows as too large"""
+    def limited(sql):
+        first = re.search(r" FIRST (\d+) ", sql)
+        if first and int(first.group(1)) > max_first:
+            raise Fault(f"Query request too large. Total rows matched: {len(DEVICES)} rows. "
+                        f"Suggestive Row Fetch: less than {max_first} rows")
+        return DEVICES
+    return limited
+
+
+def test_paged_sql_statement():
+    assert paged_sql_statement("SELECT pkid, name FROM device ORDER BY pkid", 100, 50) == (
+        "SELECT SKIP 100 FIRST 50 pkid, name FROM device ORDER BY pkid")
+    with pytest.raises(IllegalSQLStatement):
+        paged_sql_statement("update device set description = ''", 0, 50)
+    with pytest.raises(IllegalSQLStatement):
+        paged_sql_statement("select first 10 pkid from device", 0, 50)
+
+
+def test_query_iter_pages_through_all_rows(make_axl):
+    service = FakeService(executeSQLQuery=fake_sql(query))
+    axl = make_axl(service)
+    rows = list(axl.sql.query_iter("select pkid, name from device order by pkid", chunk_size=500))
+    assert rows == DEVICES
+    assert [call[2]["sql"] for call in service.calls] == [
+        f"select SKIP {skip} FIRST 500 pkid, name from device order by pkid" for skip in (0, 500, 1000)]
+
+
+def test_query_iter_is_lazy(make_axl):
+    service = FakeService(executeSQLQuery=fake_sql(query))
+    axl = make_axl(service)
+    rows = axl.sql.query_iter("select pkid, name from device order by pkid", chunk_size=100)
+    assert next(rows) == DEVICES[0]
+    assert service.count("executeSQLQuery") <= 2
+    rows.close()
+
+
+def test_query_iter_reduces_chunk_size(make_axl):
+    service = FakeService(executeSQLQuery=fake_sql(limited_query(300)))
+    axl = make_axl(service)
+    assert list(axl.sql.query_iter("select pkid, name from device order by pkid", chunk_size=1000)) == DEVICES
+    firsts = [int(re.search(r" FIRST (\d+) ", call[2]["sql"]).group(1)) for call in service.calls]
+    assert firsts[0] == 1000
+    assert set(firsts[1:]) == {300}
+
+
+def test_query_iter_raises_illegal_sql_statement(make_axl):
+    def invalid(sql=None):
+        raise Fault("A syntax error has occurred.")
+
+    axl = make_axl(FakeService(executeSQLQuery=invalid))
+    with pytest.raises(IllegalSQLStatement):
+        list(axl.sql.query_iter("select pkid from devic"))
+    with pytest.raises(IllegalSQLStatement):
+        list(axl.sql.query_iter("delete from device"))
+
+
+def columnar_sql(make_axl, query):
+    """Thin AXL API creating data models through the package's model factory"""
+    axl = make_axl(FakeService(executeSQLQuery=fake_sql(query)))
+    return ThinAXLAPI(axl, axl_factory)
+
+
+def test_columnar_query(make_axl):
+    result = columnar_sql(make_axl, query).query("select pkid, name from device", columnar=True)
+    assert isinstance(result, ThinAXLColumnarDataModel)
+    assert result.columns == ("pkid", "name")
+    assert len(result) == len(DEVICES)
+    assert result["name"][:2] == ["SEP000000000000", "SEP000000000001"]
+    assert list(result.rows())[1] == ("dev-1", "SEP000000000001")
+    assert list(result) == DEVICES
+    with pytest.raises(AXLAttributeError):
+        result["description"]
+
+
+def test_columnar_query_rows_with_missing_columns(make_axl):
+    def ragged(sql):
+        return [OrderedDict([("pkid", "dev-1"), ("name", "SEP000000000001")]), OrderedDict([("pkid", "dev-2")])]
+
+    result = columnar_sql(make_axl, ragged).query("select pkid, name from device", columnar=True)
+    assert result["name"] == ["SEP000000000001", None]
+
+
+def test_columnar_query_without_rows(make_axl):
+    result = columnar_sql(make_axl, lambda sql: []).query("select pkid from device where 1 = 0", columnar=True)
+    assert len(result) == 0
+    assert result.columns == ()
+
+
+def test_columnar_csv(make_axl, tmp_path):
+    result = columnar_sql(make_axl, query).query("select pkid, name from device", columnar=True)
+    result.csv(tmp_path / "devices.csv")
+    lines = (tmp_path / "devices.csv").read_text().splitlines()
+    assert lines[:2] == ["pkid,name", "dev-0,SEP000000000000"]
+    assert len(lines) == len(DEVICES) + 1
+
+
+def test_columnar_optional_dependencies():
+    pytest.importorskip("pandas")
+    result = ThinAXLColumnarDataModel(OrderedDict([("pkid", ["dev-1"]), ("name", ["SEP000000000001"])]))
+    assert list(result.to_pandas()["name"]) == ["SEP000000000001"]
+    assert result.to_numpy().shape == (1, 2)
@@ -0,0 +1,156 @@
+import threading
+import time
+
+import pytest
+from conftest import WSDL
+from conftest import FakeService
+from zeep.exceptions import Fault
+from zeep.exceptions import TransportError
+
+from ciscocucmapi import UCMAXLConnector
+from ciscocucmapi import throttle as throttle_module
+from ciscocucmapi.throttle import AIMDThrottle
+from ciscocucmapi.throttle import RequestQuota
+from ciscocucmapi.throttle import ThrottledService
+from ciscocucmapi.throttle import is_throttle_error
+
+OVERLOADED = Fault("Maximum AXL Memory Allocation Consumed")
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(throttle_module.time, "sleep", slept.append)
+    return slept
+
+
+def failing(*errors):
+    """Operation raising errors in turn, then succeeding"""
+    errors = list(errors)
+
+    def operation():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+    return operation
+
+
+def test_throttle_errors():
+    assert is_throttle_error(TransportError(status_code=503))
+    assert is_throttle_error(OVERLOADED)
+    assert not is_throttle_error(TransportError(status_code=500))
+    assert not is_throttle_error(Fault("Item not valid: The specified Phone was not found"))
+    assert not is_throttle_error(ValueError())
+
+
+def test_idempotent_requests_back_off_and_retry(sleeps):
+    throttle = AIMDThrottle(8, backoff=1.0)
+    assert throttle.call("getPhone", failing(OVERLOADED, TransportError(status_code=503))) == "ok"
+    assert len(sleeps) == 2
+    # exponential backoff, with jitter of up to half the delay
+    assert 0.5 <= sleeps[0] <= 1.0 and 1.0 <= sleeps[1] <= 2.0
+    assert throttle.throttled == 2
+    assert throttle.limit < 8
+
+
+def test_retries_are_bounded(sleeps):
+    throttle = AIMDThrottle(8, retries=2)
+    with pytest.raises(Fault):
+        throttle.call("listPhone", failing(OVERLOADED, OVERLOADED, OVERLOADED))
+    assert len(sleeps) == 2
+    assert throttle.in_flight == 0
+
+
+def test_writes_are_not_retried(sleeps):
+    throttle = AIMDThrottle(8)
+    with pytest.raises(Fault):
+        throttle.call("addPhone", failing(OVERLOADED))
+    assert sleeps == []
+    assert throttle.limit == 4
+
+
+def test_limit_decreases_once_per_round_trip(sleeps):
+    throttle = AIMDThrottle(8)
+    throttle._latency = 60.0
+    for _ in range(3):
+        with pytest.raises(Fault):
+            throttle.call("addPhone", failing(OVERLOADED))
+    assert throttle.limit == 4
+    assert throttle.throttled == 3
+
+
+def test_successes_increase_limit_additively():
+    throttle = AIMDThrottle(8)
+    throttle.limit = 2.0
+    throttle.call("getPhone", failing())
+    throttle.call("getPhone", failing())
+    assert throttle.limit == pytest.approx(2.0 + 1 / 2.0 + 1 / 2.5)
+    assert throttle.latency is not None
+    assert throttle.rate > 0
+
+
+def test_request_errors_leave_limit_latency_and_rate(sleeps):
+    throttle = AIMDThrottle(8)
+    throttle.limit = 2.0
+    for error in (Fault("Item not valid"), TransportError(status_code=500), ValueError()):
+        with pytest.raises(type(error)):
+            throttle.call("getPhone", failing(error))
+    assert throttle.limit == 2.0
+    assert throttle.latency is None
+    assert throttle.rate == 0
+    assert throttle.throttled == 0
+    assert throttle.in_flight == 0
+    assert sleeps == []
+
+
+def test_concurrency_is_limited():
+    throttle = AIMDThrottle(2)
+    peak, running, lock = [0], [0], threading.Lock()
+
+    def operation():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+
+    threads = [threading.Thread(target=throttle.call, args=("getPhone", operation)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] <= 2
+
+
+def test_throttle_is_opt_in():
+    assert UCMAXLConnector(username="axl", password="secret", fqdn="cucm", wsdl=WSDL).throttle is None
+    axl = UCMAXLConnector(username="axl", password="secret", fqdn="cucm", wsdl=WSDL, max_concurrency=6,
+                          throttle=True)
+    assert axl.throttle.max_limit == 6
+
+
+def test_throttled_service():
+    service = FakeService(getPhone=lambda **kwargs: {"return": {"phone": {"name": "SEP000000000001"}}})
+    throttle = AIMDThrottle(4)
+    throttled = ThrottledService(service, throttle)
+    assert throttled.getPhone(name="SEP000000000001")["return"]["phone"]["name"] == "SEP000000000001"
+    assert throttle.stats()["rate"] > 0
+
+
+def test_request_quota_waits_for_the_window(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(throttle_module.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(throttle_module.time, "sleep", lambda seconds: now.__setitem__(0, now[0] + seconds))
+    quota = RequestQuota(2, period=60.0)
+    for _ in range(3):
+        quota.acquire()
+    assert now[0] == 160.0
+
+
+def test_request_quota_retries_quota_faults(monkeypatch):
+    monkeypatch.setattr(throttle_module.time, "sleep", lambda seconds: None)
+    quota = RequestQuota(10, period=0.0, fault="Exceeded allowed rate", retries=1)
+    assert quota.call(failing(Fault("Exceeded allowed rate for Reatime information"))) == "ok"
+    with pytest.raises(Fault):
+        quota.call(failing(Fault("Exceeded allowed rate"), Fault("Exceeded allowed rate")))